@@ -21,10 +21,12 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 APP_DIR = os.path.join(BASE_DIR, 'app')
 TOOLS_DIR = os.path.join(BASE_DIR, 'tools')
 REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
+DATA_DIR = os.path.join(BASE_DIR, 'data')        # lokal bazalar va keshlar
 
 # Create directories if not exist
 os.makedirs(REPORTS_DIR, exist_ok=True)
 os.makedirs(TOOLS_DIR, exist_ok=True)
+os.makedirs(DATA_DIR, exist_ok=True)
 
 # Reports subdirectories
 os.makedirs(os.path.join(REPORTS_DIR, 'scanning'), exist_ok=True)
@@ -57,6 +59,7 @@ VIRUSTOTAL_API_KEY = ""  # https://virustotal.com
 HUNTER_API_KEY = ""  # https://hunter.io
 CENSYS_API_ID = ""  # https://censys.io
 CENSYS_API_SECRET = ""
+NVD_API_KEY = ""  # https://nvd.nist.gov/developers/request-an-api-key
 
 # ====================
 # TOOLS PATHS
@@ -106,6 +109,49 @@ SCAN_TIMEOUT = 600
 # THREADING
 # ====================
 MAX_THREADS = 10
+MAX_HOST_THREADS = 8          # bitta hostga parallel so'rovlar (ProbeEngine)
+SSL_BATCH_WORKERS = 50        # SSL/TLS batch: parallel hostlar
+TECH_BATCH_WORKERS = 50       # Wappalyzer batch: parallel sahifa yuklash
+CDX_WORKERS = 4               # Wayback CDX: parallel sahifalar
+CDX_RATE = 1.0                # Wayback CDX: sekundiga so'rovlar (archive.org'ga hurmat)
+CRAWL_WORKERS = 10            # LinkGopher crawl: parallel sahifa yuklash
+NMAP_WORKERS = 4              # masscan -> nmap -sV: parallel per-host nmap jarayonlari
+
+# ====================
+# CACHE FILES
+# ====================
+SSL_CIPHER_CACHE = os.path.join(DATA_DIR, 'ssl_cipher_cache.jsonl')  # (ip, port, cert) -> cipherlar (append-only)
+SSL_CIPHER_CACHE_MAX_AGE = 7   # kun: eskiroq cipher ro'yxatlari qayta aniqlanadi
+NVD_DB = os.path.join(DATA_DIR, 'nvd.sqlite3')                         # offline NVD mirror
+WAPPALYZER_DIR = os.path.join(DATA_DIR, 'wappalyzer')                 # technologies/*.json, categories.json
+WAPPALYZER_CACHE = os.path.join(DATA_DIR, 'wappalyzer_signatures.pickle')  # kompilyatsiya qilingan signaturalar
+WAYBACK_CDX_DIR = os.path.join(DATA_DIR, 'wayback_cdx')                # CDX sahifa checkpointlari (resume)
+
+# ====================
+# HTTP CONNECTION POOL
+# ====================
+HTTP_POOL_CONNECTIONS = 100   # nechta host uchun pool saqlanadi
+HTTP_POOL_MAXSIZE = 20        # bitta hostga maksimal ulanishlar (per-host cap)
+HTTP_RETRIES = 2              # connect/429/5xx uchun qayta urinishlar
+HTTP_BACKOFF = 0.3            # 0.3s, 0.6s, 1.2s ...
+HTTP_RETRY_STATUSES = (429, 502, 503, 504)
+
+# ====================
+# DNS
+# ====================
+DNS_RESOLVERS = ['1.1.1.1', '8.8.8.8', '9.9.9.9', '8.8.4.4']   # bulk rejimda navbat bilan (ip yoki ip:port)
+DNS_CONCURRENCY = 50          # bulk rejim: bir vaqtda so'ralayotgan domenlar (x8 so'rov)
+DNS_TIMEOUT = 3.0             # bitta so'rov uchun (sekund)
+DNS_NAMESERVERS = []          # DNSCache uchun qat'iy nameserverlar (bo'sh - tizim resolveri)
+DNS_CACHE_MAX_TTL = 3600      # TTL shundan katta bo'lsa ham keshda ko'pi bilan shuncha turadi
+DNS_CACHE_NEGATIVE_TTL = 60   # NXDOMAIN / javobsiz nomlar
+DNS_CACHE_DEFAULT_TTL = 300   # TTL noma'lum bo'lganda (getaddrinfo fallback)
+DNS_CACHE_FAILURE_TTL = 30    # resolver xatosi (timeout, SERVFAIL) - shuncha vaqt qayta so'ralmaydi
+DNS_CACHE_MAX_ENTRIES = 100000  # keshdagi yozuvlar chegarasi (eskilari o'chiriladi)
+DNS_BRUTE_CONCURRENCY = 500   # subdomain bruteforce: bir vaqtda kutilayotgan so'rovlar
+DNS_BRUTE_TIMEOUT = 2.0       # bruteforce: bitta urinish uchun (sekund)
+DNS_BRUTE_RETRIES = 3         # SERVFAIL / REFUSED / timeout - keyingi resolverda qayta
+DNS_BRUTE_WILDCARD_PROBES = 3 # har bir parent zona uchun tasodifiy nomlar soni
 
 # ====================
 # WORDLISTS
@@ -144,4 +190,19 @@ HEADERS = {
 # ====================
 COMMON_PORTS = "21,22,23,25,53,80,110,111,135,139,143,443,445,993,995,1723,3306,3389,5900,8080"
 WEB_PORTS = "80,443,8000,8001,8008,8080,8443,8888,9000,9001,9090"
-DATABASE_PORTS = "1433,1521,3306,5432,5984,6379,27017,27018,27019,28017"
\ No newline at end of file
+DATABASE_PORTS = "1433,1521,3306,5432,5984,6379,27017,27018,27019,28017"
+
+# ====================
+# HOST DISCOVERY
+# ====================
+DISCOVERY_RATE = 1000         # probes per second (ICMP echo / TCP SYN), global
+DISCOVERY_CONCURRENCY = 256   # parallel ping subprocesses / TCP connects
+DISCOVERY_TIMEOUT = 1.0       # seconds to wait for a reply
+DISCOVERY_TCP_PORTS = "80,443,22,445,3389"    # TCP fallback: connect or RST = host up
+
+# ====================
+# PORT SCANNER
+# ====================
+TCP_SCAN_CONCURRENCY = 500        # initial connect window (grows / shrinks adaptively)
+TCP_SCAN_MAX_CONCURRENCY = 5000   # hard cap (also limited by RLIMIT_NOFILE)
+TCP_SCAN_TIMEOUT = 1.5            # initial / maximum connect timeout (RTT-based below it)
@@ -97,6 +97,20 @@ class ActiveMenu:
                 'function': self.run_dnsrecon,
                 'needs_target': True
             },
+            '13': {
+                'name': 'HTTP/HTTPS Prober',
+                'tool': 'Built-in',
+                'status': 'Active',
+                'function': self.run_httprobe,
+                'needs_target': True
+            },
+            '14': {
+                'name': 'DNS Subdomain Bruteforce',
+                'tool': 'Built-in',
+                'status': 'Active',
+                'function': self.run_dns_brute,
+                'needs_target': True
+            },
         }
 
     def display_menu(self):
@@ -196,6 +210,16 @@ class ActiveMenu:
         from app.information_gathering.active.dnsrecon import run_dnsrecon_scanner
         run_dnsrecon_scanner(domain)
 
+    def run_httprobe(self, t):
+        """Async HTTP/HTTPS Prober (host fayli yoki domain)"""
+        from app.information_gathering.active.httprobe import run_httprobe_scanner
+        run_httprobe_scanner(t)
+
+    def run_dns_brute(self, domain):
+        """Async DNS Subdomain Bruteforce (resolver rotation + wildcard filter)"""
+        from app.information_gathering.active.dns_brute import run_dns_brute_scanner
+        run_dns_brute_scanner(domain)
+
     # ==================== MAIN LOOP ====================
     def run(self):
         while True:
@@ -13,6 +13,7 @@ sys.path.insert(0, BASE_DIR)
 
 from app.config import C_OK, C_WARN, C_ERR, C_INFO, C_RESET
 from app.utils import Logger, clear_screen, pause
+from app.information_gathering.active.httprobe import probe_subdomains
 
 
 def banner():
@@ -85,6 +86,9 @@ def run_assetfinder_scanner():
         print(f"{C_OK}Natija saqlandi!{C_RESET}")
         print(f" → {txt_file}{C_RESET}")
 
+        if subs and input(f"\n{C_INFO}Tirik hostlarni tekshirish (HTTP/HTTPS)? (y/n) → {C_RESET}").strip().lower() == 'y':
+            probe_subdomains(subs, txt_file[:-4])
+
     except Exception as e:
         print(f"{C_ERR}Xato: {e}{C_RESET}")
 
@@ -1,11 +1,10 @@
 import os
 import subprocess
-import socket
 import threading
 import time
 import re
 from datetime import datetime
-from app.utils import Logger
+from app.utils import Logger, DNSCache
 from app.config import C_OK, C_ERR, C_WARN, C_INFO, C_RESET, C_TITLE
 
 
@@ -153,7 +152,7 @@ def run_dirsearch_scanner(target_input: str):
     # 3. IP aniqlash
     try:
         hostname = target.replace("https://", "").replace("http://", "").split("/")[0]
-        ip = socket.gethostbyname(hostname)
+        ip = DNSCache.gethostbyname(hostname)
     except:
         ip = "unknown"
 
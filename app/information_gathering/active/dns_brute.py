@@ -0,0 +1,454 @@
+# app/information_gathering/active/dns_brute.py
+# Built-in async DNS subdomain bruteforce → reports/information_gathering/active/dns_brute/*.jsonl
+#
+# - har bir resolver uchun bitta UDP socket, javoblar DNS ID bo'yicha so'rovga moslanadi
+#   (dnspython xabarni tuzadi/o'qiydi; NXDOMAIN javoblari faqat header'dan o'qiladi)
+# - resolverlar navbat bilan almashtiriladi, SERVFAIL / REFUSED / timeout - keyingi resolverda qayta
+# - wildcard: har bir parent zona uchun tasodifiy nomlar so'raladi, javobi wildcard
+#   javobi bilan bir xil bo'lgan nomlar tashlanadi
+# - wordlist mmap orqali o'qiladi (butun fayl xotiraga yuklanmaydi)
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import random
+import socket
+import string
+import asyncio
+from datetime import datetime
+
+import dns.message
+import dns.rdatatype
+import dns.asyncquery
+import dns.exception
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.config import (C_TITLE, C_OK, C_WARN, C_INFO, C_RESET, WORDLISTS, DNS_RESOLVERS,
+                        DNS_BRUTE_CONCURRENCY, DNS_BRUTE_TIMEOUT, DNS_BRUTE_RETRIES,
+                        DNS_BRUTE_WILDCARD_PROBES)
+from app.utils import Logger, print_header, print_footer, pause, clear_screen, parse_nameserver
+from app.information_gathering.active.httprobe import probe_subdomains
+
+OUTPUT_DIR = "reports/information_gathering/active/dns_brute"
+WORD_RE = re.compile(rb'[a-z0-9_](?:[a-z0-9_.-]*[a-z0-9_])?')
+RCODE_NOERROR, RCODE_NXDOMAIN = 0, 3
+MAX_RESOLVER_FAILURES = 20      # ketma-ket shuncha xato - resolver vaqtincha chetlatiladi
+RESOLVER_BACKOFF = 5.0          # chetlatilgan resolver shuncha sekunddan keyin yana sinab ko'riladi
+SOCKET_BUFFER = 1 << 20         # yuzlab parallel javob kernel buferida yo'qolmasligi uchun
+
+
+# ==================== WORDLIST ====================
+
+def iter_words(path):
+    """Wordlist'dan takrorlanmas, kichik harfli so'zlar (mmap bilan oqim)"""
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:          # bo'sh fayl
+            return
+        with mm:
+            seen = set()
+            for line in iter(mm.readline, b''):
+                word = line.strip().lower().rstrip(b'.')
+                if word in seen or not WORD_RE.fullmatch(word):
+                    continue
+                seen.add(word)
+                yield word.decode('ascii')
+
+
+def count_lines(path):
+    """Progress uchun taxminiy so'zlar soni"""
+    with open(path, 'rb') as f:
+        return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+
+
+# ==================== RESOLVER SOCKET ====================
+
+class ResolverSocket(asyncio.DatagramProtocol):
+    """Bitta nameserver'ga ulangan UDP socket: ko'p so'rov parallel, ID bo'yicha moslash"""
+
+    def __init__(self, nameserver):
+        self.nameserver = nameserver
+        self.address = parse_nameserver(nameserver)
+        self.transport = None
+        self.pending = {}           # id -> (future, savol bytes)
+        self.failures = 0           # ketma-ket xatolar
+        self.retry_at = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+        except OSError:
+            pass
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        entry = self.pending.get(int.from_bytes(data[:2], 'big'))
+        if entry is None:
+            return
+        future, question = entry
+        # Savol bo'limi mos kelmasa - kechikkan yoki soxta javob
+        if data[12:12 + len(question)].lower() != question or future.done():
+            return
+        future.set_result(data)
+
+    def error_received(self, exc):
+        pass                        # ICMP unreachable - so'rovlar timeout bilan tugaydi
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, remote_addr=self.address)
+        return self
+
+    def close(self):
+        if self.transport:
+            self.transport.close()
+
+    def failed(self):
+        self.failures += 1
+        if self.failures >= MAX_RESOLVER_FAILURES:
+            self.retry_at = time.monotonic() + RESOLVER_BACKOFF
+
+    def available(self):
+        """Chetlatilgan resolverga har RESOLVER_BACKOFF da faqat bitta sinov so'rovi"""
+        if self.failures < MAX_RESOLVER_FAILURES:
+            return True
+        now = time.monotonic()
+        if now < self.retry_at:
+            return False
+        self.retry_at = now + RESOLVER_BACKOFF
+        return True
+
+    async def query(self, wire, timeout):
+        """wire: ID'siz (0) so'rov. Return: javob bytes (timeout - asyncio.TimeoutError)"""
+        qid = random.getrandbits(16)
+        while qid in self.pending:
+            qid = random.getrandbits(16)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[qid] = (future, wire[12:].lower())
+        try:
+            self.transport.sendto(qid.to_bytes(2, 'big') + wire[2:])
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            del self.pending[qid]
+
+
+def parse_answer(response):
+    """A javobidan manzillar va CNAME zanjiri"""
+    addresses, cnames = [], []
+    for rrset in response.answer:
+        if rrset.rdtype == dns.rdatatype.A:
+            addresses.extend(rdata.address for rdata in rrset)
+        elif rrset.rdtype == dns.rdatatype.CNAME:
+            cnames.extend(rdata.target.to_text().rstrip('.').lower() for rdata in rrset)
+    return addresses, cnames
+
+
+# ==================== BRUTEFORCE ====================
+
+class DNSBruteForcer:
+    """
+    Async subdomain bruteforce
+
+    brute = DNSBruteForcer("example.com", nameservers=["1.1.1.1", "127.0.0.1:5353"])
+    found = brute.run(iter_words(WORDLISTS['subdomains']), on_found=print_found)
+    brute.stats  -> {'queries', 'retries', 'failed', 'wildcard', 'found', 'checked'}
+    """
+
+    def __init__(self, domain, nameservers=None, concurrency=DNS_BRUTE_CONCURRENCY,
+                 timeout=DNS_BRUTE_TIMEOUT, retries=DNS_BRUTE_RETRIES,
+                 wildcard_probes=DNS_BRUTE_WILDCARD_PROBES):
+        self.domain = domain.strip().lower().rstrip('.')
+        self.nameservers = list(nameservers or DNS_RESOLVERS)
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.wildcard_probes = max(1, wildcard_probes)
+        self.resolvers = []
+        self.wildcards = {}         # zona -> Task (None yoki wildcard javobi)
+        self.stats = dict.fromkeys(('checked', 'queries', 'retries', 'failed', 'wildcard', 'found'), 0)
+        self._turn = 0
+
+    # ---------------- resolve ----------------
+
+    def _pick(self):
+        """Navbatdagi resolver (ketma-ket xato berganlari RESOLVER_BACKOFF davomida o'tkazib yuboriladi)"""
+        for _ in range(len(self.resolvers)):
+            resolver = self.resolvers[self._turn % len(self.resolvers)]
+            self._turn += 1
+            if resolver.available():
+                return resolver
+        return resolver
+
+    async def resolve(self, name):
+        """
+        Return: (addresses, cnames) - topildi, None - mavjud emas (NXDOMAIN / A yo'q),
+        False - barcha urinishlar xato bilan tugadi
+        """
+        try:
+            message = dns.message.make_query(name, dns.rdatatype.A)
+        except dns.exception.DNSException:
+            return None
+        message.id = 0
+        wire = message.to_wire()
+
+        for attempt in range(self.retries + 1):
+            resolver = self._pick()
+            self.stats['queries'] += 1
+            if attempt:
+                self.stats['retries'] += 1
+            try:
+                data = await resolver.query(wire, self.timeout)
+            except asyncio.TimeoutError:
+                resolver.failed()
+                continue
+
+            rcode = data[3] & 0x0F
+            if rcode not in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                resolver.failed()           # SERVFAIL, REFUSED ...
+                continue
+            resolver.failures = 0
+            if rcode == RCODE_NXDOMAIN or (data[6:8] == b'\x00\x00' and not data[2] & 0x02):
+                return None
+            try:
+                if data[2] & 0x02:          # TC - javob TCP orqali qayta olinadi
+                    message.id = random.getrandbits(16)
+                    response = await dns.asyncquery.tcp(message, resolver.address[0], self.timeout,
+                                                        port=resolver.address[1])
+                else:
+                    response = dns.message.from_wire(data)
+            except (dns.exception.DNSException, OSError, ValueError):
+                continue
+            addresses, cnames = parse_answer(response)
+            return (addresses, cnames) if addresses or cnames else None
+
+        self.stats['failed'] += 1
+        return False
+
+    # ---------------- wildcard ----------------
+
+    async def _detect_wildcard(self, zone):
+        """Tasodifiy nomlar resolve bo'lsa - zona wildcard. Return: (ip set, cname set) / None"""
+        labels = [''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+                  for _ in range(self.wildcard_probes)]
+        answers = await asyncio.gather(*(self.resolve(f"{label}.{zone}") for label in labels))
+        answers = [answer for answer in answers if answer]
+        if not answers:
+            return None
+        return ({ip for addresses, _ in answers for ip in addresses},
+                {cname for _, cnames in answers for cname in cnames})
+
+    def wildcard(self, zone):
+        """Har bir zona faqat bir marta tekshiriladi (parallel so'rovlar bitta natijani kutadi)"""
+        task = self.wildcards.get(zone)
+        if task is None:
+            task = self.wildcards[zone] = asyncio.ensure_future(self._detect_wildcard(zone))
+        return task
+
+    @staticmethod
+    def is_wildcard(answer, signature):
+        addresses, cnames = answer
+        ips, targets = signature
+        if cnames and cnames[0] in targets:
+            return True
+        return bool(addresses) and set(addresses) <= ips
+
+    # ---------------- run ----------------
+
+    async def check(self, word):
+        name = f"{word}.{self.domain}"
+        answer = await self.resolve(name)
+        self.stats['checked'] += 1
+        if not answer:
+            return None
+        signature = await self.wildcard(name.split('.', 1)[1])
+        if signature and self.is_wildcard(answer, signature):
+            self.stats['wildcard'] += 1
+            return None
+        self.stats['found'] += 1
+        addresses, cnames = answer
+        return {'name': name, 'addresses': addresses, 'cname': cnames}
+
+    async def _run(self, words, on_found, on_progress):
+        self.resolvers = [await ResolverSocket(ns).open() for ns in self.nameservers]
+        found = []
+        words = iter(words)
+
+        async def worker():
+            # Umumiy iterator: next() orasida await yo'q - workerlar so'zni ikki marta olmaydi
+            for word in words:
+                result = await self.check(word)
+                if result:
+                    found.append(result)
+                    if on_found:
+                        on_found(result)
+
+        async def progress():
+            while True:
+                await asyncio.sleep(1)
+                on_progress(self.stats)
+
+        reporter = asyncio.ensure_future(progress()) if on_progress else None
+        try:
+            await self.wildcard(self.domain)
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            if reporter:
+                reporter.cancel()
+            for task in self.wildcards.values():
+                task.cancel()
+            for resolver in self.resolvers:
+                resolver.close()
+
+        found.sort(key=lambda r: r['name'])
+        return found
+
+    def run(self, words, on_found=None, on_progress=None):
+        """
+        words: subdomain label'lar iterable'i ('www', 'dev.api', ...)
+        on_found(record) - har bir haqiqiy (wildcard bo'lmagan) topilmada
+        on_progress(stats) - har sekundda
+        Return: [{'name', 'addresses', 'cname'}] tartiblangan
+        """
+        start = time.time()
+        try:
+            return asyncio.run(self._run(words, on_found, on_progress))
+        finally:
+            self.stats['elapsed'] = round(time.time() - start, 2)
+
+    def wildcard_zones(self):
+        """Aniqlangan wildcard zonalar: {zona: [ip/cname, ...]}"""
+        zones = {}
+        for zone, task in self.wildcards.items():
+            if task.done() and not task.cancelled() and task.result():
+                ips, cnames = task.result()
+                zones[zone] = sorted(ips) + sorted(cnames)
+        return zones
+
+
+# ==================== UI ====================
+
+def print_found(record):
+    sys.stdout.write('\r' + ' ' * 78 + '\r')
+    target = ', '.join(record['cname'][:1] + record['addresses'][:3])
+    print(f"{C_OK}[✓] {record['name']:<45}{C_RESET} → {C_INFO}{target}{C_RESET}")
+
+
+def make_progress(total, start):
+    def on_progress(stats):
+        rate = stats['queries'] / max(time.time() - start, 0.001)
+        sys.stdout.write(f"\r{C_INFO}[*] {stats['checked']}/{total} | {rate:.0f} so'rov/s | "
+                         f"topildi: {stats['found']} | wildcard: {stats['wildcard']} | "
+                         f"xato: {stats['failed']}{C_RESET}   ")
+        sys.stdout.flush()
+    return on_progress
+
+
+def get_wordlist():
+    """WORDLISTS['subdomains'] yoki foydalanuvchi kiritgan fayl"""
+    default = WORDLISTS['subdomains']
+    if os.path.isfile(default):
+        print(f"\n{C_INFO}Wordlist (Enter - {default}):{C_RESET}")
+    else:
+        print(f"\n{C_INFO}Wordlist yo'li:{C_RESET}")
+    path = input(f"    {C_INFO}She11>{C_RESET} ").strip() or default
+    return path if os.path.isfile(path) else None
+
+
+def run_dns_brute_scanner(target=None):
+    """DNS Bruteforce asosiy funksiya"""
+    clear_screen()
+    print_header("DNS BRUTEFORCE - ASYNC SUBDOMAIN ENUMERATION", 80)
+    print(f"{C_TITLE}         Resolver rotation + wildcard filtering (built-in){C_RESET}\n")
+
+    if not target:
+        print(f"{C_INFO}Domain kiriting (example.com):{C_RESET}")
+        target = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+
+    domain = target.replace("http://", "").replace("https://", "").split('/')[0].split(':')[0].strip('.')
+    if not domain or '.' not in domain:
+        Logger.error("Domain kiritilmadi!")
+        pause()
+        return
+
+    wordlist = get_wordlist()
+    if not wordlist:
+        Logger.error("Wordlist topilmadi!")
+        pause()
+        return
+
+    print(f"\n{C_INFO}DNS serverlar, vergul bilan (Enter - {', '.join(DNS_RESOLVERS)}):{C_RESET}")
+    value = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+    nameservers = [ns.strip() for ns in value.split(',') if ns.strip()] or DNS_RESOLVERS
+
+    concurrency = DNS_BRUTE_CONCURRENCY
+    print(f"\n{C_INFO}Parallel so'rovlar (default: {DNS_BRUTE_CONCURRENCY}):{C_RESET}")
+    value = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+    if value.isdigit() and int(value) > 0:
+        concurrency = int(value)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_prefix = f"{OUTPUT_DIR}/dns_brute_{domain}_{timestamp}"
+    total = count_lines(wordlist)
+
+    print(f"\n{C_OK}[+] Domain: {domain}{C_RESET}")
+    print(f"{C_INFO}[*] Wordlist: {wordlist} (~{total} so'z){C_RESET}")
+    print(f"{C_INFO}[*] Resolverlar: {', '.join(nameservers)} | Concurrency: {concurrency}{C_RESET}")
+    print(f"{C_INFO}[*] Output: {output_prefix}.jsonl{C_RESET}\n")
+    print(f"{C_WARN}{'='*80}{C_RESET}\n")
+
+    brute = DNSBruteForcer(domain, nameservers=nameservers, concurrency=concurrency)
+    output = open(f"{output_prefix}.jsonl", 'w', encoding='utf-8')
+
+    def on_found(record):
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        print_found(record)
+
+    found = []
+    try:
+        found = brute.run(iter_words(wordlist), on_found=on_found,
+                          on_progress=make_progress(total, time.time()))
+    except KeyboardInterrupt:
+        print(f"\n\n{C_WARN}[!] Scan to'xtatildi (Ctrl+C){C_RESET}")
+        print(f"{C_INFO}[*] Qisman natijalar: {output_prefix}.jsonl{C_RESET}")
+    finally:
+        output.close()
+
+    stats = brute.stats
+    sys.stdout.write('\r' + ' ' * 78 + '\r')
+    print(f"\n{C_WARN}{'='*80}{C_RESET}\n")
+    for zone, answers in brute.wildcard_zones().items():
+        print(f"{C_WARN}[!] Wildcard: *.{zone} → {', '.join(answers[:4])}{C_RESET}")
+    elapsed = stats.get('elapsed', 0) or 0.001
+    Logger.success(f"{stats['checked']} nom tekshirildi, {len(found)} ta subdomain topildi")
+    print(f"{C_INFO}[*] So'rovlar: {stats['queries']} ({stats['queries'] / elapsed:.0f}/s) | "
+          f"qayta: {stats['retries']} | xato: {stats['failed']} | "
+          f"wildcard filtrlandi: {stats['wildcard']}{C_RESET}")
+    print(f"{C_INFO}[*] Vaqt: {elapsed:.2f} soniya{C_RESET}")
+
+    if found:
+        with open(f"{output_prefix}.txt", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(record['name'] for record in found) + '\n')
+        print(f"{C_INFO}[*] Natijalar:{C_RESET}")
+        print(f"    {C_OK}• {output_prefix}.jsonl{C_RESET}")
+        print(f"    {C_OK}• {output_prefix}.txt{C_RESET}\n")
+
+        print(f"{C_INFO}{len(found)} ta hostni HTTP/HTTPS tekshirish? (y/n):{C_RESET}")
+        if input(f"    {C_INFO}She11>{C_RESET} ").strip().lower() == 'y':
+            probe_subdomains([record['name'] for record in found], output_prefix)
+
+    print_footer()
+    pause()
+
+
+if __name__ == "__main__":
+    run_dns_brute_scanner(sys.argv[1] if len(sys.argv) > 1 else None)
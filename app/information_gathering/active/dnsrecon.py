@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
 from app.config import C_TITLE, C_OK, C_WARN, C_ERR, C_INFO, C_RESET
 from app.utils import Logger, print_header, print_footer, pause, clear_screen
+from app.information_gathering.active.httprobe import probe_subdomains
 
 
 def check_dnsrecon():
@@ -161,6 +162,18 @@ def parse_dns_records(output_file):
         return {'raw': lines}
 
 
+def collect_hostnames(records, domain):
+    """A/AAAA/CNAME recordlardan hostnamelarni yig'ish (HTTP probe uchun)"""
+    hosts = set()
+    for rec_type in ('A', 'AAAA', 'CNAME'):
+        for entry in records.get(rec_type, []):
+            name = entry.get('name', entry.get('hostname', ''))
+            host = name.rstrip('.')
+            if host == domain or host.endswith('.' + domain):
+                hosts.add(host)
+    return sorted(hosts)
+
+
 def display_dns_results(records, domain, scan_type_name):
     """DNS natijalarni ko'rsatish"""
     print(f"\n{C_TITLE}{'='*80}{C_RESET}")
@@ -366,6 +379,12 @@ def run_dnsrecon_scanner(target=None):
             print(f"{C_INFO}[*] Natijalar saqlandi:{C_RESET}")
             print(f"    {C_OK}• {output_file}.json{C_RESET}")
             print(f"    {C_OK}• {output_file}.txt{C_RESET}\n")
+            
+            hosts = collect_hostnames(records, domain) if 'raw' not in records else []
+            if hosts:
+                print(f"{C_INFO}{len(hosts)} ta hostni HTTP/HTTPS tekshirish? (y/n):{C_RESET}")
+                if input(f"    {C_INFO}She11>{C_RESET} ").strip().lower() == 'y':
+                    probe_subdomains(hosts, output_file)
         else:
             Logger.warning("Hech qanday DNS record topilmadi!")
     
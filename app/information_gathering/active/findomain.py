@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 
 from app.config import C_TITLE, C_OK, C_WARN, C_ERR, C_INFO, C_RESET
 from app.utils import Logger, print_header, print_footer, pause, clear_screen
+from app.information_gathering.active.httprobe import probe_hosts
 
 
 def check_findomain():
@@ -119,53 +120,12 @@ def display_results(stats, domain):
     print(f"\n{C_TITLE}{'='*80}{C_RESET}\n")
 
 
-def check_http_status(subdomain_list, threads=50):
-    """HTTP/HTTPS statuslarini tekshirish"""
-    print(f"\n{C_INFO}[*] HTTP/HTTPS statuslarini tekshirish...{C_RESET}")
+def check_http_status(subdomain_list, threads=50, output_file=None):
+    """HTTP/HTTPS statuslarini tekshirish (built-in async prober orqali)"""
+    print(f"\n{C_INFO}[*] HTTP/HTTPS statuslarini tekshirish ({threads} parallel)...{C_RESET}")
     
-    alive_hosts = []
-    loading_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
-    loading_idx = 0
-    
-    for i, subdomain in enumerate(subdomain_list):
-        sys.stdout.write(f"\r{C_INFO}{loading_chars[loading_idx]} Checking {i+1}/{len(subdomain_list)}{C_RESET}")
-        sys.stdout.flush()
-        loading_idx = (loading_idx + 1) % len(loading_chars)
-        
-        try:
-            # HTTP check
-            result = subprocess.run(
-                ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}", 
-                 f"http://{subdomain}", "--max-time", "3"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.stdout and result.stdout.startswith('2'):
-                alive_hosts.append(('http', subdomain, result.stdout))
-                sys.stdout.write('\r' + ' ' * 60 + '\r')
-                print(f"{C_OK}[✓] http://{subdomain} → {result.stdout}{C_RESET}")
-            
-            # HTTPS check
-            result = subprocess.run(
-                ["curl", "-s", "-o", "/dev/null", "-w", "%{http_code}", 
-                 f"https://{subdomain}", "--max-time", "3", "-k"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.stdout and result.stdout.startswith('2'):
-                alive_hosts.append(('https', subdomain, result.stdout))
-                sys.stdout.write('\r' + ' ' * 60 + '\r')
-                print(f"{C_OK}[✓] https://{subdomain} → {result.stdout}{C_RESET}")
-        
-        except:
-            pass
-    
-    sys.stdout.write('\r' + ' ' * 60 + '\r')
-    return alive_hosts
+    alive = probe_hosts(subdomain_list, concurrency=threads, output_file=output_file)
+    return [(r['scheme'], r['host'], str(r['status'])) for r in alive]
 
 
 def run_findomain_scanner(target=None):
@@ -268,7 +228,8 @@ def run_findomain_scanner(target=None):
             
             # HTTP check
             if options['http_check'] and stats['subdomains']:
-                alive = check_http_status(stats['subdomains'][:50], options['threads'])
+                alive_jsonl = output_file.replace('.txt', '_alive.jsonl')
+                alive = check_http_status(stats['subdomains'], options['threads'], alive_jsonl)
                 
                 if alive:
                     print(f"\n{C_TITLE}[+] ACTIVE HOSTS:{C_RESET}")
@@ -281,6 +242,7 @@ def run_findomain_scanner(target=None):
                         for proto, host, code in alive:
                             f.write(f"{proto}://{host}\n")
                     print(f"\n{C_INFO}[*] Active hosts: {alive_file}{C_RESET}")
+                    print(f"{C_INFO}[*] Details (JSONL): {alive_jsonl}{C_RESET}")
             
             print(f"\n{C_INFO}[*] To'liq natijalar: {output_file}{C_RESET}\n")
         else:
@@ -0,0 +1,283 @@
+# app/information_gathering/active/httprobe.py
+# Built-in asyncio HTTP/HTTPS prober → reports/information_gathering/active/httprobe/*.jsonl
+
+import os
+import sys
+import re
+import json
+import time
+import asyncio
+from datetime import datetime
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from app.config import C_TITLE, C_OK, C_WARN, C_INFO, C_RESET, HEADERS
+from app.utils import Logger, print_header, print_footer, pause, clear_screen, DNSCache
+
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_TIMEOUT = 5
+MAX_BODY_BYTES = 256 * 1024
+OUTPUT_DIR = "reports/information_gathering/active/httprobe"
+
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def check_aiohttp():
+    """aiohttp o'rnatilganligini tekshirish"""
+    if aiohttp is not None:
+        return True
+    Logger.error("aiohttp topilmadi!")
+    print(f"\n{C_WARN}[!] O'rnatish:{C_RESET}")
+    print(f"    {C_INFO}pip3 install aiohttp{C_RESET}\n")
+    return False
+
+
+def normalize_host(line):
+    """Qatordan host[:port] ajratib olish (scheme va path olib tashlanadi)"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    host = line.split('://', 1)[-1].split('/', 1)[0].strip().lower()
+    return host or None
+
+
+def iter_hosts(hosts):
+    """Hostlarni normalize qilib, takrorlarsiz qaytarish"""
+    seen = set()
+    for line in hosts:
+        host = normalize_host(line)
+        if host and host not in seen:
+            seen.add(host)
+            yield host
+
+
+def load_hosts(path):
+    """Fayldan hostlar ro'yxatini o'qish"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return list(iter_hosts(f))
+
+
+def extract_title(body):
+    """HTML <title> ni olish"""
+    match = TITLE_RE.search(body)
+    if not match:
+        return ""
+    title = match.group(1).decode('utf-8', errors='ignore')
+    return ' '.join(title.split())[:200]
+
+
+async def _fetch(session, scheme, host):
+    """Bitta URL ni tekshirish - javob bo'lsa dict, aks holda None"""
+    url = f"{scheme}://{host}"
+    try:
+        async with session.get(url, allow_redirects=True, max_redirects=5) as resp:
+            body = await resp.content.read(MAX_BODY_BYTES)
+            length = resp.headers.get('Content-Length')
+            return {
+                'host': host,
+                'scheme': scheme,
+                'url': url,
+                'status': resp.status,
+                'title': extract_title(body),
+                'content_length': int(length) if length and length.isdigit() else len(body),
+                'final_url': str(resp.url),
+            }
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+        return None
+
+
+async def _probe_host(session, host):
+    """HTTP va HTTPS ni bir vaqtda tekshirish (resolve bo'lmagan host tekshirilmaydi)"""
+    try:
+        name = urlsplit('//' + host).hostname or host
+    except ValueError:
+        return []
+    if not await DNSCache.aresolve(name):
+        return []
+    results = await asyncio.gather(_fetch(session, 'http', host), _fetch(session, 'https', host))
+    return [r for r in results if r]
+
+
+async def _probe_all(hosts, concurrency, timeout, output, on_alive):
+    """Worker pool: har bir worker navbatdan host olib tekshiradi"""
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    alive = []
+    stats = {'checked': 0}
+
+    connector = aiohttp.TCPConnector(
+        limit=concurrency * 2,
+        limit_per_host=4,
+        ttl_dns_cache=300,
+        ssl=False,
+    )
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers=HEADERS) as session:
+
+        async def worker():
+            while True:
+                host = await queue.get()
+                if host is None:
+                    queue.task_done()
+                    return
+                for result in await _probe_host(session, host):
+                    alive.append(result)
+                    if output:
+                        output.write(json.dumps(result) + "\n")
+                        output.flush()
+                    if on_alive:
+                        on_alive(result)
+                stats['checked'] += 1
+                queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        for host in iter_hosts(hosts):
+            await queue.put(host)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    return alive, stats['checked']
+
+
+def print_alive(result):
+    """Tirik hostni chop etish"""
+    sys.stdout.write('\r' + ' ' * 70 + '\r')
+    title = f" [{result['title'][:50]}]" if result['title'] else ""
+    print(f"{C_OK}[✓] {result['url']} → {result['status']}{C_RESET}"
+          f" {C_INFO}{result['content_length']}b{title}{C_RESET}")
+
+
+def probe_hosts(hosts, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                output_file=None, on_alive=print_alive):
+    """
+    Hostlarni parallel tekshirish (boshqa modullar ham ishlatadi)
+
+    hosts: subdomain/host/URL lar iterable'i
+    output_file: JSONL fayl - tirik hostlar kelishi bilan yoziladi
+    Return: tirik hostlar ro'yxati (status, title, content_length, final_url)
+    """
+    if not check_aiohttp():
+        return []
+
+    concurrency = max(1, int(concurrency))
+    output = None
+    if output_file:
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        output = open(output_file, 'w', encoding='utf-8')
+
+    try:
+        alive, _ = asyncio.run(_probe_all(hosts, concurrency, timeout, output, on_alive))
+    finally:
+        if output:
+            output.close()
+
+    alive.sort(key=lambda r: (r['host'], r['scheme']))
+    return alive
+
+
+def probe_subdomains(subdomains, report_prefix, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Subdomain modullari (sublist3r, assetfinder, dnsrecon, findomain) uchun
+    umumiy wrapper: tekshiradi, *_alive.jsonl saqlaydi, qisqa xulosa chiqaradi
+    """
+    output_file = f"{report_prefix}_alive.jsonl"
+    print(f"\n{C_INFO}[*] HTTP/HTTPS tekshirilmoqda ({len(subdomains)} host, "
+          f"{concurrency} parallel)...{C_RESET}")
+
+    start = time.time()
+    alive = probe_hosts(subdomains, concurrency=concurrency, output_file=output_file)
+    elapsed = time.time() - start
+
+    print(f"\n{C_OK}[+] Tirik: {len(alive)} ta URL ({elapsed:.2f} soniya){C_RESET}")
+    if alive:
+        print(f"{C_INFO}[*] Active hosts: {output_file}{C_RESET}")
+    return alive
+
+
+def run_httprobe_scanner(target=None):
+    """HTTP Prober asosiy funksiya"""
+    clear_screen()
+    print_header("HTTPROBE - FAST HTTP/HTTPS PROBER", 80)
+    print(f"{C_TITLE}         Async alive host detection (built-in){C_RESET}\n")
+
+    if not check_aiohttp():
+        pause()
+        return
+
+    if not target:
+        print(f"{C_INFO}Host fayli yoki bitta domain kiriting:{C_RESET}")
+        target = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+
+    if not target:
+        Logger.error("Target kiritilmadi!")
+        pause()
+        return
+
+    if os.path.isfile(target):
+        hosts = load_hosts(target)
+    else:
+        hosts = list(iter_hosts([target]))
+
+    if not hosts:
+        Logger.error("Hostlar topilmadi!")
+        pause()
+        return
+
+    concurrency = DEFAULT_CONCURRENCY
+    print(f"\n{C_INFO}Parallel ulanishlar (default: {DEFAULT_CONCURRENCY}):{C_RESET}")
+    value = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+    if value.isdigit() and int(value) > 0:
+        concurrency = int(value)
+
+    timeout = DEFAULT_TIMEOUT
+    print(f"\n{C_INFO}Timeout soniyada (default: {DEFAULT_TIMEOUT}):{C_RESET}")
+    value = input(f"    {C_INFO}She11>{C_RESET} ").strip()
+    if value.isdigit() and int(value) > 0:
+        timeout = int(value)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"{OUTPUT_DIR}/httprobe_{timestamp}.jsonl"
+
+    print(f"\n{C_OK}[+] Hostlar: {len(hosts)}{C_RESET}")
+    print(f"{C_INFO}[*] Concurrency: {concurrency} | Timeout: {timeout}s{C_RESET}")
+    print(f"{C_INFO}[*] Output: {output_file}{C_RESET}\n")
+    print(f"{C_WARN}{'='*80}{C_RESET}\n")
+
+    start = time.time()
+    try:
+        alive = probe_hosts(hosts, concurrency=concurrency, timeout=timeout,
+                            output_file=output_file)
+    except KeyboardInterrupt:
+        print(f"\n\n{C_WARN}[!] Scan to'xtatildi (Ctrl+C){C_RESET}")
+        print(f"{C_INFO}[*] Qisman natijalar: {output_file}{C_RESET}")
+        print_footer()
+        pause()
+        return
+    elapsed = time.time() - start
+
+    print(f"\n{C_WARN}{'='*80}{C_RESET}\n")
+    Logger.success(f"{len(hosts)} host tekshirildi, {len(alive)} ta tirik URL")
+    print(f"{C_INFO}[*] Vaqt: {elapsed:.2f} soniya{C_RESET}")
+    print(f"{C_INFO}[*] Natijalar: {output_file}{C_RESET}")
+
+    print_footer()
+    pause()
+
+
+def run_httprobe(target):
+    """Menu uchun wrapper"""
+    run_httprobe_scanner(target)
+
+
+if __name__ == "__main__":
+    run_httprobe_scanner(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -2,18 +2,17 @@
 
 import os
 import subprocess
-import socket
 import time
 import threading
 from datetime import datetime
-from app.utils import Logger
+from app.utils import Logger, DNSCache
 from app.config import C_OK, C_ERR, C_WARN, C_INFO, C_RESET, C_TITLE
 
 def run_nikto_scanner(target_input: str):
     target = target_input.strip().lower().replace("http://", "").replace("https://", "").split("/")[0]
     
     try:
-        ip = socket.gethostbyname(target)
+        ip = DNSCache.gethostbyname(target)
     except:
         ip = "noma'lum"
 
@@ -13,6 +13,10 @@ sys.path.insert(0, BASE_DIR)
 from app.utils import Logger, clear_screen, pause
 from app.config import C_OK, C_WARN, C_ERR, C_INFO, C_TITLE, C_RESET
 
+# scanning/active modullari main.py dagidek to'g'ridan-to'g'ri yuklanadi
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../scanning/active"))
+from nmap_xml import has_service_detection, correlate_and_report
+
 
 def run_command(cmd, timeout=1200):
     try:
@@ -32,8 +36,8 @@ def get_nmap_report_path(target):
     return f"{output_dir}/{safe_name}_{timestamp}.txt"
 
 
-def save_nmap_result(target, profile_name, command, output):
-    report_file = get_nmap_report_path(target)
+def save_nmap_result(target, profile_name, command, output, report_file=None):
+    report_file = report_file or get_nmap_report_path(target)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     separator = "=" * 95
@@ -118,6 +122,13 @@ class NmapScanner:
             else:
                 cmd = base.split() + [target]
 
+            # -sV / -A natijasi XML ga ham yoziladi → CVE korrelyatsiyasi
+            report_file = get_nmap_report_path(target)
+            xml_file = None
+            if has_service_detection(cmd) and "-oX" not in cmd:
+                xml_file = report_file[:-4] + ".xml"
+                cmd = cmd + ["-oX", xml_file]
+
             full_cmd = " ".join(cmd)
             print(f"\n{C_OK}Launching → {profile_name}{C_RESET}")
             print(f"{C_WARN}Command: {full_cmd}{C_RESET}\n")
@@ -127,7 +138,10 @@ class NmapScanner:
 
             if rc == 0:
                 print(out)
-                save_nmap_result(target, profile_name, full_cmd, out)
+                save_nmap_result(target, profile_name, full_cmd, out, report_file)
+                if xml_file:
+                    print(f"\n{C_INFO}[*] Servislar CVE bazasi bilan solishtirilmoqda...{C_RESET}")
+                    correlate_and_report(xml_file)
             else:
                 print(f"{C_ERR}Error occurred!{C_RESET}")
                 if err:
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../'))
 
 from app.config import C_TITLE, C_OK, C_WARN, C_ERR, C_INFO, C_RESET
 from app.utils import Logger, print_header, print_footer, pause, clear_screen
+from app.information_gathering.active.httprobe import probe_subdomains
 
 
 def check_sublist3r():
@@ -557,6 +558,10 @@ def run_sublist3r_scanner(target=None):
             Logger.success(f"Scan muvaffaqiyatli tugadi!")
             display_results(stats, domain, engines, elapsed_time)
             print(f"{C_INFO}[💾] Natijalar saqlandi: {output_file}{C_RESET}\n")
+            
+            print(f"{C_INFO}Tirik hostlarni tekshirish (HTTP/HTTPS)? (y/n):{C_RESET}")
+            if input(f"    {C_INFO}She11>{C_RESET} ").strip().lower() == 'y':
+                probe_subdomains(stats['subdomains'], output_file[:-4], options['threads'] or 50)
         else:
             Logger.warning("Hech qanday subdomain topilmadi!")
             print(f"\n{C_ERR}{'='*80}{C_RESET}")
@@ -13,6 +13,14 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 from app.config import C_TITLE, C_OK, C_WARN, C_ERR, C_INFO, C_RESET
 from app.utils import Logger, print_header, print_footer, pause, clear_screen
 
+# Texnologiya emas - faqat sahifa/javob haqida ma'lumot beruvchi pluginlar
+INFO_PLUGINS = {
+    'IP', 'Country', 'Title', 'RedirectLocation', 'UncommonHeaders', 'HTML5',
+    'Script', 'Email', 'Meta-Author', 'MetaGenerator', 'Cookies', 'HttpOnly',
+    'X-Frame-Options', 'X-XSS-Protection', 'Strict-Transport-Security',
+    'Content-Security-Policy', 'X-UA-Compatible', 'PasswordField', 'Frame',
+}
+
 
 def check_whatweb():
     """WhatWeb o'rnatilganligini tekshirish"""
@@ -159,6 +167,109 @@ def parse_whatweb_output(output):
     return results
 
 
+def iter_whatweb_log(json_path):
+    """
+    --log-json faylini oqim bilan o'qish
+    WhatWeb har bir targetni alohida qatorga yozadi ("[", "{...},", "]"),
+    shuning uchun to'xtatilgan (yopilmagan) log ham o'qiladi
+    """
+    with open(json_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip().rstrip(',')
+            if not line.startswith('{'):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def whatweb_record(item):
+    """WhatWeb log elementi -> tech_batch per-host JSONL yozuvi"""
+    from urllib.parse import urlparse
+
+    target = item.get('target', '')
+    plugins = item.get('plugins', {})
+    technologies = {}
+    for name, info in sorted(plugins.items()):
+        if name in INFO_PLUGINS:
+            continue
+        version = (info.get('version') or [''])[0]
+        if name == 'HTTPServer':
+            # "nginx/1.24.0" -> nginx, 1.24.0
+            name, _, version = (info.get('string') or ['HTTPServer'])[0].partition('/')
+            version = version.split()[0] if version else ''
+        technologies[name] = {'version': version, 'categories': []}
+    return {
+        'url': target,
+        'host': urlparse(target).netloc,
+        'final_url': target,
+        'status': item.get('http_status', ''),
+        'technologies': technologies,
+    }
+
+
+def run_whatweb_batch(path, aggression):
+    """
+    Fayldagi barcha targetlar uchun bitta WhatWeb jarayoni (-i, --max-threads)
+    Natija: per-host JSONL + texnologiya -> hostlar inventari (tech_batch formatida)
+    """
+    from app.config import TECH_BATCH_WORKERS
+    from app.information_gathering.passive.tech_batch import (
+        load_targets, TechInventory, print_record, print_inventory, save_inventory
+    )
+
+    targets = load_targets(path)
+    if not targets:
+        Logger.error("Faylda URL topilmadi!")
+        return None
+
+    output_dir = "reports/information_gathering/active/whatweb"
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base = f"{output_dir}/whatweb_batch_{timestamp}"
+    input_file = f"{base}_targets.txt"
+    with open(input_file, 'w') as f:
+        f.write("\n".join(targets) + "\n")
+
+    cmd = [
+        "whatweb",
+        "-a", aggression,
+        "-i", input_file,
+        "--max-threads", str(TECH_BATCH_WORKERS),
+        "--log-json", f"{base}.json",
+        "--color=never",
+        "--quiet",
+    ]
+
+    print(f"\n{C_OK}[+] WhatWeb batch: {len(targets)} target, {TECH_BATCH_WORKERS} thread{C_RESET}")
+    print(f"{C_INFO}[*] Output: {base}.json{C_RESET}\n")
+
+    start = time.time()
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except KeyboardInterrupt:
+        print(f"\n{C_WARN}[!] To'xtatildi - qisman natijalar o'qiladi{C_RESET}")
+
+    if not os.path.exists(f"{base}.json"):
+        Logger.error("JSON fayl yaratilmadi!")
+        return None
+
+    inventory = TechInventory()
+    with open(f"{base}.jsonl", 'w', encoding='utf-8') as out:
+        for item in iter_whatweb_log(f"{base}.json"):
+            record = whatweb_record(item)
+            inventory.add(record)
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            print_record(record)
+
+    print_inventory(inventory)
+    save_inventory(inventory, f"{base}_inventory.json", source=path)
+    Logger.success(f"WhatWeb batch: {inventory.hosts} host, {time.time() - start:.1f}s")
+    print(f"{C_INFO}[*] Fayllar:{C_RESET} {base}.jsonl, {base}_inventory.json\n")
+    return inventory
+
+
 def display_results(results):
     """Natijalarni chiroyli va tushunarli formatda ko'rsatish"""
     print(f"\n{C_TITLE}{'='*80}{C_RESET}")
@@ -235,7 +346,7 @@ def run_whatweb_scanner(target=None):
     
     # Target olish
     if not target:
-        print(f"{C_INFO}Target URL kiriting (example.com):{C_RESET}")
+        print(f"{C_INFO}Target URL yoki URL ro'yxati fayli kiriting (example.com / urls.txt):{C_RESET}")
         target = input(f"    {C_INFO}She11>{C_RESET} ").strip()
     
     if not target:
@@ -243,6 +354,13 @@ def run_whatweb_scanner(target=None):
         pause()
         return
     
+    # Fayl berilgan bo'lsa - batch rejim
+    if os.path.isfile(target):
+        run_whatweb_batch(target, get_aggression_level())
+        print_footer()
+        pause()
+        return
+    
     # Protocol aniqlash
     if not target.startswith(("http://", "https://")):
         target = auto_detect_protocol(target)
@@ -11,7 +11,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO
-from app.utils import Logger, print_header, print_footer, pause, clear_screen
+from app.utils import Logger, print_header, print_footer, pause, clear_screen, DNSCache
 
 class Ignorant:
     """Professional Email Validation and Verification Tool"""
@@ -158,8 +158,7 @@ class Ignorant:
         success = False
         
         try:
-            import dns.resolver
-            mx_records = dns.resolver.resolve(domain, 'MX')
+            mx_records = self.mx_records(domain)
             
             print(f"{C_OK}OK MX Records Found:{C_RESET}\n")
             result_text += "MX Records Found:\n"
@@ -174,7 +173,7 @@ class Ignorant:
         except ImportError:
             Logger.warning("dnspython not installed - using socket")
             try:
-                socket.gethostbyname(domain)
+                DNSCache.gethostbyname(domain)
                 print(f"{C_OK}OK Domain exists{C_RESET}")
                 print(f"{C_WARN}WARNING Install dnspython for MX record check{C_RESET}\n")
                 result_text += "Domain exists (A record)\nMX check unavailable (dnspython missing)\n"
@@ -200,6 +199,16 @@ class Ignorant:
 
         return success
     
+    def mx_records(self, domain):
+        """MX yozuvlari (DNSCache orqali), priority bo'yicha tartiblangan"""
+        import dns.resolver
+        records = DNSCache.query(domain, 'MX')
+        if records is None:
+            raise RuntimeError(f"DNS query failed for {domain}")
+        if not records:
+            raise RuntimeError(f"The DNS response does not contain an answer to the question: {domain}. IN MX")
+        return sorted(records, key=lambda mx: mx.preference)
+
     def smtp_verification(self, email):
         """SMTP mailbox verification"""
         clear_screen()
@@ -216,8 +225,7 @@ class Ignorant:
         exists = None
         
         try:
-            import dns.resolver
-            mx_records = dns.resolver.resolve(domain, 'MX')
+            mx_records = self.mx_records(domain)
             mx_host = str(mx_records[0].exchange).rstrip('.')
             
             print(f"{C_INFO}Connecting to mail server: {mx_host}{C_RESET}")
@@ -1,16 +1,187 @@
 # app/information_gathering/passive/dns_lookup.py
+#
+# Bitta domen: barcha record turlari + DMARC bir vaqtda (dns.asyncresolver)
+# Bulk rejim: domenlar fayli -> har bir domen uchun bitta JSONL qator,
+# resolverlar qayta ishlatiladi va nameserverlar navbat bilan almashtiriladi
 
 import os
 import sys
+import json
+import asyncio
 import dns.resolver
+import dns.asyncresolver
+import dns.exception
 from datetime import datetime
 
 # ProbeSuite yo‘lini qo‘shish
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, BASE_DIR)
 
-from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE
-from app.utils import Logger, clear_screen
+from app.config import (C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE,
+                        DNS_RESOLVERS, DNS_CONCURRENCY, DNS_TIMEOUT)
+from app.utils import Logger, clear_screen, parse_nameserver
+
+RECORD_TYPES = [
+    ('A', "A RECORDS (IPv4)"),
+    ('AAAA', "AAAA RECORDS (IPv6)"),
+    ('MX', "MX RECORDS (Mail Servers)"),
+    ('NS', "NS RECORDS (Nameservers)"),
+    ('TXT', "TXT RECORDS (SPF, DKIM, DMARC)"),
+    ('CNAME', "CNAME RECORDS"),
+    ('SOA', "SOA RECORDS"),
+]
+RETRY_ERRORS = ('TIMEOUT', 'SERVFAIL')      # keyingi nameserver bilan bir marta qayta so'raladi
+
+
+# ==================== RESOLVER ====================
+
+def make_resolver(nameserver=None, timeout=DNS_TIMEOUT):
+    """
+    Async resolver: nameserver berilmasa - tizim sozlamasi (/etc/resolv.conf),
+    u ham bo'lmasa DNS_RESOLVERS ning birinchisi
+    """
+    resolver = None
+    if not nameserver:
+        try:
+            resolver = dns.asyncresolver.Resolver()
+        except dns.resolver.NoResolverConfiguration:
+            nameserver = DNS_RESOLVERS[0]
+    if resolver is None:
+        ip, port = parse_nameserver(nameserver)
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = [ip]
+        resolver.port = port
+    resolver.timeout = timeout
+    resolver.lifetime = timeout * 2
+    return resolver
+
+
+def format_records(rtype, answers):
+    if rtype == 'MX':
+        return [f"Priority: {r.preference} → {r.exchange}"
+                for r in sorted(answers, key=lambda r: r.preference)]
+    if rtype == 'SOA':
+        return [{
+            'mname': str(r.mname),
+            'rname': str(r.rname),
+            'serial': r.serial,
+            'refresh': r.refresh,
+            'retry': r.retry,
+            'expire': r.expire,
+            'minimum': r.minimum
+        } for r in answers]
+    return [str(r).rstrip('.') for r in answers]
+
+
+async def query(resolver, name, rtype):
+    """Return: (records, None) yoki ([], xato nomi)"""
+    try:
+        return format_records(rtype, await resolver.resolve(name, rtype)), None
+    except dns.resolver.NXDOMAIN:
+        return [], 'NXDOMAIN'
+    except dns.resolver.NoAnswer:
+        return [], 'NOANSWER'
+    except dns.resolver.NoNameservers:
+        return [], 'SERVFAIL'
+    except dns.exception.Timeout:
+        return [], 'TIMEOUT'
+    except dns.exception.DNSException as e:
+        return [], type(e).__name__
+
+
+async def resolve_domain(domain, resolvers, offset=0):
+    """
+    Domenning barcha record turlari + _dmarc TXT - hammasi bir vaqtda
+    resolvers[offset % n] dan boshlanadi; TIMEOUT/SERVFAIL bo'lsa keyingisi
+    """
+    async def ask(name, rtype):
+        records, error = await query(resolvers[offset % len(resolvers)], name, rtype)
+        if error in RETRY_ERRORS and len(resolvers) > 1:
+            records, error = await query(resolvers[(offset + 1) % len(resolvers)], name, rtype)
+        return records, error
+
+    types = [rtype for rtype, _ in RECORD_TYPES]
+    answers = await asyncio.gather(*(ask(domain, rtype) for rtype in types),
+                                   ask(f"_dmarc.{domain}", 'TXT'))
+
+    records, errors = {}, {}
+    for rtype, (found, error) in zip(types, answers):
+        records[rtype] = found
+        if error:
+            errors[rtype] = error
+    dmarc = next((txt for txt in answers[-1][0] if "v=DMARC" in txt), None)
+
+    if 'NXDOMAIN' in errors.values():
+        status = 'NXDOMAIN'
+    elif any(records.values()) or 'NOANSWER' in errors.values():
+        status = 'NOERROR'
+    else:
+        status = next(iter(errors.values()), 'NOERROR')
+    return {'domain': domain, 'status': status, 'records': records, 'dmarc': dmarc, 'errors': errors}
+
+
+# ==================== BULK ====================
+
+def normalize_domain(line):
+    domain = line.strip().lower()
+    if not domain or domain.startswith('#'):
+        return None
+    return domain.split('://')[-1].split('/')[0].split(':')[0].rstrip('.') or None
+
+
+def iter_domains(lines):
+    seen = set()
+    for line in lines:
+        domain = normalize_domain(line)
+        if domain and domain not in seen:
+            seen.add(domain)
+            yield domain
+
+
+async def _bulk(domains, resolvers, concurrency, output, on_result, stats):
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, domain = item
+            record = await resolve_domain(domain, resolvers, offset=index)
+            record['nameserver'] = resolvers[index % len(resolvers)].nameservers[0]
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stats[record['status']] = stats.get(record['status'], 0) + 1
+            if on_result:
+                on_result(record)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for index, domain in enumerate(iter_domains(domains)):
+            await queue.put((index, domain))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def bulk_lookup(domains, output_path, nameservers=None, concurrency=DNS_CONCURRENCY,
+                timeout=DNS_TIMEOUT, on_result=None):
+    """
+    Ko'p domenni bir vaqtda tekshirish (domenlar oqim bilan o'qiladi)
+    nameservers: ['1.1.1.1', '127.0.0.1:5353', ...] - har biriga bitta resolver,
+    domenlar ular orasida navbat bilan taqsimlanadi
+    Return: {status: soni} (Ctrl+C bo'lsa ham yozilganlari saqlanadi)
+    """
+    resolvers = [make_resolver(ns, timeout) for ns in (nameservers or DNS_RESOLVERS)]
+    stats = {}
+    with open(output_path, 'w', encoding='utf-8') as output:
+        try:
+            asyncio.run(_bulk(domains, resolvers, max(1, concurrency), output, on_result, stats))
+        except KeyboardInterrupt:
+            print(f"\n{C_WARN}[!] To'xtatildi - {sum(stats.values())} ta domen yozildi{C_RESET}")
+    return stats
 
 
 class DNSLookup:
@@ -39,58 +210,15 @@ class DNSLookup:
         self.banner()
         print(f"{C_INFO}[*] DNS so‘rovlari yuborilmoqda → {self.domain}{C_RESET}\n")
 
-        # Har bir turdagi recordni alohida tekshirish
-        self.query_records('A', "A RECORDS (IPv4)")
-        self.query_records('AAAA', "AAAA RECORDS (IPv6)")
-        self.query_records('MX', "MX RECORDS (Mail Servers)", sort_key=lambda x: x.preference)
-        self.query_records('NS', "NS RECORDS (Nameservers)")
-        self.query_records('TXT', "TXT RECORDS (SPF, DKIM, DMARC)")
-        self.query_records('CNAME', "CNAME RECORDS")
-        self.query_records('SOA', "SOA RECORDS")
-
-        # DMARC alohida
-        self.check_dmarc()
+        # Barcha turlar + DMARC bir vaqtda
+        result = asyncio.run(resolve_domain(self.domain, [make_resolver()]))
+        for rtype, title in RECORD_TYPES:
+            self.results[title] = result['records'][rtype] or ["Not Found"]
+        self.results["DMARC POLICY"] = [result['dmarc'] or "No DMARC record"]
 
         self.display_results()
         self.save_report()
 
-    def query_records(self, rtype, title, sort_key=None):
-        try:
-            answers = dns.resolver.resolve(self.domain, rtype)
-            records = []
-            for rdata in answers:
-                if rtype == 'MX':
-                    records.append(f"Priority: {rdata.preference} → {rdata.exchange}")
-                elif rtype == 'SOA':
-                    records.append({
-                        'mname': str(rdata.mname),
-                        'rname': str(rdata.rname),
-                        'serial': rdata.serial,
-                        'refresh': rdata.refresh,
-                        'retry': rdata.retry,
-                        'expire': rdata.expire,
-                        'minimum': rdata.minimum
-                    })
-                else:
-                    records.append(str(rdata).rstrip('.'))
-            if sort_key:
-                records.sort(key=sort_key)
-            self.results[title] = records
-        except Exception as e:
-            self.results[title] = ["Not Found"]
-
-    def check_dmarc(self):
-        try:
-            dmarc_records = dns.resolver.resolve(f"_dmarc.{self.domain}", 'TXT')
-            for rdata in dmarc_records:
-                txt = str(rdata)
-                if "v=DMARC" in txt:
-                    self.results["DMARC POLICY"] = [txt]
-                    return
-            self.results["DMARC POLICY"] = ["No DMARC record"]
-        except:
-            self.results["DMARC POLICY"] = ["No DMARC record"]
-
     def display_results(self):
         width = 98
 
@@ -156,15 +284,45 @@ class DNSLookup:
         except Exception as e:
             print(f"{C_ERR}Saqlashda xato: {e}{C_RESET}")
 
+    def run_bulk(self, path, nameservers=None):
+        """Domenlar fayli -> reports/.../dns_bulk_*.jsonl (har bir domen - bitta qator)"""
+        self.banner()
+        if nameservers is None:
+            answer = input(f"{C_INFO}Nameserverlar (vergul bilan) [{', '.join(DNS_RESOLVERS)}]: {C_RESET}").strip()
+            nameservers = [ns for ns in answer.replace(' ', '').split(',') if ns] or DNS_RESOLVERS
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path_out = os.path.join(self.reports_dir, f"dns_bulk_{timestamp}.jsonl")
+        print(f"{C_INFO}[*] Bulk DNS → {path} ({len(nameservers)} ta nameserver, "
+              f"{DNS_CONCURRENCY} ta parallel){C_RESET}\n")
+
+        def show(record):
+            color = C_OK if record['status'] == 'NOERROR' else C_WARN
+            a_records = ', '.join(record['records']['A'][:3])
+            print(f"  {color}[{record['status']:<8}]{C_RESET} {record['domain']:<40} {C_INFO}{a_records}{C_RESET}")
+
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            stats = bulk_lookup(f, path_out, nameservers, on_result=show)
+
+        print(f"\n{C_TITLE}{'═' * 60}{C_RESET}")
+        print(f"  {C_INFO}Jami domenlar:{C_RESET} {sum(stats.values())}")
+        for status, count in sorted(stats.items(), key=lambda x: -x[1]):
+            print(f"  {C_INFO}{status:<12}:{C_RESET} {count}")
+        print(f"\n{C_OK}[+] Report saqlandi!{C_RESET}")
+        print(f" → {C_INFO}{path_out}{C_RESET}\n")
+
     def run(self, target):
-        self.lookup(target)
+        if os.path.isfile(target):
+            self.run_bulk(target)
+        else:
+            self.lookup(target)
         input(f"\n{C_WARN}Press Enter to continue...{C_RESET}")
 
 
 # ───────────────────────────────────────
 def run_dns_lookup(target=""):
     if not target:
-        target = input(f"{C_INFO}Domen kiriting (masalan: google.com): {C_RESET}").strip()
+        target = input(f"{C_INFO}Domen yoki domenlar fayli (masalan: google.com / domains.txt): {C_RESET}").strip()
     DNSLookup().run(target)
 
 
@@ -1,16 +1,27 @@
 # app/information_gathering/passive/linkgopher.py
 # LINK GOPHER v2.0 — Barcha link, subdomain, domain, email, telefon! (XATOSIZ)
+#
+# Ikki rejim:
+#   1) bitta sahifa (requests)
+#   2) crawl - sayt ichida BFS (aiohttp): chuqurlik va sahifa limiti, URL normalize
+#      + visited-set, scope: asosiy domen (+ subdomainlar yoki faqat shu host)
 
 import os
 import re
 import sys
-import requests
+import asyncio
 import warnings
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from urllib3.exceptions import InsecureRequestWarning
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # XATONI YO‘Q QILISH
 warnings.filterwarnings("ignore", category=InsecureRequestWarning)
 
@@ -18,8 +29,81 @@ warnings.filterwarnings("ignore", category=InsecureRequestWarning)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, BASE_DIR)
 
-from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REPORTS_DIR, USER_AGENT
-from app.utils import Logger, clear_screen
+from app.config import (C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REPORTS_DIR, USER_AGENT,
+                        CRAWL_WORKERS)
+from app.utils import Logger, clear_screen, HTTPClient
+from app.information_gathering.passive.wayback_stream import normalize_url
+
+CRAWL_DEPTH = 2
+CRAWL_PAGES = 200
+CRAWL_TIMEOUT = 15
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Faqat link tashiydigan atributlar - har bir tegni aylanib chiqish shart emas
+LINK_XPATH = etree.XPath("//*[not(self::base)]/@href | //@src | //@action | //@formaction | //meta/@content")
+BASE_XPATH = etree.XPath("//base/@href")
+REFRESH_RE = re.compile(r'^\s*\d*\s*;?\s*url\s*=\s*[\'"]?([^\'"\s]+)', re.IGNORECASE)
+SKIP_PREFIXES = ('#', 'javascript:', 'data:', 'about:', 'blob:')
+
+# Crawl paytida yuklanmaydigan (lekin link sifatida yoziladigan) fayllar
+ASSET_EXTENSIONS = frozenset((
+    'png', 'jpg', 'jpeg', 'gif', 'svg', 'ico', 'webp', 'bmp', 'css', 'js', 'map',
+    'woff', 'woff2', 'ttf', 'eot', 'otf', 'mp3', 'mp4', 'webm', 'avi', 'mov',
+    'pdf', 'zip', 'gz', 'tar', 'rar', '7z', 'exe', 'dmg', 'iso', 'doc', 'docx',
+    'xls', 'xlsx', 'ppt', 'pptx', 'xml', 'json', 'txt', 'csv',
+))
+
+
+def extract_links(html, base_url):
+    """
+    HTML (bytes yoki str) dan link qiymatlarini olish (lxml)
+    <base href> hisobga olinadi; meta content faqat URL yoki refresh bo'lsa olinadi
+    Return: absolyut URL'lar + o'zgarmagan mailto:/tel: qiymatlari
+    """
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return []
+
+    base = BASE_XPATH(doc)
+    if base and base[0].strip():
+        base_url = urljoin(base_url, base[0].strip())
+
+    links = []
+    for result in LINK_XPATH(doc):
+        value = result.strip()
+        if result.attrname == 'content':
+            match = REFRESH_RE.match(value)
+            if match:
+                value = match.group(1)
+            elif not value.startswith(('http://', 'https://', '//')):
+                continue
+        if not value or value.lower().startswith(SKIP_PREFIXES):
+            continue
+        if value[:7].lower() == 'mailto:' or value[:4].lower() == 'tel:':
+            links.append(value)
+            continue
+        try:
+            links.append(urljoin(base_url, value).partition('#')[0])
+        except ValueError:
+            continue
+    return links
+
+
+def is_asset(url):
+    """Statik fayl (rasm, css, arxiv...) - crawl qilinmaydi"""
+    name = urlparse(url).path.rpartition('/')[2]
+    return '.' in name and name.rpartition('.')[2].lower() in ASSET_EXTENSIONS
+
+
+def check_aiohttp():
+    """aiohttp o'rnatilganligini tekshirish"""
+    if aiohttp is not None:
+        return True
+    Logger.error("aiohttp topilmadi! Crawl rejimi uchun kerak")
+    print(f"\n{C_WARN}[!] O'rnatish:{C_RESET}")
+    print(f"    {C_INFO}pip3 install aiohttp{C_RESET}\n")
+    return False
 
 
 class LinkGopher:
@@ -31,6 +115,8 @@ class LinkGopher:
         self.external_domains = set()
         self.emails = set()
         self.phones = set()
+        self.pages = {}                 # crawl: URL -> HTTP status (None - xato)
+        self.session = HTTPClient.session({"User-Agent": USER_AGENT})
         # <<< YANGI >>> Umumiy reports papkasi
         self.reports_dir = "reports/information_gathering/passive/linkgopher"
         os.makedirs(self.reports_dir, exist_ok=True)
@@ -44,53 +130,134 @@ class LinkGopher:
         print("╚══════════════════════════════════════════════════════════════════════════════╝")
         print(f"{C_RESET}")
 
+    def in_scope(self, netloc):
+        return netloc == self.main_domain or netloc.endswith('.' + self.main_domain)
+
+    def process_page(self, url, html):
+        """
+        Sahifadagi linklarni tasniflash
+        Return: ichki http(s) linklar (crawl navbati uchun)
+        """
+        internal = []
+        for link in extract_links(html, url):
+            # Email & Tel
+            lower = link.lower()
+            if lower.startswith('mailto:'):
+                email = link[7:].split('?')[0].split('#')[0]
+                if '@' in email:
+                    self.emails.add(email.lower())
+                continue
+            if lower.startswith('tel:'):
+                self.phones.add(link[4:].split('?')[0])
+                continue
+
+            try:
+                parsed = urlparse(link)
+            except ValueError:
+                continue
+            netloc = parsed.netloc.lower()
+
+            # Ichki yoki tashqi
+            if netloc and self.in_scope(netloc):
+                self.internal_links.add(link)
+                if netloc != self.main_domain:
+                    self.subdomains.add(netloc)
+                if parsed.scheme in ('http', 'https'):
+                    internal.append(link)
+            elif netloc:
+                self.external_links.add(link)
+                self.external_domains.add(netloc)
+        return internal
+
     def extract_from_html(self, url):
         try:
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=20, verify=False, allow_redirects=True)
+            response = self.session.get(url, timeout=20, verify=False, allow_redirects=True)
             response.raise_for_status()
-            html = response.text
             self.main_domain = urlparse(url).netloc.lower()
-
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Barcha href/src/action/content larni olish
-            for tag in soup.find_all(True):
-                for attr in ['href', 'src', 'action', 'content']:
-                    value = tag.get(attr)
-                    if not value:
-                        continue
-                    value = value.strip()
-                    if not value or value.startswith(('#', 'javascript:', 'data:')):
-                        continue
-
-                    full_url = urljoin(url, value)
-                    parsed = urlparse(full_url)
-                    netloc = parsed.netloc.lower()
-
-                    # Email & Tel
-                    if value.startswith('mailto:'):
-                        email = value[7:].split('?')[0].split('#')[0]
-                        if '@' in email:
-                            self.emails.add(email.lower())
-                        continue
-                    if value.startswith('tel:'):
-                        phone = value[4:].split('?')[0]
-                        self.phones.add(phone)
-                        continue
-
-                    # Ichki yoki tashqi
-                    if netloc and (netloc == self.main_domain or netloc.endswith('.' + self.main_domain)):
-                        self.internal_links.add(full_url)
-                        if netloc != self.main_domain:
-                            self.subdomains.add(netloc)
-                    elif netloc:
-                        self.external_links.add(full_url)
-                        self.external_domains.add(netloc)
-
+            self.process_page(response.url, response.content)
         except Exception as e:
             Logger.error(f"LinkGopher xatosi: {e}")
 
+    # ---------------- CRAWL ----------------
+
+    async def _fetch(self, session, url):
+        """Return: (yakuniy URL, status, HTML bytes yoki None)"""
+        try:
+            async with session.get(url, allow_redirects=True, max_redirects=5) as resp:
+                content_type = resp.headers.get('Content-Type', '').lower()
+                if content_type and 'html' not in content_type:
+                    return str(resp.url), resp.status, None
+                return str(resp.url), resp.status, await resp.content.read(MAX_PAGE_BYTES)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+            return url, None, None
+
+    async def _crawl(self, start, max_depth, max_pages, workers, same_host, on_page):
+        start_host = urlparse(start).netloc.lower()
+        seen = {normalize_url(start) or start}
+        queue = asyncio.Queue()
+        queue.put_nowait((start, 0))
+
+        def allowed(link):
+            netloc = urlparse(link).netloc.lower()
+            return netloc == start_host if same_host else self.in_scope(netloc)
+
+        def schedule(links, depth):
+            for link in links:
+                if len(seen) >= max_pages:
+                    return
+                if is_asset(link) or not allowed(link):
+                    continue
+                key = normalize_url(link)
+                if key and key not in seen:
+                    seen.add(key)
+                    queue.put_nowait((link, depth))
+
+        connector = aiohttp.TCPConnector(limit=workers, ttl_dns_cache=300, ssl=False)
+        timeout = aiohttp.ClientTimeout(total=CRAWL_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={"User-Agent": USER_AGENT}) as session:
+
+            async def worker():
+                while True:
+                    url, depth = await queue.get()
+                    try:
+                        final_url, status, body = await self._fetch(session, url)
+                        self.pages[url] = status
+                        if on_page:
+                            on_page(url, status, depth)
+                        # Redirect scope'dan tashqariga olib chiqsa - sahifa tahlil qilinmaydi
+                        if body and allowed(final_url):
+                            links = self.process_page(final_url, body)
+                            if depth < max_depth:
+                                schedule(links, depth + 1)
+                    except Exception as e:
+                        Logger.error(f"Crawl xatosi ({url}): {e}")
+                    finally:
+                        queue.task_done()
+
+            tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+            try:
+                await queue.join()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def crawl(self, url, max_depth=CRAWL_DEPTH, max_pages=CRAWL_PAGES, workers=CRAWL_WORKERS,
+              same_host=False, on_page=None):
+        """
+        Sayt ichida BFS crawl (asyncio + aiohttp)
+        max_depth: boshlang'ich sahifadan necha qadam, max_pages: jami yuklanadigan sahifalar
+        same_host=True - subdomainlarga o'tilmaydi
+        Ctrl+C: shu paytgacha yig'ilganlar saqlanib qoladi
+        """
+        self.main_domain = urlparse(url).netloc.lower()
+        try:
+            asyncio.run(self._crawl(url, max_depth, max(1, max_pages), max(1, workers),
+                                    same_host, on_page))
+        except KeyboardInterrupt:
+            print(f"\n{C_WARN}[!] Crawl to'xtatildi - {len(self.pages)} ta sahifa ko'rildi{C_RESET}")
+
     def display_results(self):
         total = len(self.internal_links) + len(self.external_links)
         print(f"\n{C_TITLE}══════════════════════════════════════════════════════════════════════════════{C_RESET}")
@@ -150,6 +317,8 @@ class LinkGopher:
         print(f"  {C_INFO}Tashqi domainlar     :{C_RESET} {len(self.external_domains)}")
         print(f"  {C_INFO}Email manzillar      :{C_RESET} {len(self.emails)}")
         print(f"  {C_INFO}Telefon raqamlar     :{C_RESET} {len(self.phones)}")
+        if self.pages:
+            print(f"  {C_INFO}Ko'rilgan sahifalar  :{C_RESET} {len(self.pages)}")
         print(f"{C_TITLE}══════════════════════════════════════════════════════════════════════════════{C_RESET}")
 
     def save_report(self):
@@ -184,27 +353,55 @@ class LinkGopher:
             for p in sorted(self.phones):
                 f.write(f"• {p}\n")
 
+            if self.pages:
+                f.write(f"\nCRAWLED PAGES ({len(self.pages)}):\n")
+                for page, status in sorted(self.pages.items()):
+                    f.write(f"• [{status or 'ERR'}] {page}\n")
+
         print(f"\n{C_OK}[+] Report saqlandi! → {C_INFO}{filename}.txt{C_RESET}")
 
-    def run(self, target):
+    def run(self, target, crawl=None, max_depth=CRAWL_DEPTH, max_pages=CRAWL_PAGES, same_host=False):
         url = target.strip()
         if not url.startswith(("http://", "https://")):
             url = "https://" + url
 
+        if crawl is None:
+            choice = input(f"{C_INFO}Rejim: 1) Bitta sahifa  2) Crawl (sayt bo'ylab) [1]: {C_RESET}").strip()
+            crawl = choice == '2'
+            if crawl:
+                max_depth = ask_int("Chuqurlik", max_depth)
+                max_pages = ask_int("Sahifalar limiti", max_pages)
+                same_host = input(f"{C_INFO}Faqat shu host (subdomainlarsiz)? [y/N]: {C_RESET}").strip().lower() == 'y'
+
         self.banner()
-        print(f"{C_INFO}[*] Sayt ochilmoqda → {url}{C_RESET}\n")
-        self.extract_from_html(url)
+        if crawl:
+            if not check_aiohttp():
+                return
+            print(f"{C_INFO}[*] Crawl → {url} (chuqurlik: {max_depth}, limit: {max_pages} sahifa){C_RESET}\n")
+            self.crawl(url, max_depth, max_pages, same_host=same_host, on_page=self.show_page)
+        else:
+            print(f"{C_INFO}[*] Sayt ochilmoqda → {url}{C_RESET}\n")
+            self.extract_from_html(url)
         self.display_results()
         self.save_report()
         input(f"\n{C_WARN}Press Enter to continue...{C_RESET}")
 
+    def show_page(self, url, status, depth):
+        color = C_OK if status and status < 400 else C_ERR
+        print(f"  {color}[{status or 'ERR'}]{C_RESET} {C_INFO}d{depth}{C_RESET} {url}")
+
+
+def ask_int(prompt, default):
+    value = input(f"{C_INFO}{prompt} [{default}]: {C_RESET}").strip()
+    return int(value) if value.isdigit() else default
+
 
 # ───────────────────────────────────────
-def run_linkgopher(target=""):
+def run_linkgopher(target="", crawl=None):
     if not target:
         target = input(f"{C_INFO}Enter URL (masalan: darkhunt.uz): {C_RESET}").strip()
-    LinkGopher().run(target)
+    LinkGopher().run(target, crawl=crawl)
 
 
 if __name__ == "__main__":
-    run_linkgopher()
\ No newline at end of file
+    run_linkgopher()
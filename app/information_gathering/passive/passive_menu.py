@@ -57,7 +57,13 @@ try:
 except ImportError:
     def run_wayback_urls(*args, **kwargs): print(f"{C_WARN}waybackurls.py hali tayyor emas{C_RESET}")
 
-# 8. WHOIS LOOKUP – ENDI XAVFSIZ!
+# 8. Wappalyzer Batch (URL ro'yxati / httprobe natijasi)
+try:
+    from app.information_gathering.passive.tech_batch import run_tech_batch
+except ImportError:
+    def run_tech_batch(*args, **kwargs): print(f"{C_ERR}tech_batch.py topilmadi!{C_RESET}")
+
+# 9. WHOIS LOOKUP – ENDI XAVFSIZ!
 try:
     from app.information_gathering.passive.whois_lookup import run_whois
 except ImportError as e:
@@ -80,6 +86,7 @@ class PassiveMenu:
             '5': ('DNS Lookup',          self.dns_lookup_tool),
             '6': ('Shodan.io',           self.shodan_tool),
             '7': ('Wayback URLs',        self.waybackurls_tool),
+            '8': ('Wappalyzer Batch',    self.tech_batch_tool),
             '9': ('WHOIS Lookup',        self.whois_tool),          # ← 9-raqam to‘g‘ri
         }
 
@@ -92,7 +99,7 @@ class PassiveMenu:
         print(f"{C_RESET}\n")
 
         for key, (name, _) in sorted(self.tools.items(), key=lambda x: x[0]):
-            status = f"{C_OK}● Active{C_RESET}" if key in ['1','2','3','4','5','6','7','9'] else f"{C_WARN}○ Soon{C_RESET}"
+            status = f"{C_OK}● Active{C_RESET}" if key in ['1','2','3','4','5','6','7','8','9'] else f"{C_WARN}○ Soon{C_RESET}"
             print(f"  {C_INFO}{key}. {C_RESET}{name:<30} {status}")
 
         print(f"\n  {C_WARN}0. Back to main menu{C_RESET}")
@@ -106,6 +113,7 @@ class PassiveMenu:
     def dns_lookup_tool(self, domain):   run_dns_lookup(domain)
     def shodan_tool(self, query):        run_shodan_lookup(query)
     def waybackurls_tool(self, domain):  run_wayback_urls(domain)
+    def tech_batch_tool(self, path):     run_tech_batch(path)
 
     def whois_tool(self, domain):
         Logger.info(f"WHOIS Lookup → {domain}")
@@ -133,6 +141,11 @@ class PassiveMenu:
                 if not target:
                     continue
                 tool_func(target)
+            elif choice == '8':                  # Fayl: URL/host ro'yxati
+                target = input(f"{C_INFO}URL ro'yxati fayli (yoki httprobe .jsonl): {C_RESET}").strip()
+                if not target:
+                    continue
+                tool_func(target)
             else:
                 target = input(f"{C_INFO}URL kiriting (masalan: https://example.com): {C_RESET}").strip()
                 if not target:
@@ -16,7 +16,7 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
 sys.path.insert(0, BASE_DIR)
 
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, USER_AGENT
-from app.utils import Logger, clear_screen
+from app.utils import Logger, clear_screen, HTTPClient
 
 
 class RedirectPathTracker:
@@ -24,6 +24,7 @@ class RedirectPathTracker:
         self.redirect_chain = []
         self.final_url = ""
         self.start_time = datetime.now()
+        self.session = HTTPClient.session({"User-Agent": USER_AGENT})
         # <<< YANGI >>> Umumiy reports papkasi
         self.reports_dir = "reports/information_gathering/passive/redirectpath"
         os.makedirs(self.reports_dir, exist_ok=True)
@@ -46,7 +47,6 @@ class RedirectPathTracker:
         self.banner()
         print(f"{C_INFO}[*] Boshlang‘ich URL → {url}{C_RESET}\n")
 
-        headers = {"User-Agent": USER_AGENT}
         current_url = url
         seen = set()
         step = 1
@@ -60,9 +60,8 @@ class RedirectPathTracker:
 
             try:
                 # HEAD so‘rov — tezroq va kamroq trafik
-                response = requests.head(
+                response = self.session.head(
                     current_url,
-                    headers=headers,
                     timeout=15,
                     allow_redirects=False,
                     verify=False
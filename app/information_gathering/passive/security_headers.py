@@ -2,7 +2,6 @@
 
 import os
 import sys
-import requests
 import warnings
 from urllib.parse import urlparse
 from datetime import datetime
@@ -16,7 +15,7 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
 sys.path.insert(0, BASE_DIR)
 
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, USER_AGENT
-from app.utils import Logger, clear_screen
+from app.utils import Logger, clear_screen, HTTPClient
 
 
 class SecurityHeadersChecker:
@@ -35,6 +34,7 @@ class SecurityHeadersChecker:
         }
         self.found = {}
         self.missing = {}
+        self.session = HTTPClient.session({"User-Agent": USER_AGENT})
         # <<< YANGI >>> Umumiy reports papkasi
         self.reports_dir = "reports/information_gathering/passive/securityheaders"
         os.makedirs(self.reports_dir, exist_ok=True)
@@ -58,8 +58,7 @@ class SecurityHeadersChecker:
         print(f"{C_INFO}[*] Sayt tekshirilmoqda → {url}{C_RESET}\n")
 
         try:
-            headers = {"User-Agent": USER_AGENT}
-            response = requests.get(url, headers=headers, timeout=20, verify=False, allow_redirects=True)
+            response = self.session.get(url, timeout=20, verify=False, allow_redirects=True)
             response.raise_for_status()
             resp_headers = response.headers
 
@@ -4,7 +4,6 @@
 
 import os
 import sys
-import socket
 import requests
 from datetime import datetime
 
@@ -20,7 +19,7 @@ if os.path.exists(env_path):
 
 # ─────── Ranglar va utilitalar ───────
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE
-from app.utils import Logger, clear_screen
+from app.utils import Logger, clear_screen, DNSCache
 
 
 class ShodanLookup:
@@ -48,7 +47,7 @@ class ShodanLookup:
             target = target.split("//")[-1].split("/")[0].split(":")[0]
 
         try:
-            ip = socket.gethostbyname(target)
+            ip = DNSCache.gethostbyname(target)
         except:
             print(f"{C_ERR}[!] Domenni IP ga aylantirib bo‘lmadi: {target}{C_RESET}")
             input(f"\n{C_WARN}Enter bosib davom eting...{C_RESET}")
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# app/information_gathering/passive/tech_batch.py - Ko'p URL uchun texnologiya fingerprint (batch)
+#
+# Kirish: URL ro'yxati, host ro'yxati (subdomain natijasi) yoki httprobe *.jsonl
+# Sahifalar umumiy HTTP pool orqali parallel yuklanadi, signatura moslash
+# (CPU) ProcessPool'da ishlaydi.
+# Reports → reports/information_gathering/passive/wappalyzer/
+#   tech_batch_YYYYMMDD_HHMMSS.jsonl      - har bir host (kelishi bilan yoziladi)
+#   tech_inventory_YYYYMMDD_HHMMSS.json   - texnologiya -> hostlar
+
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, USER_AGENT, TECH_BATCH_WORKERS
+from app.utils import Logger, HTTPClient
+from app.information_gathering.passive.wappalyzer_db import get_db, MAX_HTML
+
+OUTPUT_DIR = "reports/information_gathering/passive/wappalyzer"
+FETCH_TIMEOUT = 15
+
+
+# ==================== TARGETS ====================
+
+def parse_target(line):
+    """
+    Bitta qator -> URL yoki None
+    httprobe JSONL ({"final_url": ...}), to'liq URL yoki oddiy host (https:// qo'shiladi)
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record.get('final_url') or record.get('url')
+    if line.startswith(('http://', 'https://')):
+        return line
+    return 'https://' + line.split()[0]
+
+
+def load_targets(path):
+    """Fayldan URL'lar (takrorlarsiz, tartib saqlanadi)"""
+    targets = []
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            url = parse_target(line)
+            if url:
+                targets.append(url)
+    return list(dict.fromkeys(targets))
+
+
+# ==================== FETCH / ANALYZE ====================
+
+def fetch_page(session, url, timeout=FETCH_TIMEOUT):
+    """
+    Sahifani yuklash (body MAX_HTML bilan cheklangan)
+    Oddiy hostdan yasalgan https:// URL javob bermasa http:// ham sinab ko'riladi
+    """
+    candidates = [url]
+    if url.startswith('https://') and urlparse(url).path in ('', '/'):
+        candidates.append('http://' + url[len('https://'):])
+
+    error = None
+    for candidate in candidates:
+        try:
+            response = session.get(candidate, timeout=timeout, verify=False,
+                                   allow_redirects=True, stream=True)
+            try:
+                body = response.raw.read(MAX_HTML, decode_content=True)
+            finally:
+                response.close()
+        except Exception as e:
+            error = str(e)
+            continue
+
+        try:
+            html = body.decode(response.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            html = body.decode('utf-8', errors='replace')
+        return {
+            'url': url,
+            'final_url': response.url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'cookies': {c.name: c.value for c in response.cookies},
+            'html': html,
+        }
+    return {'url': url, 'error': error}
+
+
+def _init_worker():
+    """ProcessPool worker: kompilyatsiya qilingan baza bir marta yuklanadi"""
+    get_db()
+
+
+def analyze_page(page):
+    """Worker ichida: sahifa -> {texnologiya: {'version', 'confidence', 'categories'}}"""
+    return get_db().analyze(page['final_url'], page['headers'], page['cookies'], page['html'])
+
+
+# ==================== INVENTORY ====================
+
+class TechInventory:
+    """Texnologiya -> hostlar (versiya bilan) yig'indisi"""
+
+    def __init__(self):
+        self.techs = {}
+        self.hosts = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            if record.get('error'):
+                self.errors += 1
+                return
+            self.hosts += 1
+            for name, info in record['technologies'].items():
+                entry = self.techs.setdefault(name, {'categories': info.get('categories', []), 'hosts': {}})
+                entry['hosts'][record['host']] = info.get('version', '')
+
+    def to_dict(self):
+        ranked = sorted(self.techs.items(), key=lambda item: (-len(item[1]['hosts']), item[0].lower()))
+        return {
+            name: {
+                'count': len(entry['hosts']),
+                'categories': entry['categories'],
+                'hosts': [{'host': host, 'version': version} for host, version in sorted(entry['hosts'].items())],
+            }
+            for name, entry in ranked
+        }
+
+
+def make_record(page, detected=None):
+    """Per-host JSONL yozuvi"""
+    final_url = page.get('final_url') or page['url']
+    record = {'url': page['url'], 'host': urlparse(final_url).netloc or urlparse(page['url']).netloc}
+    if page.get('error'):
+        record['error'] = page['error']
+        return record
+    record.update({
+        'final_url': final_url,
+        'status': page['status'],
+        'technologies': {name: {'version': info['version'], 'categories': info['categories']}
+                         for name, info in sorted((detected or {}).items())},
+    })
+    return record
+
+
+# ==================== BATCH ====================
+
+def fingerprint_urls(targets, workers=TECH_BATCH_WORKERS, processes=None, output_file=None, on_result=None):
+    """
+    Ko'p URL'ni fingerprint qilish
+    workers: parallel yuklash (threadlar, umumiy HTTP pool)
+    processes: moslash uchun jarayonlar (None = CPU soni, 0 = thread ichida)
+    output_file: JSONL - har bir host natijasi kelishi bilan yoziladi
+    Return: TechInventory
+    """
+    session = HTTPClient.session({"User-Agent": USER_AGENT})
+    inventory = TechInventory()
+    output = open(output_file, 'w', encoding='utf-8') if output_file else None
+    procs = ProcessPoolExecutor(processes or os.cpu_count(), initializer=_init_worker) if processes != 0 else None
+
+    def job(url):
+        page = fetch_page(session, url)
+        if page.get('error'):
+            return make_record(page)
+        # Thread natijani kutadi - bir vaqtda xotirada ko'pi bilan `workers` ta sahifa
+        detected = procs.submit(analyze_page, page).result() if procs else analyze_page(page)
+        return make_record(page, detected)
+
+    interrupted = False
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = [pool.submit(job, url) for url in targets]
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                Logger.error(f"Fingerprint xatosi: {e}")
+                continue
+            inventory.add(record)
+            if output:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+            if on_result:
+                on_result(record)
+    except KeyboardInterrupt:
+        interrupted = True
+        raise
+    finally:
+        # Ctrl+C: navbatdagi URL'lar bekor qilinadi, ishlayotganlari kutilmaydi
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        if procs:
+            procs.shutdown(wait=not interrupted, cancel_futures=True)
+        if output:
+            output.close()
+    return inventory
+
+
+def print_record(record):
+    if record.get('error'):
+        print(f"{C_ERR}[-] {record['url']} → {record['error'][:80]}{C_RESET}")
+        return
+    techs = ', '.join(f"{name} {info['version']}".strip() for name, info in record['technologies'].items())
+    print(f"{C_OK}[+] {record['final_url']} [{record['status']}]{C_RESET} {techs or '-'}")
+
+
+def print_inventory(inventory, limit=10):
+    data = inventory.to_dict()
+    print(f"\n{'='*80}")
+    print(f" TEXNOLOGIYA INVENTARI ({len(data)} ta texnologiya, {inventory.hosts} host)")
+    print(f"{'='*80}")
+    for name, entry in data.items():
+        hosts = ', '.join(h['host'] for h in entry['hosts'][:limit])
+        more = f" (+{entry['count'] - limit})" if entry['count'] > limit else ""
+        print(f"{C_OK}{name:<30}{C_RESET} {entry['count']:>5}  {C_INFO}{hosts}{more}{C_RESET}")
+
+
+def save_inventory(inventory, path, source=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source, 'hosts': inventory.hosts, 'errors': inventory.errors,
+                   'generated': datetime.now().isoformat(timespec='seconds'),
+                   'technologies': inventory.to_dict()}, f, indent=2, ensure_ascii=False)
+
+
+def run_tech_batch(path=None):
+    """Interaktiv batch rejim"""
+    print(f"\n{C_TITLE}[*] Batch texnologiya fingerprint{C_RESET}")
+    if not path:
+        path = input(f"{C_INFO}URL/host ro'yxati yoki httprobe .jsonl fayli: {C_RESET}").strip()
+    if not path or not os.path.isfile(path):
+        Logger.error(f"Fayl topilmadi: {path}")
+        return None
+
+    targets = load_targets(path)
+    if not targets:
+        Logger.error("Faylda URL topilmadi!")
+        return None
+
+    workers = TECH_BATCH_WORKERS
+    value = input(f"{C_INFO}Parallel so'rovlar (default: {TECH_BATCH_WORKERS}): {C_RESET}").strip()
+    if value.isdigit() and int(value) > 0:
+        workers = int(value)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    jsonl_path = os.path.join(OUTPUT_DIR, f"tech_batch_{ts}.jsonl")
+    inventory_path = os.path.join(OUTPUT_DIR, f"tech_inventory_{ts}.json")
+
+    print(f"\n{C_INFO}[*] {len(targets)} URL | {workers} parallel | {os.cpu_count()} jarayon{C_RESET}")
+    if get_db().source == 'builtin':
+        print(f"{C_WARN}[!] Kichik ichki baza ishlatilmoqda "
+              f"(python -m app.information_gathering.passive.wappalyzer_db update){C_RESET}")
+    print()
+
+    start = time.time()
+    try:
+        inventory = fingerprint_urls(targets, workers=workers, output_file=jsonl_path, on_result=print_record)
+    except KeyboardInterrupt:
+        print(f"\n{C_WARN}[!] To'xtatildi. Qisman natijalar: {jsonl_path}{C_RESET}")
+        return None
+    elapsed = time.time() - start
+
+    print_inventory(inventory)
+    save_inventory(inventory, inventory_path, source=path)
+
+    print(f"\n{C_OK}[+] {inventory.hosts} host, {inventory.errors} xato, {elapsed:.1f}s{C_RESET}")
+    print(f"    JSONL     → {C_INFO}{jsonl_path}{C_RESET}")
+    print(f"    Inventory → {C_INFO}{inventory_path}{C_RESET}\n")
+    Logger.success(f"Tech batch: {inventory.hosts} host, {len(inventory.techs)} texnologiya")
+    return inventory
+
+
+if __name__ == "__main__":
+    run_tech_batch(sys.argv[1] if len(sys.argv) > 1 else None)
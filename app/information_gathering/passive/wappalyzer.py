@@ -6,98 +6,16 @@
 import os
 import re
 import json
-import requests
 from datetime import datetime
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, USER_AGENT
-from app.utils import Logger
+from app.utils import Logger, HTTPClient
+from app.information_gathering.passive.wappalyzer_db import get_db
 
 
-# To'liq 1000+ baza uchun: https://github.com/wappalyzer/wappalyzer/blob/master/src/technologies.json dan olingan
-def load_full_db():
-    """To'liq Wappalyzer JSON bazasini yuklash (GitHub dan)"""
-    try:
-        url = "https://raw.githubusercontent.com/wappalyzer/wappalyzer/master/src/technologies.json"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        full_db = {}
-        for letter, techs in data.items():
-            for tech in techs:
-                name = tech["name"]
-                full_db[name] = tech
-        return full_db
-    except:
-        # Fallback — kichik baza
-        return {
-            "1C-Bitrix": {"cats": ["CMS"], "html": "bitrix", "js": "BX"},
-            "Adobe Analytics": {"cats": ["Analytics"], "js": "s_code", "html": "omniture"},
-            "Amazon Cloudfront": {"cats": ["CDN"], "headers": {"X-Amz-Cf-Id": ""}},
-            "Amazon S3": {"cats": ["Storage"], "headers": {"Server": "AmazonS3"}},
-            "Angular": {"cats": ["JavaScript Frameworks"], "js": "angular", "html": "ng-"},
-            "Apache": {"cats": ["Web Servers"], "headers": {"Server": r"Apache[/]?([\d\.]+)?"}},
-            "Bootstrap": {"cats": ["CSS Frameworks"], "html": r"bootstrap[\-\.]?([\d\.]+)?", "js": "bootstrap"},
-            "CentOS": {"cats": ["Operating Systems"], "headers": {"Server": "CentOS"}},
-            "Cloudflare": {"cats": ["CDN"], "headers": {"Server": "cloudflare", "CF-RAY": ""}},
-            "CodeIgniter": {"cats": ["Web Frameworks"], "cookies": {"ci_session": ""}},
-            "Debian": {"cats": ["Operating Systems"], "headers": {"Server": "Debian"}},
-            "Django": {"cats": ["Web Frameworks"], "cookies": {"csrftoken": "", "sessionid": ""}, "html": "django"},
-            "Drupal": {"cats": ["CMS"], "html": "drupal", "js": "Drupal"},
-            "Elementor": {"cats": ["Page Builders"], "html": "elementor"},
-            "Express": {"cats": ["Web Frameworks"], "headers": {"X-Powered-By": "Express"}},
-            "Fedora": {"cats": ["Operating Systems"], "headers": {"Server": "Fedora"}},
-            "Font Awesome": {"cats": ["Font Scripts"], "html": r"font.?awesome", "css": "fa-"},
-            "Framer Motion": {"cats": ["UI Frameworks"], "js": "framer-motion"},
-            "Google Analytics": {"cats": ["Analytics"], "html": r"google-analytics\.com|gtag\.js"},
-            "Google Fonts": {"cats": ["Font Scripts"], "html": r"fonts\.googleapis\.com"},
-            "Google Tag Manager": {"cats": ["Tag Managers"], "html": "gtm-", "js": "dataLayer"},
-            "Hotjar": {"cats": ["Analytics"], "js": "hotjar"},
-            "HubSpot": {"cats": ["Marketing Automation"], "html": "hs-", "js": "HubSpot"},
-            "IIS": {"cats": ["Web Servers"], "headers": {"Server": r"Microsoft-IIS[/]?([\d\.]+)?"}},
-            "jQuery": {"cats": ["JavaScript Libraries"], "html": r"jquery[\-\.]?([\d\.]+)?\.js", "js": "jQuery"},
-            "Laravel": {"cats": ["Web Frameworks"], "cookies": {"laravel_session": ""}},
-            "Let's Encrypt": {"cats": ["Security"], "html": "Let's Encrypt"},
-            "LiteSpeed": {"cats": ["Web Servers"], "headers": {"Server": "LiteSpeed"}},
-            "Magento": {"cats": ["Ecommerce"], "html": "mage-", "js": "Mage"},
-            "Mailchimp": {"cats": ["Email"], "html": "mc.", "js": "mc."},
-            "MariaDB": {"cats": ["Databases"], "html": "mariadb"},
-            "Matomo": {"cats": ["Analytics"], "js": "_paq", "html": "matomo"},
-            "MySQL": {"cats": ["Databases"], "html": "mysql"},
-            "Next.js": {"cats": ["Web Frameworks"], "html": "_next/static"},
-            "Nginx": {"cats": ["Web Servers"], "headers": {"Server": r"nginx[/]?([\d\.]+)?"}},
-            "Node.js": {"cats": ["Programming Languages"], "headers": {"Server": "node"}},
-            "Nuxt.js": {"cats": ["Web Frameworks"], "html": "__nuxt"},
-            "OpenSSL": {"cats": ["Security"], "headers": {"Server": "OpenSSL"}},
-            "PHP": {"cats": ["Programming Languages"], "headers": {"X-Powered-By": r"PHP[/]?([\d\.]+)?"}},
-            "PostgreSQL": {"cats": ["Databases"], "html": "postgresql"},
-            "Python": {"cats": ["Programming Languages"], "html": r"Python/[\d\.]+", "headers": {"Server": "Python"}},
-            "React": {"cats": ["JavaScript Frameworks"], "js": "React", "html": "react"},
-            "Redis": {"cats": ["Databases"], "html": "redis"},
-            "Red Hat": {"cats": ["Operating Systems"], "headers": {"Server": "Red Hat"}},
-            "Ruby on Rails": {"cats": ["Web Frameworks"], "headers": {"X-Powered-By": "Phusion Passenger"}},
-            "Shopify": {"cats": ["Ecommerce"], "html": "shopify", "js": "Shopify"},
-            "Stripe": {"cats": ["Payment"], "js": "Stripe"},
-            "Swiper": {"cats": ["UI Frameworks"], "js": "swiper"},
-            "Tailwind CSS": {"cats": ["CSS Frameworks"], "html": r"tailwind"},
-            "Ubuntu": {"cats": ["Operating Systems"], "headers": {"Server": "Ubuntu"}},
-            "Vue.js": {"cats": ["JavaScript Frameworks"], "js": r"Vue\.js|vue\.min"},
-            "Webpack": {"cats": ["Build Tools"], "js": "webpack"},
-            "Windows Server": {"cats": ["Operating Systems"], "headers": {"Server": "Microsoft"}},
-            "WooCommerce": {"cats": ["Ecommerce"], "html": "woocommerce"},
-            "WordPress": {"cats": ["CMS"], "html": r"wp-content|wp-includes", "meta": {"generator": "WordPress"}},
-            "YouTube": {"cats": ["Video Players"], "html": "youtube.com/embed"},
-        }
-
-TECH_DB = load_full_db()  # 1000+ texnologiya avto-yuklanadi!
-
-
-def extract_version(pattern, text):
-    if not pattern:
-        return ""
-    match = re.search(pattern, text, re.I)
-    return match.group(1) if match and len(match.groups()) > 0 else ""
-
+# Baza: data/wappalyzer/technologies/*.json (wappalyzer_db.update_db() bilan yuklanadi),
+# bo'lmasa technologies_builtin.json. Kompilyatsiya qilingan nusxa data/ da keshlanadi.
 
 def run_wappalyzer(target):
     url = target.strip()
@@ -111,66 +29,22 @@ def run_wappalyzer(target):
     print(f"\n{C_INFO}[*] MEGA Wappalyzer skanlash: {url}{C_RESET}\n")
 
     try:
-        session = requests.Session()
-        session.headers.update({"User-Agent": USER_AGENT})
+        session = HTTPClient.session({"User-Agent": USER_AGENT})
         response = session.get(url, timeout=30, verify=False, allow_redirects=True)
         response.raise_for_status()
 
         html = response.text
-        headers = {k.lower(): v for k, v in response.headers.items()}
-        cookies = {c.name.lower(): c.value for c in session.cookies}
-        soup = BeautifulSoup(html, 'html.parser')
+        db = get_db()
+        detected = db.analyze(response.url, response.headers,
+                              {c.name: c.value for c in session.cookies}, html)
 
         found = {}
         categories = {}
-
-        for name, data in TECH_DB.items():
-            detected = False
-            version = ""
-
-            # Headers
-            if "headers" in data:
-                for hname, pattern in data["headers"].items():
-                    hname_l = hname.lower()
-                    if hname_l in headers:
-                        if pattern:
-                            version = extract_version(pattern, headers[hname_l])
-                        detected = True
-
-            # Cookies
-            if not detected and "cookies" in data:
-                for cname in data["cookies"]:
-                    if cname.lower() in cookies:
-                        detected = True
-
-            # HTML
-            if not detected and "html" in data:
-                if isinstance(data["html"], str):
-                    if re.search(data["html"], html, re.I):
-                        version = extract_version(data.get("version", data["html"]), html)
-                        detected = True
-                elif isinstance(data["html"], list):
-                    for p in data["html"]:
-                        if re.search(p, html, re.I):
-                            detected = True
-                            break
-
-            # JS
-            if not detected and "js" in data:
-                if isinstance(data["js"], str):
-                    if re.search(data["js"], html, re.I):
-                        detected = True
-                elif isinstance(data["js"], dict):
-                    for p in data["js"]:
-                        if re.search(p, html, re.I):
-                            detected = True
-                            break
-
-            if detected and name not in found:
-                found[name] = version
-                for cat_id in data["cats"]:
-                    cat_name = f"Category {cat_id}"  # to'liq nom uchun alohida baza kerak
-                    categories.setdefault(cat_name, []).append(f"{name} v{version}".strip() if version else name)
+        for name in sorted(detected):
+            version = detected[name]['version']
+            found[name] = version
+            for cat_name in detected[name]['categories']:
+                categories.setdefault(cat_name, []).append(f"{name} v{version}".strip() if version else name)
 
         total = len(found)
 
@@ -195,7 +69,11 @@ def run_wappalyzer(target):
                 print(f"{C_OK}│   • {item}{C_RESET}")
             print(f"{C_OK}└{C_RESET}")
 
-        print(f"\n{C_OK}[+] SUMMARY: {total} ta texnologiya aniqlandi!{C_RESET}\n")
+        print(f"\n{C_OK}[+] SUMMARY: {total} ta texnologiya aniqlandi!{C_RESET}")
+        if db.source == 'builtin':
+            print(f"{C_WARN}[!] Kichik ichki baza ishlatildi. To'liq baza uchun: "
+                  f"python -m app.information_gathering.passive.wappalyzer_db update{C_RESET}")
+        print()
 
         # REPORT
         safe_domain = re.sub(r'[^\w\-]', '_', urlparse(url).netloc)
@@ -3,8 +3,7 @@
 # Reports → reports/passive/wappalyzer/wappalyzer_basic_domain_YYYYMMDD_HHMMSS.txt
 
 from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, USER_AGENT
-from app.utils import Logger
-import requests
+from app.utils import Logger, HTTPClient
 import re
 import os
 from datetime import datetime
@@ -23,8 +22,8 @@ def run_wappalyzer_basic(url: str):
     os.makedirs(reports_dir, exist_ok=True)
 
     try:
-        headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, timeout=15, headers=headers, verify=False)
+        session = HTTPClient.session({"User-Agent": USER_AGENT})
+        response = session.get(url, timeout=15, verify=False)
         content = response.text.lower()
         headers_str = str(response.headers).lower()
 
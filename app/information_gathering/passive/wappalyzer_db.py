@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+# app/information_gathering/passive/wappalyzer_db.py - Kompilyatsiya qilingan Wappalyzer signatura bazasi
+#
+# technologies.json (Wappalyzer formati) -> manba bo'yicha guruhlangan matcherlar
+# (headers, cookies, meta, html, scriptSrc, url) -> data/wappalyzer_signatures.pickle
+# Import paytida tarmoqqa chiqilmaydi; baza faqat update_db() bilan yangilanadi.
+
+import os
+import re
+import sys
+import glob
+import json
+import pickle
+import hashlib
+import warnings
+import threading
+from functools import lru_cache
+
+from app.config import WAPPALYZER_DIR, WAPPALYZER_CACHE
+
+try:
+    from re import _parser as sre_parse
+except ImportError:                                     # Python < 3.11
+    import sre_parse
+
+COMPILER_VERSION = 1
+BUILTIN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'technologies_builtin.json')
+SOURCE_URL = "https://raw.githubusercontent.com/enthec/webappanalyzer/main/src"
+SOURCE_FILES = ['_'] + [chr(c) for c in range(ord('a'), ord('z') + 1)]
+
+MIN_TOKEN = 3               # prefilter uchun eng qisqa token
+MAX_HTML = 500 * 1024       # html manbasidan faqat boshi tekshiriladi
+
+META_RE = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+ATTR_RE = re.compile(r'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+TOKEN_RE = re.compile(r'[a-z0-9_]+')
+WORD_TABLE = bytes(c if chr(c) in '0123456789_abcdefghijklmnopqrstuvwxyz' else 0x20 for c in range(256))
+VERSION_TERNARY_RE = re.compile(r'\\(\d)\?([^:]*):(.*)$')
+VERSION_GROUP_RE = re.compile(r'\\(\d)')
+LITERAL_ESCAPE_RE = re.compile(r'\\[xuUN0-7]')
+SCRIPT_SRC_RE = re.compile(r'<script[^>]+\bsrc\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+
+
+# ==================== PATTERN PARSING ====================
+
+def parse_pattern(value):
+    """
+    'jquery-([\\d.]+)\\;version:\\1\\;confidence:50' -> (regex, version, confidence)
+    """
+    parts = str(value).split('\\;')
+    version, confidence = '', 100
+    for tag in parts[1:]:
+        key, _, tag_value = tag.partition(':')
+        if key == 'version':
+            version = tag_value
+        elif key == 'confidence' and tag_value.isdigit():
+            confidence = int(tag_value)
+    return parts[0], version, confidence
+
+
+def resolve_version(template, match):
+    """'\\1', '\\1?next:' kabi version shablonini match guruhlari bilan to'ldirish"""
+    if not template:
+        return ''
+    groups = (match.group(0),) + match.groups()
+
+    def group(index):
+        index = int(index)
+        return (groups[index] if index < len(groups) else '') or ''
+
+    resolved = VERSION_TERNARY_RE.sub(lambda m: m.group(2) if group(m.group(1)) else m.group(3), template)
+    return VERSION_GROUP_RE.sub(lambda m: group(m.group(1)), resolved).strip()
+
+
+def _literal_options(items, options, run):
+    """Pattern mos kelishi uchun albatta uchraydigan literal qatorlarini yig'ish (pastki registrda)"""
+    for op, av in items:
+        name = str(op)
+        if name == 'LITERAL' and av < 128:
+            run.append(chr(av).lower())
+            continue
+        if name == 'SUBPATTERN' and not any(str(o) == 'BRANCH' for o, _ in av[-1]):
+            _literal_options(av[-1], options, run)
+            continue
+
+        _close_run(options, run)
+        if name == 'BRANCH':
+            alternatives = [required_tokens(list(alt)) for alt in av[1]]
+            if all(alternatives):
+                options.append([token for alt in alternatives for token in alt[0]])
+        elif name == 'SUBPATTERN':
+            options.extend(required_tokens(list(av[-1])))
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT') and av[0] >= 1:
+            options.extend(required_tokens(list(av[2])))
+
+
+def _close_run(options, run):
+    """Literal qatorning har bir so'zi (token) majburiy: 'google-analytics.com' -> google, analytics, com"""
+    # Qator chetidagi token so'zning faqat bir qismi bo'lishi mumkin ('[a-z]+tag' -> 'tag').
+    # Bu xato emas: TokenIndex tokenni so'z ichidagi istalgan joydan qidiradi (substring).
+    if run:
+        options.extend([token] for token in TOKEN_RE.findall(''.join(run)))
+        del run[:]
+
+
+def required_tokens(items):
+    """
+    Majburiy token to'plamlari: har bir to'plamdan kamida bittasi sahifa
+    so'zlari ichida (substring) bo'lmasa, regex ham mos kelmaydi. Eng yaxshisi birinchi.
+    '(google-analytics\\.com|gtag\\.js)' -> [['analytics', 'tag']]
+        (sre_parse umumiy 'g' prefiksini branchdan tashqariga chiqaradi)
+    'normalize\\.mixin\\(' -> [['normalize'], ['mixin']]
+    """
+    options, run = [], []
+    _literal_options(items, options, run)
+    _close_run(options, run)
+    options = [opt for opt in options if min(len(token) for token in opt) >= MIN_TOKEN]
+    return sorted(options, key=lambda opt: (-min(len(token) for token in opt), len(opt)))
+
+
+def pattern_tokens(regex):
+    try:
+        return required_tokens(list(sre_parse.parse(regex)))
+    except Exception:
+        return []
+
+
+@lru_cache(maxsize=None)
+def compiled(regex):
+    """Regex faqat birinchi kerak bo'lganda kompilyatsiya qilinadi"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return re.compile(regex, re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def compiled_lower(regex):
+    """
+    Pastki registrdagi matn uchun registrga sezgir nusxa
+    IGNORECASE bilan sre literal-prefiks qidiruvini ishlatmaydi va har bir
+    search butun sahifani belgilab o'tadi; pattern va matn ikkalasi ham
+    pastki registrga o'tkazilsa, tez prefiks qidiruvi ishlaydi.
+    Return: (pattern, lowered?) - kod nuqtali escape'lar bo'lsa asl pattern
+    """
+    if LITERAL_ESCAPE_RE.search(regex):
+        return compiled(regex), False
+    out, i = [], 0
+    while i < len(regex):
+        if regex[i] == '\\':
+            out.append(regex[i:i + 2])
+            i += 2
+        else:
+            out.append(regex[i].lower())
+            i += 1
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return re.compile(''.join(out)), True
+
+
+def trie_regex(words):
+    """So'zlar ro'yxati -> prefiks daraxti ko'rinishidagi bitta regex"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+# ==================== TOKEN INDEX ====================
+
+class TokenIndex:
+    """
+    Matn manbasi (html / scriptSrc) uchun prefilter
+
+    Har bir pattern majburiy literallaridagi so'zlar (token) bilan saqlanadi:
+    eng uzun token to'plami indeks kaliti, qolganlari qo'shimcha shart. Token
+    [a-z0-9_] harflaridan iborat, shuning uchun u sahifada albatta bitta so'z
+    ichida turadi: sahifa so'zlarga bo'linadi, takrorlanmas so'zlar
+    birlashtiriladi va barcha tokenlar prefiks daraxtidan qurilgan bitta regex
+    bilan shu qisqa matnda qidiriladi. Faqat barcha majburiy tokenlari
+    topilgan patternlar to'liq regex bilan tekshiriladi.
+    """
+
+    def __init__(self):
+        self.by_token = {}
+        self.requires = {}
+        self.tokens = set()
+        self.always = []
+        self.pattern = ''
+        self._regex = None
+
+    def add(self, entry, options):
+        """options: pattern_tokens() natijasi - birinchi to'plam indeks, qolganlari qo'shimcha shart"""
+        if not options:
+            self.always.append(entry)
+            return
+        for token in options[0]:
+            self.by_token.setdefault(token, []).append(entry)
+        if len(options) > 1:
+            self.requires[entry] = options[1:]
+        self.tokens.update(token for option in options for token in option)
+
+    def finish(self):
+        # lookahead: har bir pozitsiyada qidiriladi - token so'zning boshida bo'lishi shart emas
+        # va ustma-ust tushgan tokenlar ham topiladi (required_tokens shunga tayanadi)
+        self.pattern = f'(?=({trie_regex(sorted(self.tokens))}))' if self.tokens else ''
+
+    def state(self):
+        return {'by_token': self.by_token, 'requires': self.requires, 'tokens': self.tokens,
+                'always': self.always, 'pattern': self.pattern}
+
+    @classmethod
+    def from_state(cls, state):
+        index = cls()
+        index.__dict__.update(state)
+        return index
+
+    @staticmethod
+    def words(lowered):
+        """Sahifadagi takrorlanmas so'zlar, '\\n' bilan birlashtirilgan (bytes.translate - C tezligida)"""
+        data = lowered.encode('utf-8', errors='ignore').translate(WORD_TABLE)
+        return b'\n'.join(set(data.split())).decode('ascii')
+
+    def tokens_in(self, lowered):
+        """Sahifada uchragan tokenlar"""
+        if not self.pattern:
+            return set()
+        if self._regex is None:
+            self._regex = re.compile(self.pattern)
+
+        hits = set()
+        for match in self._regex.finditer(self.words(lowered)):
+            word = match.group(1)
+            # Daraxt eng uzun tokenni qaytaradi - uning prefiks-tokenlari ham uchragan
+            for end in range(MIN_TOKEN, len(word) + 1):
+                if word[:end] in self.tokens:
+                    hits.add(word[:end])
+        return hits
+
+    def candidates(self, lowered):
+        """Tokeni sahifada uchragan patternlar (+ tokensiz patternlar)"""
+        hits = self.tokens_in(lowered)
+        entries = list(self.always)
+        seen = set(entries)
+        for token in hits:
+            for entry in self.by_token.get(token, ()):
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                if all(not hits.isdisjoint(option) for option in self.requires.get(entry, ())):
+                    entries.append(entry)
+        return entries
+
+
+# ==================== DATABASE ====================
+
+class TechnologyDB:
+    """
+    Kompilyatsiya qilingan Wappalyzer bazasi
+
+    Entry: (texnologiya, regex, version shabloni, confidence)
+    headers / cookies / meta - nom bo'yicha lug'at: faqat sahifada bor
+    nomlarning patternlari tekshiriladi.
+    html / scriptSrc - TokenIndex prefilteri orqali.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, technologies, categories=None):
+        categories = categories or {}
+        self.techs = {}
+        self.headers = {}
+        self.cookies = {}
+        self.meta = {}
+        self.html = TokenIndex()
+        self.scripts = TokenIndex()
+        self.url = []
+        self.source = 'builtin'
+
+        for name, tech in technologies.items():
+            if not isinstance(tech, dict):
+                continue
+            self.techs[name] = {
+                'categories': [self._category(cat, categories) for cat in tech.get('cats', [])],
+                'implies': [parse_pattern(i) for i in self._as_list(tech.get('implies'))],
+                'excludes': [parse_pattern(e)[0] for e in self._as_list(tech.get('excludes'))],
+            }
+
+            for source, index in (('headers', self.headers), ('cookies', self.cookies), ('meta', self.meta)):
+                for key, values in (tech.get(source) or {}).items():
+                    for value in self._as_list(values) or ['']:
+                        entry = self._entry(name, value)
+                        if entry:
+                            index.setdefault(key.lower(), []).append(entry)
+
+            for source in ('html', 'scripts'):
+                for value in self._as_list(tech.get(source)):
+                    self._add_text(self.html, name, value)
+            for value in self._as_list(tech.get('scriptSrc', tech.get('script'))):
+                self._add_text(self.scripts, name, value)
+            for value in self._as_list(tech.get('url')):
+                entry = self._entry(name, value)
+                if entry:
+                    self.url.append(entry)
+
+        self.html.finish()
+        self.scripts.finish()
+
+    def state(self):
+        """Keshga yoziladigan holat (faqat oddiy tiplar - klass nomlari pickle qilinmaydi)"""
+        return {'techs': self.techs, 'headers': self.headers, 'cookies': self.cookies,
+                'meta': self.meta, 'url': self.url, 'source': self.source,
+                'html': self.html.state(), 'scripts': self.scripts.state()}
+
+    @classmethod
+    def from_state(cls, state):
+        db = cls.__new__(cls)
+        db.__dict__.update(state)
+        db.html = TokenIndex.from_state(state['html'])
+        db.scripts = TokenIndex.from_state(state['scripts'])
+        return db
+
+    @staticmethod
+    def _as_list(value):
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    @staticmethod
+    def _category(cat, categories):
+        info = categories.get(str(cat))
+        if isinstance(info, dict) and info.get('name'):
+            return info['name']
+        return cat if isinstance(cat, str) else f"Category {cat}"
+
+    @staticmethod
+    def _entry(name, value):
+        """Pattern -> entry; JavaScript-dan Python-ga o'tmaydigan regexlar tashlab yuboriladi"""
+        regex, version, confidence = parse_pattern(value)
+        if regex:
+            try:
+                compiled(regex)
+            except re.error:
+                return None
+        return (name, regex, version, confidence)
+
+    def _add_text(self, index, name, value):
+        entry = self._entry(name, value)
+        if entry and entry[1]:
+            index.add(entry, pattern_tokens(entry[1]))
+
+    # ---------- load / cache ----------
+
+    @staticmethod
+    def source_files():
+        """Lokal technologies fayllari (bo'lingan a.json..z.json yoki bitta technologies.json)"""
+        files = sorted(glob.glob(os.path.join(WAPPALYZER_DIR, 'technologies', '*.json')))
+        single = os.path.join(WAPPALYZER_DIR, 'technologies.json')
+        if not files and os.path.isfile(single):
+            files = [single]
+        return files or [BUILTIN_FILE]
+
+    @staticmethod
+    def read_sources(files):
+        technologies, categories = {}, {}
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data.get('technologies'), dict):
+                categories.update(data.get('categories') or {})
+                data = data['technologies']
+            technologies.update(data)
+
+        categories_file = os.path.join(WAPPALYZER_DIR, 'categories.json')
+        if os.path.isfile(categories_file):
+            with open(categories_file, 'r', encoding='utf-8') as f:
+                categories.update(json.load(f))
+        return technologies, categories
+
+    @staticmethod
+    def fingerprint(files):
+        digest = hashlib.sha256(f"{COMPILER_VERSION}:{sys.version_info[:2]}".encode())
+        categories_file = os.path.join(WAPPALYZER_DIR, 'categories.json')
+        for path in files + ([categories_file] if os.path.isfile(categories_file) else []):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls):
+        """Manbalarni kompilyatsiya qilish va keshga yozish"""
+        files = cls.source_files()
+        technologies, categories = cls.read_sources(files)
+        db = cls(technologies, categories)
+        db.source = 'builtin' if files == [BUILTIN_FILE] else WAPPALYZER_DIR
+
+        tmp = WAPPALYZER_CACHE + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'version': COMPILER_VERSION,
+                         'fingerprint': cls.fingerprint(files),
+                         'db': db.state()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, WAPPALYZER_CACHE)
+        return db
+
+    @classmethod
+    def load(cls):
+        """Keshdan yuklash; manba o'zgargan yoki kesh eskirgan bo'lsa qayta kompilyatsiya"""
+        files = cls.source_files()
+        try:
+            with open(WAPPALYZER_CACHE, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') == COMPILER_VERSION and \
+                    cached.get('fingerprint') == cls.fingerprint(files):
+                return cls.from_state(cached['db'])
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError, TypeError):
+            pass
+        return cls.build()
+
+    @classmethod
+    def get(cls):
+        """Jarayon bo'yicha bitta nusxa (birinchi chaqiruvda yuklanadi)"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls.load()
+            return cls._instance
+
+    # ---------- matching ----------
+
+    @staticmethod
+    def _detect(entry, match, detected):
+        name, regex, version, confidence = entry
+        current = detected.setdefault(name, {'version': '', 'confidence': 0})
+        current['confidence'] = min(100, current['confidence'] + confidence)
+        found = resolve_version(version, match) if match else ''
+        if len(found) > len(current['version']):
+            current['version'] = found
+
+    def _search(self, entry, text):
+        """Qisqa qiymatlar (header, cookie, meta, url)"""
+        regex = entry[1]
+        match = compiled(regex).search(text) if regex else None
+        if regex and not match:
+            return None
+        return entry, match
+
+    def _search_page(self, entry, text, lowered):
+        """Katta matn: pastki registrdagi nusxada qidiriladi, versiya asl matndan olinadi"""
+        pattern, is_lowered = compiled_lower(entry[1])
+        match = pattern.search(lowered if is_lowered else text)
+        if not match:
+            return None
+        if is_lowered and entry[2]:
+            exact = compiled(entry[1]).match(text, match.start())
+            match = exact or match
+        return entry, match
+
+    @staticmethod
+    def page_meta(html):
+        """<meta name|property=... content=...> -> {nom: [content]}"""
+        meta = {}
+        for tag in META_RE.findall(html):
+            attrs = {m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ''
+                     for m in ATTR_RE.finditer(tag)}
+            key = attrs.get('name') or attrs.get('property') or attrs.get('http-equiv')
+            if key and 'content' in attrs:
+                meta.setdefault(key.lower(), []).append(attrs['content'])
+        return meta
+
+    def analyze(self, url='', headers=None, cookies=None, html=''):
+        """
+        Bitta sahifa
+        headers / cookies: {nom: qiymat} (nomlar istalgan registrda)
+        Return: {texnologiya: {'version', 'confidence', 'categories'}}
+        """
+        detected = {}
+        html = html[:MAX_HTML]
+        hits = []
+
+        for source, values in ((self.headers, headers), (self.cookies, cookies)):
+            for key, value in (values or {}).items():
+                for entry in source.get(key.lower(), ()):
+                    hits.append(self._search(entry, value))
+
+        for key, contents in self.page_meta(html).items():
+            for entry in self.meta.get(key, ()):
+                hits.extend(self._search(entry, content) for content in contents)
+
+        hits.extend(self._search(entry, url) for entry in self.url)
+
+        lowered = html.lower()
+        for entry in self.html.candidates(lowered):
+            hits.append(self._search_page(entry, html, lowered))
+
+        sources = [(src, src.lower()) for src in SCRIPT_SRC_RE.findall(html)]
+        if sources:
+            for entry in self.scripts.candidates('\n'.join(src_lower for _, src_lower in sources)):
+                hits.append(next(filter(None, (self._search_page(entry, src, src_lower)
+                                               for src, src_lower in sources)), None))
+
+        for hit in hits:
+            if hit:
+                self._detect(*hit, detected)
+
+        self._resolve_implies(detected)
+
+        for name, info in detected.items():
+            info['categories'] = self.techs.get(name, {}).get('categories', [])
+        return detected
+
+    def _resolve_implies(self, detected):
+        queue = list(detected)
+        while queue:
+            name = queue.pop()
+            for implied, version, confidence in self.techs.get(name, {}).get('implies', []):
+                if implied in self.techs and implied not in detected:
+                    detected[implied] = {'version': '', 'confidence': confidence}
+                    queue.append(implied)
+        for name in list(detected):
+            for excluded in self.techs.get(name, {}).get('excludes', []):
+                detected.pop(excluded, None)
+
+
+def get_db():
+    return TechnologyDB.get()
+
+
+def update_db(on_file=None):
+    """
+    Wappalyzer manbasini yuklab olish (faqat foydalanuvchi so'raganda) va keshni qayta qurish
+    Return: TechnologyDB
+    """
+    from app.utils import HTTPClient
+    session = HTTPClient.session()
+
+    target = os.path.join(WAPPALYZER_DIR, 'technologies')
+    os.makedirs(target, exist_ok=True)
+
+    downloads = [(f"{SOURCE_URL}/technologies/{name}.json", os.path.join(target, f"{name}.json"))
+                 for name in SOURCE_FILES]
+    downloads.append((f"{SOURCE_URL}/categories.json", os.path.join(WAPPALYZER_DIR, 'categories.json')))
+
+    for url, path in downloads:
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(path + '.tmp', path)
+        if on_file:
+            on_file(path)
+
+    db = TechnologyDB.build()
+    with TechnologyDB._lock:
+        TechnologyDB._instance = db
+    return db
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['update']:
+        db = update_db(on_file=lambda path: print(f"[+] {path}"))
+    else:
+        db = TechnologyDB.build()
+    print(f"[+] {len(db.techs)} ta texnologiya kompilyatsiya qilindi -> {WAPPALYZER_CACHE}")
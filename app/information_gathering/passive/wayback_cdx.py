@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# app/information_gathering/passive/wayback_cdx.py - Parallel, davom ettiriladigan Wayback CDX klienti
+#
+# 1) showNumPages=true bilan sahifalar soni olinadi
+# 2) sahifalar CDX_WORKERS ta thread'da, CDX_RATE so'rov/s cheklovi bilan yuklanadi
+# 3) har bir tugagan sahifa data/wayback_cdx/<domen>/page_NNNNN.txt.gz ga atomik
+#    yoziladi - uzilgan ishga tushirish keyingi safar faqat qolgan sahifalarni oladi
+# 4) iter_urls() sahifalarni tartib bilan oqim qilib beradi (wayback_stream.ingest uchun)
+
+import os
+import re
+import gzip
+import json
+import time
+import shutil
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.config import USER_AGENT, CDX_WORKERS, CDX_RATE, WAYBACK_CDX_DIR
+from app.utils import HTTPClient
+
+CDX_API = "https://web.archive.org/cdx/search/cdx"
+CDX_TIMEOUT = 120           # bitta sahifa katta bo'lishi mumkin
+
+
+class RateLimiter:
+    """Thread-safe: so'rovlar boshlanishi orasida kamida 1/rate sekund"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class CDXFetcher:
+    """
+    Bitta domen uchun paginated CDX yuklovchi
+
+    fetcher = CDXFetcher("example.com")
+    fetcher.prepare()              # sahifalar soni (yoki checkpoint'dan)
+    done, failed = fetcher.run()   # qolgan sahifalar parallel
+    for url in fetcher.iter_urls(): ...
+    fetcher.clear()                # to'liq tugagach checkpointlarni o'chirish
+    """
+
+    def __init__(self, domain, subdomains=True, workers=CDX_WORKERS, rate=CDX_RATE,
+                 checkpoint_dir=WAYBACK_CDX_DIR, api=CDX_API, session=None):
+        self.domain = domain
+        self.api = api
+        self.workers = max(1, workers)
+        self.rate = rate
+        self.limiter = RateLimiter(rate)
+        self.session = session or HTTPClient.session({"User-Agent": USER_AGENT})
+        self.query = {
+            'url': f"*.{domain}/*" if subdomains else f"{domain}/*",
+            'output': 'txt',
+            'fl': 'original',
+            'collapse': 'urlkey',
+        }
+        name = re.sub(r'[^\w.-]', '_', domain) + ('_all' if subdomains else '')
+        self.dir = os.path.join(checkpoint_dir, name)
+        self.meta_path = os.path.join(self.dir, 'meta.json')
+        self.pages = None
+        self.resumed = False
+
+    # ---------------- checkpoint ----------------
+
+    def page_path(self, page):
+        return os.path.join(self.dir, f"page_{page:05d}.txt.gz")
+
+    def completed(self):
+        return [page for page in range(self.pages or 0) if os.path.exists(self.page_path(page))]
+
+    def pending(self):
+        return [page for page in range(self.pages or 0) if not os.path.exists(self.page_path(page))]
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # So'rov o'zgargan bo'lsa eski checkpointlar yaroqsiz
+        if meta.get('query') != self.query or not isinstance(meta.get('pages'), int):
+            return None
+        return meta
+
+    def clear(self):
+        """Checkpointlarni o'chirish"""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    # ---------------- fetch ----------------
+
+    def _get(self, params, stream=False):
+        self.limiter.wait()
+        response = self.session.get(self.api, params={**self.query, **params},
+                                    timeout=CDX_TIMEOUT, stream=stream)
+        response.raise_for_status()
+        return response
+
+    def prepare(self):
+        """
+        Sahifalar sonini aniqlash
+        Shu so'rov uchun checkpoint bo'lsa - undagi son ishlatiladi (resume)
+        """
+        meta = self._load_meta()
+        if meta:
+            self.pages = meta['pages']
+            self.resumed = True
+            return self.pages
+
+        self.clear()
+        text = self._get({'showNumPages': 'true'}).text.strip()
+        self.pages = int(text) if text.isdigit() else 1
+
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'query': self.query, 'pages': self.pages,
+                       'created': datetime.now().isoformat(timespec='seconds')}, f, indent=2)
+        return self.pages
+
+    def fetch_page(self, page):
+        """Bitta sahifani yuklab checkpoint sifatida yozish. Return: qatorlar soni"""
+        path = self.page_path(page)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        lines = 0
+        response = self._get({'page': page}, stream=True)
+        response.encoding = response.encoding or 'utf-8'     # text/plain charset'siz keladi
+        try:
+            with gzip.open(tmp, 'wt', encoding='utf-8') as out:
+                for line in response.iter_lines(decode_unicode=True):
+                    if line:
+                        out.write(line + '\n')
+                        lines += 1
+            os.replace(tmp, path)       # faqat to'liq sahifa checkpoint bo'ladi
+        finally:
+            response.close()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return lines
+
+    def run(self, on_page=None):
+        """
+        Qolgan sahifalarni parallel yuklash
+        on_page(page, lines, error) - har bir sahifadan keyin
+        Return: (tugagan sahifalar soni, xato bo'lgan sahifalar ro'yxati)
+        Ctrl+C: navbatdagilar bekor qilinadi, yuklanayotganlari tugatiladi
+        """
+        if self.pages is None:
+            self.prepare()
+
+        failed = []
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        futures = {pool.submit(self.fetch_page, page): page for page in self.pending()}
+        try:
+            for future in as_completed(futures):
+                page = futures[future]
+                try:
+                    lines, error = future.result(), None
+                except Exception as e:
+                    lines, error = 0, str(e)
+                    failed.append(page)
+                if on_page:
+                    on_page(page, lines, error)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return len(self.completed()), sorted(failed)
+
+    def iter_urls(self):
+        """Tugagan sahifalardagi URL'lar (sahifa tartibida, oqim bilan)"""
+        for page in range(self.pages or 0):
+            path = self.page_path(page)
+            if not os.path.exists(path):
+                continue
+            with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    yield line
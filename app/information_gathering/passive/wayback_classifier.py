@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# app/information_gathering/passive/wayback_classifier.py - Wayback URL'lar uchun bir o'tishli klassifikator
+#
+# Barcha kalit so'zlar (qidiruv rejimlari + kategoriyalar) bitta prefiks daraxti
+# regex'iga kompilyatsiya qilinadi. Har bir URL bir marta kichik harfga o'tkaziladi
+# va bitta findall bilan: filtr, kengaytma va kategoriyalar aniqlanadi.
+# Katta arxivlar bo'laklarga (chunk) bo'linib ProcessPool'da tasniflanadi.
+
+import os
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.information_gathering.passive.wappalyzer_db import trie_regex
+
+CHUNK_SIZE = 50000          # bitta bo'lakdan kichik arxiv joriy jarayonda tasniflanadi
+
+
+class URLClassifier:
+    """
+    rules: {nom: (kalit_so'zlar, suffix_mode)}
+      suffix_mode=True  - '.' bilan boshlangan so'z URL oxirida bo'lishi kerak (.bak, .env)
+      suffix_mode=False - barcha so'zlar URL'ning istalgan joyida
+    extensions: kuzatiladigan fayl kengaytmalari (statistika uchun)
+
+    classify(url) -> (bitmask, extension): bitmask'dagi i-bit = self.labels[i] qoidasi
+    """
+
+    def __init__(self, rules, extensions=()):
+        self.labels = list(rules)
+        self.extensions = frozenset(extensions)
+        substring = {}              # so'z -> bitmask
+        suffix = {}                 # '.ext' -> bitmask
+        for bit, (keywords, suffix_mode) in enumerate(rules.values()):
+            for word in keywords:
+                word = word.lower()
+                if suffix_mode and word.startswith('.') and len(word) > 1:
+                    suffix[word] = suffix.get(word, 0) | (1 << bit)
+                elif word:
+                    substring[word] = substring.get(word, 0) | (1 << bit)
+
+        # Lookahead har pozitsiyada eng uzun so'zni qaytaradi; shu pozitsiyada boshlanadigan
+        # qisqaroq so'zlar uning prefiksi - ular mask'ga oldindan qo'shib qo'yiladi
+        self.masks = {
+            word: self._prefix_mask(word, substring) for word in substring
+        }
+        self.pattern = re.compile(f"(?=({trie_regex(substring)}))") if substring else None
+        self.suffixes = tuple(suffix)
+        self.suffix_masks = suffix
+
+    @staticmethod
+    def _prefix_mask(word, substring):
+        mask = 0
+        for other, bits in substring.items():
+            if word.startswith(other):
+                mask |= bits
+        return mask
+
+    def classify(self, url):
+        url_lower = url.lower()
+        mask = 0
+        if self.pattern is not None:
+            masks = self.masks
+            for word in self.pattern.findall(url_lower):
+                mask |= masks[word]
+        if self.suffixes and url_lower.endswith(self.suffixes):
+            for word, bits in self.suffix_masks.items():
+                if url_lower.endswith(word):
+                    mask |= bits
+        head, dot, ext = url_lower.rpartition('.')
+        return mask, ext if dot and ext in self.extensions else None
+
+    def bit(self, label):
+        return 1 << self.labels.index(label)
+
+
+class ClassifyResult:
+    """Bir o'tish natijasi: filtrlangan soni, statistika va ekran uchun namuna"""
+
+    def __init__(self, labels):
+        self.total = 0
+        self.count = 0
+        self.extensions = {}
+        self.categories = dict.fromkeys(labels, 0)          # filtrlanganlar ichida
+        self.all_categories = dict.fromkeys(labels, 0)      # butun arxiv bo'yicha
+        self.sample = []
+
+    def merge(self, part, sample_limit):
+        self.total += part['total']
+        self.count += len(part['matched'])
+        for ext, n in part['extensions'].items():
+            self.extensions[ext] = self.extensions.get(ext, 0) + n
+        for key in ('categories', 'all_categories'):
+            target = getattr(self, key)
+            for label, n in part[key].items():
+                target[label] += n
+        if len(self.sample) < sample_limit:
+            self.sample.extend(part['matched'][:sample_limit - len(self.sample)])
+
+
+# Har bir worker jarayonida klassifikator bir marta quriladi
+_worker_cache = {}
+
+
+def _classifier(rules, extensions):
+    key = repr((rules, extensions))
+    classifier = _worker_cache.get(key)
+    if classifier is None:
+        _worker_cache.clear()
+        classifier = _worker_cache[key] = URLClassifier(rules, extensions)
+    return classifier
+
+
+def classify_chunk(urls, rules, extensions, filter_label, categories):
+    """
+    Bir bo'lak URL'ni tasniflash (worker ichida ham ishlaydi)
+    filter_label: None - hammasi o'tadi, aks holda shu qoidaga mos URL'lar
+    categories: statistikasi yig'iladigan qoidalar nomlari
+    Ichki sikl classify() ning inline nusxasi: kategoriyalar URL bo'yicha emas,
+    oxirida mask'lar soni bo'yicha hisoblanadi.
+    """
+    classifier = _classifier(rules, extensions)
+    filter_bit = classifier.bit(filter_label) if filter_label else 0
+    findall = classifier.pattern.findall if classifier.pattern is not None else None
+    masks = classifier.masks
+    suffixes, suffix_masks = classifier.suffixes, classifier.suffix_masks
+    known_ext = classifier.extensions
+
+    matched = []
+    ext_counts = {}
+    hit_masks = {}
+    all_masks = {}
+    for url in urls:
+        url_lower = url.lower()
+        mask = 0
+        if findall is not None:
+            for word in findall(url_lower):
+                mask |= masks[word]
+        if suffixes and url_lower.endswith(suffixes):
+            for word, bits in suffix_masks.items():
+                if url_lower.endswith(word):
+                    mask |= bits
+        if mask:
+            all_masks[mask] = all_masks.get(mask, 0) + 1
+        if filter_bit and not mask & filter_bit:
+            continue
+        matched.append(url)
+        if mask:
+            hit_masks[mask] = hit_masks.get(mask, 0) + 1
+        ext = url_lower.rpartition('.')[2]
+        if ext in known_ext and '.' in url_lower:
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+
+    def per_label(mask_counts):
+        counts = dict.fromkeys(categories, 0)
+        for label in categories:
+            bit = classifier.bit(label)
+            counts[label] = sum(n for mask, n in mask_counts.items() if mask & bit)
+        return counts
+
+    return {'total': len(urls), 'matched': matched, 'extensions': ext_counts,
+            'categories': per_label(hit_masks), 'all_categories': per_label(all_masks)}
+
+
+def iter_chunks(urls, size=CHUNK_SIZE):
+    chunk = []
+    for url in urls:
+        chunk.append(url)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify_stream(urls, rules, extensions, filter_label=None, categories=(), sink=None,
+                    processes=None, sample_limit=50):
+    """
+    URL oqimini bitta o'tishda tasniflash (tartib saqlanadi)
+    sink: mos URL'lar yoziladigan fayl (text) - ro'yxat xotirada yig'ilmaydi
+    processes: None - CPU soni (bo'laklar ProcessPool'da), 0 - joriy jarayonda
+    Xotirada bir vaqtning o'zida ko'pi bilan 2 * processes ta bo'lak bo'ladi.
+    """
+    result = ClassifyResult(categories)
+    args = (rules, tuple(sorted(extensions)), filter_label, tuple(categories))
+
+    def consume(part):
+        result.merge(part, sample_limit)
+        if sink is not None and part['matched']:
+            sink.write('\n'.join(part['matched']) + '\n')
+
+    chunks = iter_chunks(urls)
+    first = next(chunks, None)
+    if first is None:
+        return result
+
+    # Kichik arxiv - jarayon ishga tushirish qimmatroq
+    if processes == 0 or (len(first) < CHUNK_SIZE and processes is None):
+        consume(classify_chunk(first, *args))
+        for chunk in chunks:
+            consume(classify_chunk(chunk, *args))
+        return result
+
+    workers = processes or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(workers) as pool:
+        pending.append(pool.submit(classify_chunk, first, *args))
+        for chunk in chunks:
+            pending.append(pool.submit(classify_chunk, chunk, *args))
+            if len(pending) >= 2 * workers:
+                consume(pending.popleft().result())
+        while pending:
+            consume(pending.popleft().result())
+    return result
+
+
+def spool():
+    """Mos URL'lar uchun vaqtinchalik fayl (hisobot sarlavhasi statistikadan keyin yoziladi)"""
+    return tempfile.TemporaryFile('w+', encoding='utf-8')
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# app/information_gathering/passive/wayback_stream.py - Wayback URL oqimi (normalize + diskda dedupe + gzip)
+#
+# CDX / waybackurls chiqishi qatorma-qator o'qiladi, URL normalize qilinadi,
+# takrorlar diskdagi hash to'plam (SQLite) orqali tashlanadi va natija
+# darhol .txt.gz faylga yoziladi. Xotira URL soniga bog'liq emas
+# (faqat BATCH_SIZE ta URL bufer).
+
+import os
+import gzip
+import sqlite3
+import hashlib
+import subprocess
+
+BATCH_SIZE = 20000
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+
+# ==================== NORMALIZE ====================
+
+def normalize_url(url):
+    """
+    Bitta URL'ni kanonik ko'rinishga keltirish (yaroqsiz bo'lsa None)
+    - sxema va host kichik harfda, standart port olib tashlanadi
+    - #fragment tashlanadi
+    - query parametrlari tartiblanadi (?b=2&a=1 -> ?a=1&b=2)
+    Millionlab qator uchun urlsplit o'rniga oddiy str amallari ishlatiladi.
+    """
+    url = url.strip().partition('#')[0]
+    scheme, sep, rest = url.partition('://')
+    if not sep:
+        scheme, rest = 'http', url
+    scheme = scheme.lower()
+    if scheme not in DEFAULT_PORTS or not rest:
+        return None
+
+    end = len(rest)
+    for char in '/?':
+        index = rest.find(char)
+        if index != -1 and index < end:
+            end = index
+    netloc = rest[:end].lower()
+    if not netloc or ' ' in netloc:
+        return None
+    if netloc.endswith(DEFAULT_PORTS[scheme]):
+        netloc = netloc[:-len(DEFAULT_PORTS[scheme])]
+
+    path, _, query = rest[end:].partition('?')
+    # Qiymatlar qayta kodlanmaydi - faqat parametrlar tartiblanadi
+    if '&' in query:
+        query = '&'.join(sorted(filter(None, query.split('&'))))
+    return f"{scheme}://{netloc}{path or '/'}{'?' + query if query else ''}"
+
+
+# ==================== DEDUPE ====================
+
+class DiskURLSet:
+    """
+    Diskdagi aniq hash to'plam (URL -> 64-bit blake2b)
+    URL'lar BATCH_SIZE bo'yicha tekshiriladi: bufer vaqtinchalik jadvalga
+    yoziladi, yangilari bitta SELECT bilan ajratiladi - har bir URL uchun
+    alohida so'rov yo'q.
+    """
+
+    # RETURNING (SQLite 3.35+) yangi qo'shilgan kalitlarni to'g'ridan-to'g'ri qaytaradi
+    RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA cache_size = -65536;
+            CREATE TABLE IF NOT EXISTS seen (h INTEGER PRIMARY KEY) WITHOUT ROWID;
+            CREATE TEMP TABLE batch (h INTEGER);
+        """)
+
+    @staticmethod
+    def key(url):
+        return int.from_bytes(hashlib.blake2b(url.encode('utf-8', 'surrogateescape'),
+                                              digest_size=8).digest(), 'big', signed=True)
+
+    def new_keys(self, keys):
+        """keys (takrorsiz) ichidan hali ko'rilmaganlarini qaytarish va ularni to'plamga qo'shish"""
+        with self.conn:
+            self.conn.execute("DELETE FROM batch")
+            self.conn.executemany("INSERT INTO batch VALUES (?)", ((k,) for k in keys))
+            if self.RETURNING:
+                return {row[0] for row in self.conn.execute(
+                    "INSERT INTO seen SELECT h FROM batch WHERE true ORDER BY h "
+                    "ON CONFLICT DO NOTHING RETURNING h")}
+            fresh = {row[0] for row in self.conn.execute(
+                "SELECT h FROM batch WHERE h NOT IN (SELECT h FROM seen)")}
+            self.conn.executemany("INSERT INTO seen VALUES (?)", ((k,) for k in sorted(fresh)))
+        return fresh
+
+    def close(self, remove=True):
+        self.conn.close()
+        if remove:
+            for suffix in ('', '-journal'):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+
+class IngestStats:
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.unique = 0
+
+    @property
+    def duplicates(self):
+        return self.read - self.invalid - self.unique
+
+
+def ingest(urls, output_path, on_progress=None, batch_size=BATCH_SIZE, stats=None):
+    """
+    URL oqimini normalize + dedupe qilib gzip faylga yozish (tartib saqlanadi)
+    urls: istalgan iterator (CLI stdout, CDX sahifalar, fayl)
+    on_progress: har bir batch'dan keyin stats bilan chaqiriladi
+    stats: tashqaridan berilsa Ctrl+C'dan keyin ham hisob saqlanadi
+    Return: IngestStats (Ctrl+C bo'lsa ham yozilganlari saqlanadi)
+    """
+    stats = stats or IngestStats()
+    seen = DiskURLSet(output_path + '.seen')
+    key = DiskURLSet.key
+    buffer = {}
+
+    def flush(out):
+        fresh = seen.new_keys(buffer.keys())
+        lines = [url for k, url in buffer.items() if k in fresh]
+        out.write('\n'.join(lines) + '\n' if lines else '')
+        stats.unique += len(lines)
+        buffer.clear()
+        if on_progress:
+            on_progress(stats)
+
+    try:
+        with gzip.open(output_path, 'wt', encoding='utf-8', compresslevel=6) as out:
+            try:
+                for raw in urls:
+                    stats.read += 1
+                    url = normalize_url(raw)
+                    if url is None:
+                        stats.invalid += 1
+                        continue
+                    buffer.setdefault(key(url), url)
+                    if len(buffer) >= batch_size:
+                        flush(out)
+            finally:
+                # Ctrl+C / xato bo'lsa ham buferdagilar yoziladi
+                if buffer:
+                    flush(out)
+    finally:
+        seen.close()
+    return stats
+
+
+def iter_archive(path):
+    """Saqlangan .txt.gz (yoki oddiy .txt) fayldan URL'larni oqim bilan o'qish"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line:
+                yield line
+
+
+# ==================== SOURCES ====================
+
+def iter_cli(domain, env=None):
+    """waybackurls CLI stdout'ini qatorma-qator o'qish (butun chiqish xotiraga yig'ilmaydi)"""
+    process = subprocess.Popen(["waybackurls", domain], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding='utf-8', errors='replace', env=env, bufsize=1 << 16)
+    try:
+        for line in process.stdout:
+            yield line
+    finally:
+        if process.poll() is None:
+            process.terminate()
+        process.stdout.close()
+        process.wait()
+
@@ -2,7 +2,6 @@
 
 import os
 import sys
-import subprocess
 import shutil
 from datetime import datetime
 import re
@@ -10,8 +9,14 @@ import re
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../"))
 sys.path.insert(0, BASE_DIR)
 
-from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REPORTS_DIR
+from app.config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REPORTS_DIR, CDX_WORKERS, CDX_RATE
 from app.utils import clear_screen, pause  # pause qo'shildi
+from app.information_gathering.passive.wayback_stream import IngestStats, ingest, iter_archive, iter_cli
+from app.information_gathering.passive.wayback_cdx import CDXFetcher
+from app.information_gathering.passive.wayback_classifier import URLClassifier, classify_stream, spool
+
+REPORTS_SUBDIR = "reports/information_gathering/passive/waybackurls"
+DISPLAY_LIMIT = 50
 
 
 # Maxsus pattern'lar
@@ -95,231 +100,171 @@ def check_waybackurls():
             os.environ['PATH'] = f"{gp}:{current_path}"
             current_path = os.environ['PATH']
     
-    has_cli = shutil.which("waybackurls") is not None
-    has_python = False
-    
-    try:
-        import waybackpy
-        has_python = True
-    except ImportError:
-        pass
-    
-    if has_cli:
+    if shutil.which("waybackurls") is not None:
         print(f"{C_OK}[✓] waybackurls CLI tool topildi (Go versiyasi - tezroq){C_RESET}")
         return "cli"
-    elif has_python:
-        print(f"{C_WARN}[!] waybackurls CLI topilmadi, Python versiyasi ishlatiladi (SEKIN!){C_RESET}")
-        print(f"{C_INFO}[*] CLI versiyasini o'rnatish (tavsiya etiladi):{C_RESET}")
-        print(f"    {C_WARN}go install github.com/tomnomnom/waybackurls@latest{C_RESET}")
-        print(f"    {C_WARN}export PATH=$PATH:~/go/bin{C_RESET}")
-        
-        # Foydalanuvchidan tasdiqlash
-        choice = input(f"\n{C_INFO}Python versiyasi bilan davom etasizmi? (y/n): {C_RESET}").strip().lower()
-        if choice != 'y':
-            return None
-        return "python"
-    else:
-        print(f"\n{C_ERR}[!] Wayback tool topilmadi!{C_RESET}")
-        print(f"{C_INFO}[*] Quyidagilardan birini o'rnating:{C_RESET}\n")
-        print(f"    {C_OK}1. Go versiyasi (tavsiya etiladi - tezroq):{C_RESET}")
-        print(f"       {C_WARN}go install github.com/tomnomnom/waybackurls@latest{C_RESET}")
-        print(f"       {C_WARN}export PATH=$PATH:~/go/bin{C_RESET}\n")
-        print(f"    {C_OK}2. Python versiyasi:{C_RESET}")
-        print(f"       {C_WARN}pip install waybackpy{C_RESET}\n")
+
+    # CLI yo'q - o'rnatilgan CDX klienti (qo'shimcha kutubxona kerak emas)
+    print(f"{C_WARN}[!] waybackurls CLI topilmadi, ichki CDX klienti ishlatiladi{C_RESET}")
+    print(f"{C_INFO}[*] Parallel sahifalar ({CDX_WORKERS} ta, {CDX_RATE:g} so'rov/s), "
+          f"uzilsa keyingi safar davom ettiriladi{C_RESET}")
+    print(f"{C_INFO}[*] CLI versiyasi: {C_WARN}go install github.com/tomnomnom/waybackurls@latest{C_RESET}")
+    return "cdx"
+
+
+def show_progress(stats):
+    """Ingest jarayoni: o'qilgan / noyob URL'lar"""
+    print(f"\r{C_INFO}[*] O'qildi: {stats.read:,} | Noyob: {C_OK}{stats.unique:,}{C_RESET}", end="", flush=True)
+
+
+def fetch_cdx(domain):
+    """
+    Ichki CDX klienti: sahifalar parallel yuklanadi va checkpoint qilinadi
+    Ctrl+C yoki xato bo'lsa olingan sahifalar saqlanadi - keyingi safar davom ettiriladi
+    Return: CDXFetcher (iter_urls() tayyor sahifalarni beradi) yoki None
+    """
+    fetcher = CDXFetcher(domain)
+    try:
+        pages = fetcher.prepare()
+    except Exception as e:
+        print(f"{C_ERR}[!] CDX API xatosi: {str(e)}{C_RESET}")
         return None
 
+    done = len(fetcher.completed())
+    if fetcher.resumed and done:
+        print(f"{C_OK}[+] Checkpoint topildi: {done}/{pages} sahifa tayyor - davom ettirilmoqda{C_RESET}")
+    print(f"{C_INFO}[*] CDX: {pages} sahifa | {fetcher.workers} parallel | {fetcher.rate:g} so'rov/s{C_RESET}")
 
-def run_waybackurls_tool(domain, method="cli"):
-    """waybackurls toolini ishga tushirish (CLI yoki Python)"""
-    
+    progress = {'done': done}
+
+    def on_page(page, lines, error):
+        if error:
+            print(f"\n{C_WARN}[!] Sahifa {page}: {error[:80]}{C_RESET}")
+            return
+        progress['done'] += 1
+        print(f"\r{C_INFO}[*] Sahifalar: {progress['done']}/{pages} (oxirgisi #{page}: {lines} qator){C_RESET}",
+              end="", flush=True)
+
+    try:
+        done, failed = fetcher.run(on_page)
+        print()
+        if failed:
+            print(f"{C_WARN}[!] {len(failed)} sahifa olinmadi - qayta ishga tushiring, "
+                  f"faqat shular yuklanadi{C_RESET}")
+    except KeyboardInterrupt:
+        print(f"\n{C_WARN}[!] To'xtatildi: {len(fetcher.completed())}/{pages} sahifa saqlandi "
+              f"({fetcher.dir}) - keyingi safar davom ettiriladi{C_RESET}")
+    return fetcher
+
+
+def run_waybackurls_tool(domain, method="cli", output_path=None):
+    """
+    waybackurls toolini ishga tushirish (CLI yoki ichki CDX klienti)
+    URL'lar oqim bilan o'qiladi, normalize + diskda dedupe qilinib output_path (.txt.gz)
+    ga yoziladi - xotira URL soniga bog'liq emas, limit yo'q.
+    Return: IngestStats yoki None (xato)
+    """
+    fetcher = None
     if method == "cli":
         # Go CLI versiyasi (tezroq)
-        try:
-            print(f"{C_INFO}[*] waybackurls CLI ishga tushirilmoqda...{C_RESET}")
-            
-            # Environment PATH ni to'g'ri o'rnatish
-            env = os.environ.copy()
-            if 'HOME' in env:
-                go_bin = os.path.join(env['HOME'], 'go', 'bin')
-                if os.path.exists(go_bin):
-                    env['PATH'] = f"{go_bin}:{env.get('PATH', '')}"
-            
-            result = subprocess.run(
-                ["waybackurls", domain],
-                capture_output=True,
-                text=True,
-                timeout=180,  # 3 daqiqa
-                env=env
-            )
-            
-            if result.returncode == 0:
-                # Stdout ni tekshirish
-                output = result.stdout.strip()
-                if not output:
-                    print(f"{C_WARN}[!] waybackurls hech narsa qaytarmadi{C_RESET}")
-                    return []
-                
-                # URL'larni ajratish
-                urls = [url.strip() for url in output.split('\n') if url.strip()]
-                
-                # URL'lar sonini tekshirish
-                if len(urls) < 10:
-                    print(f"{C_WARN}[!] Juda kam URL topildi ({len(urls)} ta){C_RESET}")
-                    print(f"{C_INFO}[*] Terminal'da sinab ko'ring: waybackurls {domain}{C_RESET}")
-                
-                return urls
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "Noma'lum xato"
-                print(f"{C_ERR}[!] Xato: {error_msg}{C_RESET}")
-                return []
-                
-        except subprocess.TimeoutExpired:
-            print(f"{C_WARN}[!] Timeout: 3 daqiqadan oshdi{C_RESET}")
-            return []
-        except FileNotFoundError:
-            print(f"{C_ERR}[!] waybackurls command topilmadi{C_RESET}")
-            print(f"{C_INFO}[*] PATH: {os.environ.get('PATH', 'NOT SET')}{C_RESET}")
-            return []
-        except Exception as e:
-            print(f"{C_ERR}[!] Xato: {str(e)}{C_RESET}")
-            import traceback
-            traceback.print_exc()
-            return []
-    
-    elif method == "python":
-        # Python versiyasi (sekinroq lekin ishlaydi)
-        try:
-            from waybackpy import WaybackMachineCDXServerAPI
-            
-            print(f"{C_INFO}[*] Python waybackpy ishlatilmoqda...{C_RESET}")
-            print(f"{C_WARN}[*] Katta saytlar uchun bu juda sekin bo'lishi mumkin!{C_RESET}")
-            
-            # Limit qo'yish (katta saytlar uchun)
-            MAX_URLS = 50000
-            print(f"{C_INFO}[*] Maksimal limit: {MAX_URLS} ta URL{C_RESET}")
-            
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            cdx_api = WaybackMachineCDXServerAPI(domain, user_agent)
-            
-            urls = []
-            count = 0
-            print(f"{C_INFO}[*] URL'lar yuklanmoqda", end="", flush=True)
-            
-            try:
-                for item in cdx_api.snapshots():
-                    if item.archive_url:
-                        urls.append(item.original)
-                        count += 1
-                        
-                        # Har 500 ta URL'da progress ko'rsatish (tezroq)
-                        if count % 500 == 0:
-                            print(".", end="", flush=True)
-                        
-                        # Har 5000 ta URL'da raqam ko'rsatish
-                        if count % 5000 == 0:
-                            print(f" {count}", end="", flush=True)
-                        
-                        # Limitga yetganda to'xtatish
-                        if count >= MAX_URLS:
-                            print(f"\n{C_WARN}[!] Limit ({MAX_URLS}) ga yetdi, to'xtatilmoqda...{C_RESET}")
-                            break
-            except KeyboardInterrupt:
-                print(f"\n{C_WARN}[!] Foydalanuvchi tomonidan to'xtatildi{C_RESET}")
-            
-            print(f" {C_OK}✓{C_RESET}\n")  # Tugadi belgisi
-            
-            return list(set(urls))  # Dublikatlarni olib tashlash
-            
-        except ImportError:
-            print(f"{C_ERR}[!] waybackpy kutubxonasi topilmadi{C_RESET}")
-            print(f"{C_INFO}[*] O'rnatish: pip install waybackpy{C_RESET}")
-            return []
-        except Exception as e:
-            print(f"\n{C_ERR}[!] Xato: {str(e)}{C_RESET}")
-            return []
-    
-    return []
+        print(f"{C_INFO}[*] waybackurls CLI ishga tushirilmoqda...{C_RESET}")
+
+        # Environment PATH ni to'g'ri o'rnatish
+        env = os.environ.copy()
+        if 'HOME' in env:
+            go_bin = os.path.join(env['HOME'], 'go', 'bin')
+            if os.path.exists(go_bin):
+                env['PATH'] = f"{go_bin}:{env.get('PATH', '')}"
+        source = iter_cli(domain, env)
+
+    elif method in ("cdx", "python"):
+        # Ichki paginated CDX klienti (avvalgi waybackpy "python" rejimi o'rniga)
+        fetcher = fetch_cdx(domain)
+        if fetcher is None:
+            return None
+        source = fetcher.iter_urls()
+    else:
+        return None
+
+    stats = IngestStats()
+    try:
+        ingest(source, output_path, on_progress=show_progress, stats=stats)
+    except KeyboardInterrupt:
+        print(f"\n{C_WARN}[!] Foydalanuvchi tomonidan to'xtatildi - olinganlari saqlandi{C_RESET}")
+    except FileNotFoundError:
+        print(f"{C_ERR}[!] waybackurls command topilmadi{C_RESET}")
+        print(f"{C_INFO}[*] PATH: {os.environ.get('PATH', 'NOT SET')}{C_RESET}")
+        return None
+    except Exception as e:
+        print(f"\n{C_ERR}[!] Xato: {str(e)}{C_RESET}")
+        return None
+    print()
+
+    # Hamma sahifa olingan bo'lsa checkpointlar kerak emas (arxiv .txt.gz da)
+    if fetcher is not None and not fetcher.pending():
+        fetcher.clear()
+
+    print(f"{C_INFO}[*] O'qildi: {stats.read:,} | Takror: {stats.duplicates:,} | "
+          f"Yaroqsiz: {stats.invalid:,} | Noyob: {C_OK}{stats.unique:,}{C_RESET}")
+    if 0 < stats.unique < 10:
+        print(f"{C_WARN}[!] Juda kam URL topildi ({stats.unique} ta){C_RESET}")
+        print(f"{C_INFO}[*] Terminal'da sinab ko'ring: waybackurls {domain}{C_RESET}")
+    return stats
+
+
+EXTENSIONS = ('php', 'html', 'js', 'css', 'jpg', 'png', 'pdf', 'txt', 'xml', 'json', 'asp', 'jsp',
+              'config', 'bak', 'sql', 'env', 'log', 'zip', 'tar', 'gz')
+
+CATEGORY_WORDS = {
+    "Admin": ["admin", "panel", "dashboard"],
+    "Login": ["login", "signin", "auth"],
+    "API": ["api", "rest", "endpoint"],
+    "Upload": ["upload", "files", "media"],
+    "Config": [".config", ".bak", ".sql", "backup"],
+    "Sensitive": [".env", ".git", ".log"],
+}
+
+FILTER_RULE = "__filter__"
+
+
+def build_rules(keywords):
+    """
+    Qidiruv kalit so'zlari + kategoriyalar -> klassifikator qoidalari
+    Filtrda '.' bilan boshlanadigan so'z (.bak, .php) URL oxirida qidiriladi,
+    kategoriyalarda esa istalgan joyda (avvalgi xatti-harakat saqlangan).
+    """
+    rules = {FILTER_RULE: (list(keywords), True)}
+    rules.update({category: (words, False) for category, words in CATEGORY_WORDS.items()})
+    return rules
+
+
+def classify_urls(urls, keywords, sink=None, processes=None):
+    """
+    Filtr + kengaytma + kategoriyalar - bitta o'tishda (katta arxivlar ProcessPool'da)
+    Return: ClassifyResult (count, extensions, categories, all_categories, sample)
+    """
+    return classify_stream(urls, build_rules(keywords), EXTENSIONS,
+                           filter_label=FILTER_RULE if keywords else None,
+                           categories=list(CATEGORY_WORDS), sink=sink,
+                           processes=processes, sample_limit=DISPLAY_LIMIT)
 
 
 def filter_urls(urls, keywords):
     """URL'larni kalit so'zlar bo'yicha filtrlash (grep kabi)"""
     if not keywords:
-        return urls
-    
-    filtered = []
-    for url in urls:
-        url_lower = url.lower()
-        
-        # Har bir keyword uchun tekshirish
-        for keyword in keywords:
-            kw_lower = keyword.lower()
-            
-            # Agar keyword fayl kengaytmasi bo'lsa (.txt, .php, .config)
-            if kw_lower.startswith('.') and len(kw_lower) > 1:
-                # URL oxirida bo'lishi kerak
-                if url_lower.endswith(kw_lower):
-                    filtered.append(url)
-                    break
-            # Agar keyword robots.txt, sitemap.xml kabi to'liq fayl nomi bo'lsa
-            elif '.' in kw_lower and not kw_lower.startswith('http'):
-                # Fayl nomi URL'da biron joyda bo'lishi mumkin
-                # Masalan: /robots.txt, /path/robots.txt, /username/robots.txt
-                # Split qilib oxirgi qismini olish
-                parts = url_lower.split('/')
-                if kw_lower in parts:  # Aniq fayl nomi
-                    filtered.append(url)
-                    break
-                # Yoki URL'da umuman mavjudmi
-                elif kw_lower in url_lower:
-                    filtered.append(url)
-                    break
-            # Oddiy so'z qidiruvi (admin, login, api)
-            else:
-                if kw_lower in url_lower:
-                    filtered.append(url)
-                    break
-    
-    return filtered
+        return list(urls)
+    classifier = URLClassifier({FILTER_RULE: (keywords, True)})
+    return [url for url in urls if classifier.classify(url)[0]]
 
 
 def get_file_extensions(urls):
     """URL'lardan fayl kengaytmalarini ajratib olish"""
-    extensions = {}
-    for url in urls:
-        match = re.search(r'\.(php|html|js|css|jpg|png|pdf|txt|xml|json|asp|jsp|config|bak|sql|env|log|zip|tar|gz)$', url.lower())
-        if match:
-            ext = match.group(1)
-            extensions[ext] = extensions.get(ext, 0) + 1
-    return extensions
+    return classify_urls(urls, [], processes=0).extensions
 
 
 def categorize_urls(urls):
     """URL'larni kategoriyalarga ajratish"""
-    categories = {
-        "Admin": 0,
-        "Login": 0,
-        "API": 0,
-        "Upload": 0,
-        "Config": 0,
-        "Sensitive": 0
-    }
-    
-    for url in urls:
-        url_lower = url.lower()
-        if any(word in url_lower for word in ["admin", "panel", "dashboard"]):
-            categories["Admin"] += 1
-        if any(word in url_lower for word in ["login", "signin", "auth"]):
-            categories["Login"] += 1
-        if any(word in url_lower for word in ["api", "rest", "endpoint"]):
-            categories["API"] += 1
-        if any(word in url_lower for word in ["upload", "files", "media"]):
-            categories["Upload"] += 1
-        if any(word in url_lower for word in [".config", ".bak", ".sql", "backup"]):
-            categories["Config"] += 1
-        if any(word in url_lower for word in [".env", ".git", ".log"]):
-            categories["Sensitive"] += 1
-    
-    return categories
+    return classify_urls(urls, [], processes=0).categories
 
 
 def run_wayback_urls(target=""):
@@ -345,6 +290,9 @@ def run_wayback_urls(target=""):
     
     print()  # Bo'sh qator
 
+    archive = None   # domen uchun yig'ilgan .txt.gz (bir marta yuklanadi)
+    total = 0
+
     # Asosiy tsikl – bir domen bilan bir necha marta turli rejimda skan qilish mumkin
     while True:
         show_search_menu()
@@ -370,19 +318,29 @@ def run_wayback_urls(target=""):
                 pause()
                 continue
 
-        print(f"\n{C_INFO}[*] waybackurls ishga tushirilmoqda → {domain}{C_RESET}")
         if keywords:
             print(f"{C_INFO}[*] Filtrlash: {C_OK}{', '.join(keywords[:5])}{C_RESET}")
             if len(keywords) > 5:
                 print(f"{C_INFO}    va yana {len(keywords)-5} ta...{C_RESET}")
-        
-        print(f"{C_WARN}[*] Bu jarayon biroz vaqt olishi mumkin...{C_RESET}\n")
 
         try:
-            # waybackurls toolini ishga tushirish
-            all_urls = run_waybackurls_tool(domain, method)
-            
-            if not all_urls:
+            # Arxiv bir marta yuklanadi, keyingi rejimlar diskdagi .txt.gz dan o'qiydi
+            if archive is None:
+                print(f"\n{C_INFO}[*] waybackurls ishga tushirilmoqda → {domain}{C_RESET}")
+                print(f"{C_WARN}[*] Bu jarayon biroz vaqt olishi mumkin...{C_RESET}\n")
+                os.makedirs(REPORTS_SUBDIR, exist_ok=True)
+                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+                archive = os.path.join(REPORTS_SUBDIR, f"wayback_{domain}_all_{ts}.txt.gz")
+                stats = run_waybackurls_tool(domain, method, archive)
+                total = stats.unique if stats else 0
+                if total:
+                    print(f"{C_INFO}[*] Arxiv: {archive}{C_RESET}")
+                else:
+                    if os.path.exists(archive):
+                        os.remove(archive)
+                    archive = None
+
+            if not total:
                 print(f"{C_WARN}[!] {domain} uchun arxiv topilmadi{C_RESET}")
                 print(f"\n{C_INFO}[*] Mumkin bo'lgan sabablar:{C_RESET}")
                 print(f"    {C_INFO}→ Sayt Wayback Machine'da arxivlanmagan{C_RESET}")
@@ -391,27 +349,29 @@ def run_wayback_urls(target=""):
                 pause()
                 continue
 
-            total = len(all_urls)
             print(f"{C_OK}[+] {total} ta URL topildi!{C_RESET}\n")
 
-            # Filtrlash (grep kabi)
+            # Filtrlash (grep kabi) - bitta o'tishda filtr, kengaytma va kategoriyalar;
+            # mos URL'lar vaqtinchalik faylga yoziladi (xotirada yig'ilmaydi)
             if choice == "8":  # Barcha URL'lar
-                urls = all_urls
-                filtered_count = total
+                keywords = []
             else:
                 print(f"{C_INFO}[*] Filtrlash jarayoni...{C_RESET}")
-                urls = filter_urls(all_urls, keywords)
-                filtered_count = len(urls)
+            matched = spool()
+            summary = classify_urls(iter_archive(archive), keywords, sink=matched)
+            filtered_count = summary.count
+            if choice != "8":
                 print(f"{C_OK}[✓] {filtered_count} ta mos URL topildi{C_RESET}\n")
 
             if filtered_count == 0:
+                matched.close()
                 print(f"{C_WARN}[!] Bu kalit so'zlar bo'yicha hech narsa topilmadi{C_RESET}")
                 print(f"\n{C_INFO}[*] Tavsiyalar:{C_RESET}")
                 print(f"    {C_INFO}→ [8] Barcha URL'lar rejimini sinab ko'ring{C_RESET}")
                 print(f"    {C_INFO}→ [9] Custom Search orqali boshqa so'zlarni kiriting{C_RESET}\n")
                 
-                # Umumiy statistika
-                categories = categorize_urls(all_urls)
+                # Umumiy statistika (xuddi shu o'tishda butun arxiv bo'yicha yig'ilgan)
+                categories = summary.all_categories
                 if any(categories.values()):
                     print(f"{C_INFO}[*] Mavjud kategoriyalar:{C_RESET}")
                     for cat, count in categories.items():
@@ -423,7 +383,7 @@ def run_wayback_urls(target=""):
                 continue
 
             # Fayl kengaytmalari
-            extensions = get_file_extensions(urls)
+            extensions = summary.extensions
             if extensions:
                 print(f"{C_INFO}[*] Topilgan fayl turlari:{C_RESET}")
                 for ext, count in sorted(extensions.items(), key=lambda x: x[1], reverse=True)[:10]:
@@ -444,8 +404,8 @@ def run_wayback_urls(target=""):
             print(f"{C_TITLE}╠{'═'*w}╣{C_RESET}")
 
             # Birinchi 50 ta natija
-            display_limit = min(50, len(urls))
-            for i, url in enumerate(urls[:display_limit], 1):
+            display_limit = len(summary.sample)
+            for i, url in enumerate(summary.sample, 1):
                 short = url.replace("https://", "").replace("http://", "")
                 if len(short) > 85:
                     short = short[:82] + "..."
@@ -468,7 +428,10 @@ def run_wayback_urls(target=""):
             print(f"{C_TITLE}╚{'═'*w}╝{C_RESET}")
 
             # Hisobotni saqlash
-            save_report(domain, urls, total, filtered_count, selected_pattern, keywords)
+            with matched:
+                matched.seek(0)
+                save_report(domain, (line.rstrip('\n') for line in matched), total, summary,
+                            selected_pattern, keywords)
 
         except KeyboardInterrupt:
             print(f"\n\n{C_WARN}[!] Jarayon to'xtatildi{C_RESET}")
@@ -478,10 +441,13 @@ def run_wayback_urls(target=""):
         pause()  # Har bir skandan keyin Enter kutamiz, keyin menyuga qaytamiz
 
 
-def save_report(domain, urls, total, filtered_count, pattern, keywords):
-    """Hisobotni saqlash"""
-    # <<< YANGI USUL >>> Papka va fayl yo'lini to'g'ridan-to'g'ri yaratamiz
-    reports_dir = "reports/information_gathering/passive/waybackurls"
+def save_report(domain, urls, total, summary, pattern, keywords):
+    """
+    Hisobotni saqlash
+    urls: oqim (qatorma-qator yoziladi), summary: classify_urls() natijasi
+    """
+    filtered_count = summary.count
+    reports_dir = REPORTS_SUBDIR
     os.makedirs(reports_dir, exist_ok=True)  # Agar yo'q bo'lsa — avto yaratiladi
     
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -503,17 +469,17 @@ def save_report(domain, urls, total, filtered_count, pattern, keywords):
             f.write("\n" + "="*100 + "\n\n")
             
             # Fayl statistikasi
-            extensions = get_file_extensions(urls)
+            extensions = summary.extensions
             if extensions:
                 f.write("FAYL TURLARI STATISTIKASI:\n")
                 f.write("-" * 50 + "\n")
                 for ext, count in sorted(extensions.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (count / len(urls)) * 100
+                    percentage = (count / filtered_count) * 100
                     f.write(f"  .{ext:<10} → {count:>5} ta ({percentage:>5.1f}%)\n")
                 f.write("\n" + "="*100 + "\n\n")
             
             # URL kategoriyalari
-            categories = categorize_urls(urls)
+            categories = summary.categories
             if any(categories.values()):
                 f.write("URL KATEGORIYALARI:\n")
                 f.write("-" * 50 + "\n")
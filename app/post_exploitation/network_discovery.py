@@ -3,7 +3,7 @@
 
 import os
 import sys
-import socket
+import time
 import subprocess
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,6 +12,10 @@ sys.path.insert(0, BASE_DIR)
 from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE
 from utils import Logger, pause, InputValidator, clear_screen
 
+sys.path.insert(0, os.path.join(BASE_DIR, 'app', 'scanning', 'active'))
+from host_discovery import HostDiscovery, parse_targets, count_targets
+from tcp_scanner import TCPScanner, print_open_port, print_summary
+
 
 class Terminal:
     MARGIN = 4
@@ -92,32 +96,41 @@ class NetworkDiscovery:
                 pause()
     
     def ping_sweep(self):
-        """Ping sweep scan"""
+        """Concurrent ping sweep (ICMP / ping, TCP fallback)"""
         self.show_header()
         Logger.info("Ping Sweep Scanner")
         Terminal.print_margin()
         
-        network = input(f"{C_INFO}Enter network (e.g., 192.168.1): {C_RESET}").strip()
+        network = input(f"{C_INFO}Enter network (e.g., 192.168.1.0/24, 10.0.0.1-50, 192.168.1): {C_RESET}").strip()
         
         if not network:
             pause()
             return
         
-        Logger.info(f"Scanning {network}.0/24...")
+        try:
+            ranges = parse_targets(network)
+        except ValueError as e:
+            Logger.error(f"Invalid target: {e}")
+            pause()
+            return
+        
+        discovery = HostDiscovery()
+        method = discovery.resolve_method()
+        fallback = f" + TCP fallback ({','.join(map(str, discovery.tcp_ports))})" if method != 'tcp' else ""
+        Logger.info(f"Scanning {count_targets(ranges)} hosts via {method}{fallback} "
+                    f"@ {discovery.rate} probes/s (Ctrl+C to stop)...")
         Terminal.print_margin()
         
-        alive_hosts = []
+        def show(host):
+            via = f"{host.method}:{host.port}" if host.port else host.method
+            Logger.info(f"[+] Host is UP: {host.ip:<16} {via:<14} {host.rtt} ms")
         
-        for i in range(1, 255):
-            ip = f"{network}.{i}"
-            response = os.system(f"ping -c 1 -W 1 {ip} > /dev/null 2>&1")
-            
-            if response == 0:
-                alive_hosts.append(ip)
-                Logger.info(f"[+] Host is UP: {ip}")
+        start = time.time()
+        alive_hosts = discovery.run(ranges, on_alive=show)
         
         Terminal.print_margin()
-        Logger.info(f"Found {len(alive_hosts)} alive hosts")
+        Logger.info(f"Found {len(alive_hosts)} alive hosts "
+                    f"({discovery.probed} probed in {time.time() - start:.1f}s)")
         
         pause()
     
@@ -163,13 +176,13 @@ class NetworkDiscovery:
         
         pause()
     
-    def quick_port_scan(self):
-        """Quick port scan"""
+    def port_scan(self, ports, title):
+        """Native TCP connect scan of a host / CIDR"""
         self.show_header()
-        Logger.info("Quick Port Scanner")
+        Logger.info(title)
         Terminal.print_margin()
         
-        target = input(f"{C_INFO}Target IP: {C_RESET}").strip()
+        target = input(f"{C_INFO}Target (IP, CIDR or range): {C_RESET}").strip()
         
         if not target:
             pause()
@@ -178,43 +191,25 @@ class NetworkDiscovery:
         Logger.info(f"Scanning {target}...")
         Terminal.print_margin()
         
-        common_ports = [21, 22, 23, 25, 80, 443, 445, 3389, 8080]
-        
-        for port in common_ports:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex((target, port))
-                
-                if result == 0:
-                    Logger.info(f"[+] Port {port} is OPEN")
-                
-                sock.close()
-            except:
-                pass
-        
-        pause()
-    
-    def common_ports_scan(self):
-        """Common ports scan with nmap"""
-        self.show_header()
-        Logger.info("Common Ports Scanner")
-        Terminal.print_margin()
-        
-        target = input(f"{C_INFO}Target: {C_RESET}").strip()
-        
-        if not target:
+        try:
+            report = TCPScanner().run(target, ports, on_open=print_open_port)
+        except ValueError as e:
+            Logger.error(f"Invalid target: {e}")
             pause()
             return
         
-        Logger.info(f"Scanning {target} with nmap...")
-        Terminal.print_margin()
-        
-        cmd = f"nmap -T4 --top-ports 100 {target}"
-        os.system(cmd)
+        print_summary(report)
         
         pause()
     
+    def quick_port_scan(self):
+        """Quick port scan"""
+        self.port_scan("21,22,23,25,80,443,445,3389,8080", "Quick Port Scanner")
+    
+    def common_ports_scan(self):
+        """Common ports scan (COMMON_PORTS + WEB_PORTS + DATABASE_PORTS)"""
+        self.port_scan("common,web,database", "Common Ports Scanner")
+    
     def smb_discovery(self):
         """SMB service discovery"""
         self.show_header()
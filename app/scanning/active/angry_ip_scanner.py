@@ -9,11 +9,15 @@ import sys
 import subprocess
 import platform
 from pathlib import Path
+from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.config import C_OK, C_ERR, C_WARN, C_INFO, C_RESET
-from app.utils import Logger, CommandRunner, InputValidator, clear_screen, pause
+from app.utils import Logger, CommandRunner, InputValidator, ReportWriter, clear_screen, pause
+from host_discovery import HostDiscovery
+from tcp_scanner import TCPScanner, parse_ports, print_open_port, print_summary
 
 
 class AngryIPLauncher:
@@ -389,38 +393,53 @@ class AngryIPLauncher:
             Logger.error("Neither Zenmap nor Nmap found!")
     
     def built_in_scanner(self):
-        """Use built-in network scanner"""
-        Logger.info("Using built-in network scanner (Nmap)")
-        
-        if not CommandRunner.check_tool('nmap'):
-            Logger.error("Nmap not installed!")
-            Logger.info("Install: sudo apt install nmap")
-            return
+        """Use built-in network scanner (native asyncio, nmap not required)"""
+        Logger.info("Using built-in network scanner")
         
         print(f"\n{C_INFO}[*] Scan options:{C_RESET}")
         print(f"{C_OK}  [1]  Ping Scan (Host Discovery){C_RESET}")
-        print(f"{C_OK}  [2]  Quick Port Scan{C_RESET}")
-        print(f"{C_OK}  [3]  Full Port Scan{C_RESET}")
+        print(f"{C_OK}  [2]  Quick Port Scan (common, web, database ports){C_RESET}")
+        print(f"{C_OK}  [3]  Full Port Scan (1-65535){C_RESET}")
+        print(f"{C_OK}  [4]  Custom Ports (e.g. 22,80,8000-8100,web){C_RESET}")
         
         choice = input(f"\n{C_INFO}Choice: {C_RESET}").strip()
+        if choice not in ('1', '2', '3', '4'):
+            Logger.error("Invalid choice!")
+            return
         
         target = InputValidator.get_ip()
         if not target:
             return
         
-        if choice == '1':
-            cmd = f"nmap -sn {target}"
-        elif choice == '2':
-            cmd = f"nmap -F -T4 {target}"
-        elif choice == '3':
-            cmd = f"nmap -p- -T4 {target}"
-        else:
-            Logger.error("Invalid choice!")
+        try:
+            if choice == '1':
+                discovery = HostDiscovery()
+                Logger.info(f"Host discovery via {discovery.resolve_method()} → {target}")
+                hosts = discovery.run(target, on_alive=lambda h: Logger.success(
+                    f"Host is UP: {h.ip:<16} {h.method} {h.rtt} ms"))
+                Logger.info(f"Found {len(hosts)} alive hosts ({discovery.probed} probed)")
+                return
+            
+            if choice == '2':
+                ports = parse_ports("common,web,database")
+            elif choice == '3':
+                ports = parse_ports("all")
+            else:
+                ports = parse_ports(input(f"{C_INFO}Ports: {C_RESET}").strip())
+            
+            Logger.info(f"TCP connect scan → {target} ({len(ports)} ports, Ctrl+C to stop)")
+            report = TCPScanner().run(target, ports, on_open=print_open_port)
+        except ValueError as e:
+            # Unresolvable names / bad CIDR from get_ip() - back to the menu, not sys.exit
+            Logger.error(str(e))
             return
+        print_summary(report)
         
-        Logger.info(f"Command: {cmd}")
-        pause("Press Enter to start...")
-        os.system(cmd)
+        if report.hosts:
+            safe_target = ''.join(c if c.isalnum() else '_' for c in target)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            ReportWriter.save_json(f"tcp_scan_{safe_target}_{timestamp}", report.to_dict(),
+                                   "scanning/active/tcp_scanner")
     
     def run(self):
         """Main menu loop"""
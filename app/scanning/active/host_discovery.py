@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+ProBeSuite - Host Discovery Engine
+Concurrent ping sweep over any IPv4 CIDR / range:
+ICMP echo socket (or parallel ping subprocesses) with TCP-connect fallback,
+a global probe rate limit and live hosts streamed as they answer
+"""
+
+import os
+import sys
+import time
+import errno
+import shutil
+import socket
+import struct
+import asyncio
+import ipaddress
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from app.config import (DISCOVERY_RATE, DISCOVERY_CONCURRENCY, DISCOVERY_TIMEOUT,
+                        DISCOVERY_TCP_PORTS)
+from app.utils import DNSCache
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP_PAYLOAD = b'probesuite-sweep'
+METHODS = ('auto', 'icmp', 'ping', 'tcp')
+
+
+class LiveHost:
+    """A host that answered: how (icmp / ping / tcp / tcp-rst), RTT in ms, TCP port"""
+
+    __slots__ = ('ip', 'method', 'rtt', 'port')
+
+    def __init__(self, ip, method, rtt=None, port=None):
+        self.ip = ip
+        self.method = method
+        self.rtt = rtt
+        self.port = port
+
+    def __repr__(self):
+        return f"LiveHost({self.ip!r}, {self.method!r}, rtt={self.rtt}, port={self.port})"
+
+    def to_dict(self):
+        return {'ip': self.ip, 'method': self.method, 'rtt': self.rtt, 'port': self.port}
+
+
+# ==================== TARGETS ====================
+
+def parse_targets(spec):
+    """
+    Target spec -> list of (first, last) integer ranges
+    Accepts comma-separated: 10.0.0.0/16, 10.0.0.5, 10.0.0.1-50,
+    10.0.0.1-10.0.3.20, legacy '192.168.1' (= /24) and hostnames
+    Raises ValueError on invalid input
+    """
+    ranges = []
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        if '/' in part:
+            network = ipaddress.IPv4Network(part, strict=False)
+            first, last = int(network.network_address), int(network.broadcast_address)
+            if network.prefixlen < 31:          # skip network / broadcast addresses
+                first, last = first + 1, last - 1
+        elif '-' in part:
+            start, end = part.split('-', 1)
+            first = int(ipaddress.IPv4Address(start))
+            if '.' in end:
+                last = int(ipaddress.IPv4Address(end))
+            else:
+                # short form: last octet only (10.0.0.1-50)
+                if not end.isdigit() or int(end) > 255:
+                    raise ValueError(f"Invalid range end: {part}")
+                last = (first & 0xFFFFFF00) | int(end)
+        elif part.count('.') == 2 and part.replace('.', '').isdigit():
+            network = ipaddress.IPv4Network(f"{part}.0/24")
+            first, last = int(network.network_address) + 1, int(network.broadcast_address) - 1
+        else:
+            try:
+                first = last = int(ipaddress.IPv4Address(part))
+            except ValueError:
+                try:
+                    first = last = int(ipaddress.IPv4Address(DNSCache.gethostbyname(part)))
+                except OSError:
+                    raise ValueError(f"Cannot resolve target: {part}")
+        if last < first:
+            raise ValueError(f"Empty range: {part}")
+        ranges.append((first, last))
+    if not ranges:
+        raise ValueError("No targets given")
+    return ranges
+
+
+def count_targets(ranges):
+    return sum(last - first + 1 for first, last in ranges)
+
+
+def iter_targets(ranges):
+    """Addresses one by one - a /8 is never materialized"""
+    for first, last in ranges:
+        for value in range(first, last + 1):
+            yield str(ipaddress.IPv4Address(value))
+
+
+def parse_port_list(ports):
+    if isinstance(ports, str):
+        return [int(p) for p in ports.split(',') if p.strip().isdigit()]
+    return list(ports)
+
+
+# ==================== ICMP ====================
+
+def open_icmp_socket():
+    """
+    Non-blocking ICMP socket: (sock, raw)
+    SOCK_DGRAM works unprivileged when net.ipv4.ping_group_range allows it,
+    SOCK_RAW needs root / CAP_NET_RAW. (None, False) when neither is available.
+    """
+    for kind, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except (OSError, AttributeError):
+            continue
+        sock.setblocking(False)
+        return sock, raw
+    return None, False
+
+
+def icmp_checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def echo_request(ident, seq=1):
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + ICMP_PAYLOAD)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + ICMP_PAYLOAD
+
+
+class AsyncRateLimiter:
+    """At most `rate` probe starts per second across all coroutines (0 = unlimited)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next)
+        self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+# ==================== ENGINE ====================
+
+class HostDiscovery:
+    """
+    discovery = HostDiscovery(method='auto')
+    hosts = discovery.run("10.0.0.0/22", on_alive=print)
+
+    method: auto - ICMP socket, else ping binary, else TCP only
+    tcp_fallback: hosts silent to ICMP/ping are re-probed with TCP connect
+                  on DISCOVERY_TCP_PORTS (an RST also proves the host is up)
+    """
+
+    def __init__(self, method='auto', rate=DISCOVERY_RATE, concurrency=DISCOVERY_CONCURRENCY,
+                 timeout=DISCOVERY_TIMEOUT, tcp_ports=DISCOVERY_TCP_PORTS, tcp_fallback=True):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        self.method = method
+        self.rate = rate
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.tcp_ports = parse_port_list(tcp_ports)
+        self.tcp_fallback = tcp_fallback and bool(self.tcp_ports)
+        self.alive = []
+        self.probed = 0
+
+    def resolve_method(self):
+        if self.method != 'auto':
+            return self.method
+        sock, _ = open_icmp_socket()
+        if sock is not None:
+            sock.close()
+            return 'icmp'
+        return 'ping' if shutil.which('ping') else 'tcp'
+
+    # ---------------- probes ----------------
+
+    async def _tcp_connect(self, ip, port):
+        await self.limiter.wait()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.timeout)
+            writer.close()
+            return LiveHost(ip, 'tcp', round((loop.time() - start) * 1000, 2), port)
+        except ConnectionRefusedError:
+            return LiveHost(ip, 'tcp-rst', round((loop.time() - start) * 1000, 2), port)
+        except (OSError, asyncio.TimeoutError):
+            return None
+
+    async def _tcp_probe(self, ip):
+        """All ports at once; first answer wins, the rest are cancelled"""
+        tasks = [asyncio.ensure_future(self._tcp_connect(ip, port)) for port in self.tcp_ports]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                host = await next_done
+                if host:
+                    return host
+        finally:
+            for task in tasks:
+                task.cancel()
+        return None
+
+    async def _ping(self, ip):
+        await self.limiter.wait()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'ping', '-c', '1', '-W', str(max(1, round(self.timeout))), ip,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        except OSError:
+            return None
+        start = time.monotonic()
+        try:
+            code = await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+        return LiveHost(ip, 'ping', round((time.monotonic() - start) * 1000, 2)) if code == 0 else None
+
+    # ---------------- pipeline ----------------
+
+    def _found(self, host):
+        self.alive.append(host)
+        if self.on_alive:
+            self.on_alive(host)
+
+    def _workers(self, queue, probe, silent, count):
+        """`count` workers: take IPs from queue, run probe, pass silent ones on"""
+        async def worker():
+            while True:
+                ip = await queue.get()
+                if ip is None:
+                    return
+                host = await probe(ip)
+                if host:
+                    self._found(host)
+                elif silent is not None:
+                    await silent.put(ip)
+
+        return [asyncio.ensure_future(worker()) for _ in range(count)]
+
+    async def _icmp_sweep(self, targets, silent):
+        """One socket for all hosts: sender paced by the limiter, replies read via add_reader"""
+        sock, raw = open_icmp_socket()
+        if sock is None:
+            raise OSError(errno.EPERM, "ICMP socket not permitted")
+        loop = asyncio.get_running_loop()
+        ident = os.getpid() & 0xFFFF
+        packet = echo_request(ident)
+        pending = {}                    # ip -> send time (insertion order = send order)
+
+        def on_readable():
+            while True:
+                try:
+                    data, (ip, _) = sock.recvfrom(2048)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    continue
+                offset = (data[0] & 0x0F) * 4 if raw else 0
+                if len(data) < offset + 8 or data[offset] != ICMP_ECHO_REPLY:
+                    continue
+                # DGRAM: the kernel rewrites ident and filters replies for us
+                if raw and struct.unpack_from('!H', data, offset + 4)[0] != ident:
+                    continue
+                sent = pending.pop(ip, None)
+                if sent is not None:
+                    self._found(LiveHost(ip, 'icmp', round((loop.time() - sent) * 1000, 2)))
+
+        async def expire(until):
+            """Hosts whose reply window closed go to the TCP fallback (or are dropped)"""
+            while pending:
+                ip, sent = next(iter(pending.items()))
+                if sent + self.timeout > until:
+                    return
+                del pending[ip]
+                if silent is not None:
+                    await silent.put(ip)
+
+        loop.add_reader(sock.fileno(), on_readable)
+        try:
+            for ip in targets:
+                await self.limiter.wait()
+                while True:
+                    try:
+                        sock.sendto(packet, (ip, 0))
+                        pending[ip] = loop.time()
+                        break
+                    except (BlockingIOError, InterruptedError):
+                        await asyncio.sleep(0.005)      # socket buffer full
+                    except OSError:
+                        break                           # unreachable network etc.
+                self.probed += 1
+                if self.probed % 64 == 0:
+                    await expire(loop.time())
+            deadline = loop.time() + self.timeout
+            while pending and loop.time() < deadline:
+                await asyncio.sleep(min(0.05, self.timeout))
+            await expire(float('inf'))
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+
+    async def _sweep(self, ranges):
+        self.limiter = AsyncRateLimiter(self.rate)
+        targets = iter_targets(ranges)
+        method = self.active_method
+        tcp_workers = max(1, self.concurrency // max(1, len(self.tcp_ports)))
+        tasks = []
+
+        if method == 'tcp':
+            queue = asyncio.Queue(self.concurrency * 2)
+            tasks += self._workers(queue, self._tcp_probe, None, tcp_workers)
+            for ip in targets:
+                self.probed += 1
+                await queue.put(ip)
+            for _ in range(tcp_workers):
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+            return
+
+        silent = asyncio.Queue(self.concurrency * 2) if self.tcp_fallback else None
+        fallback = []
+        if silent is not None:
+            fallback = self._workers(silent, self._tcp_probe, None, tcp_workers)
+        try:
+            if method == 'icmp':
+                await self._icmp_sweep(targets, silent)
+            else:
+                queue = asyncio.Queue(self.concurrency * 2)
+                tasks += self._workers(queue, self._ping, silent, self.concurrency)
+                for ip in targets:
+                    self.probed += 1
+                    await queue.put(ip)
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+                await asyncio.gather(*tasks)
+            if silent is not None:
+                for _ in range(tcp_workers):
+                    await silent.put(None)
+                await asyncio.gather(*fallback)
+        finally:
+            for task in tasks + fallback:
+                task.cancel()
+
+    def run(self, spec, on_alive=None):
+        """
+        Sweep a target spec (see parse_targets) or a ready list of ranges
+        on_alive(LiveHost) is called as soon as a host answers
+        Ctrl+C stops the sweep and keeps what was found so far
+        Return: live hosts sorted by address
+        """
+        ranges = parse_targets(spec) if isinstance(spec, str) else spec
+        self.on_alive = on_alive
+        self.alive = []
+        self.probed = 0
+        self.active_method = self.resolve_method()
+        try:
+            asyncio.run(self._sweep(ranges))
+        except KeyboardInterrupt:
+            pass
+        return sorted(self.alive, key=lambda host: ipaddress.IPv4Address(host.ip))
@@ -12,6 +12,11 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from masscan_results import process_results
+
+from app.utils import DNSCache
+
 class MasscanScanner:
     def __init__(self):
         self.target = None
@@ -88,6 +93,7 @@ class MasscanScanner:
 │    [36] Enterprise Network Scan                               │
 │    [37] Subnet Discovery                                      │
 │    [38] Service Enumeration                                   │
+│    [39] Discovery + Nmap -sV (masscan → nmap handoff)         │
 │                                                               │
 │  [0]  ← Back to Active Scanning Menu                          │
 │                                                               │
@@ -108,7 +114,7 @@ class MasscanScanner:
         # Try to resolve domain
         try:
             print(f"\n\033[96m[*] Resolving domain: {target}\033[0m")
-            ip = socket.gethostbyname(target)
+            ip = DNSCache.gethostbyname(target)
             print(f"\033[92m[+] Resolved to: {ip}\033[0m")
             return ip
         except socket.gaierror:
@@ -178,8 +184,12 @@ class MasscanScanner:
         filename = f"{scan_name}_{safe_target}_{timestamp}.{format_ext}"
         return self.output_dir / filename
     
-    def execute_scan(self, command, scan_name):
-        """Execute masscan command"""
+    def execute_scan(self, command, scan_name, output_file=None, handoff=None):
+        """
+        Execute masscan command
+        output_file: -oL / -oJ file to parse afterwards
+        handoff: True - run nmap -sV on found ports, None - ask
+        """
         print(f"\n\033[93m{'='*65}\033[0m")
         print(f"\033[96m[*] EXECUTING: {scan_name}\033[0m")
         print(f"\033[93m{'='*65}\033[0m")
@@ -198,6 +208,8 @@ class MasscanScanner:
             print(f"\n\033[93m{'='*65}\033[0m")
             print(f"\033[92m[✓] Scan completed successfully in {elapsed:.2f} seconds\033[0m")
             print(f"\033[93m{'='*65}\033[0m")
+            if output_file and str(output_file).endswith(('.txt', '.json')):
+                self.process_output(output_file, handoff)
         else:
             print(f"\n\033[91m[!] Scan failed with exit code: {result}\033[0m")
             print(f"\033[93m[~] Common issues:\033[0m")
@@ -205,6 +217,24 @@ class MasscanScanner:
             print(f"  • Need sudo privileges: Run with sudo")
             print(f"  • Invalid target format")
     
+    def process_output(self, output_file, handoff=None):
+        """Parse masscan results; optionally fingerprint every host with nmap -sV"""
+        if not os.path.isfile(output_file):
+            print(f"\033[93m[~] No output file written: {output_file}\033[0m")
+            return
+        if handoff is None:
+            answer = input("[\033[94m?\033[0m] Run nmap -sV on discovered ports? (y/n): ").strip().lower()
+            handoff = answer == 'y'
+        process_results(str(output_file), nmap=handoff)
+    
+    def discovery_handoff(self):
+        """Two-stage scan: masscan discovery, then per-host nmap -sV on the open ports"""
+        output_file = self.get_output_file("handoff", "json")
+        ports = input("[\033[94m?\033[0m] Port range (default: 1-65535): ").strip() or "1-65535"
+        rate = input("[\033[94m?\033[0m] Scan rate (default: 10000 pps): ").strip() or "10000"
+        cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} -oJ {output_file}'
+        self.execute_scan(cmd, 'Discovery + Service Detection', output_file, handoff=True)
+    
     def quick_scans(self, choice):
         """Handle quick scan presets"""
         output_file = self.get_output_file("quick")
@@ -217,7 +247,7 @@ class MasscanScanner:
         
         if choice in scans:
             name, cmd = scans[choice]
-            self.execute_scan(cmd, name)
+            self.execute_scan(cmd, name, output_file)
     
     def speed_profiles(self, choice):
         """Handle different speed profiles"""
@@ -240,7 +270,7 @@ class MasscanScanner:
         ports = input("[\033[94m?\033[0m] Port range (default: 1-65535): ").strip() or "1-65535"
         cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} -oL {output_file}'
         
-        self.execute_scan(cmd, f'Speed Profile ({rate} pps)')
+        self.execute_scan(cmd, f'Speed Profile ({rate} pps)', output_file)
     
     def port_ranges(self, choice):
         """Handle specific port range scans"""
@@ -268,7 +298,7 @@ class MasscanScanner:
         rate = input("[\033[94m?\033[0m] Scan rate (default: 10000 pps): ").strip() or "10000"
         cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} -oL {output_file}'
         
-        self.execute_scan(cmd, name)
+        self.execute_scan(cmd, name, output_file)
     
     def scan_types(self, choice):
         """Handle different scan types"""
@@ -287,7 +317,7 @@ class MasscanScanner:
         if choice in scan_flags:
             name, flags = scan_flags[choice]
             cmd = f'sudo masscan {self.resolved_target} -p{ports} {flags} --rate {rate} -oL {output_file}'
-            self.execute_scan(cmd, name)
+            self.execute_scan(cmd, name, output_file)
     
     def network_ranges(self, choice):
         """Handle network range configurations"""
@@ -299,12 +329,12 @@ class MasscanScanner:
                 ports = input("[\033[94m?\033[0m] Port range: ").strip() or "1-65535"
                 rate = input("[\033[94m?\033[0m] Scan rate: ").strip() or "10000"
                 cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} --exclude {exclude} -oL {output_file}'
-                self.execute_scan(cmd, 'Scan with Exclusions')
+                self.execute_scan(cmd, 'Scan with Exclusions', output_file)
         else:
             ports = input("[\033[94m?\033[0m] Port range: ").strip() or "1-65535"
             rate = input("[\033[94m?\033[0m] Scan rate: ").strip() or "10000"
             cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} -oL {output_file}'
-            self.execute_scan(cmd, 'Network Range Scan')
+            self.execute_scan(cmd, 'Network Range Scan', output_file)
     
     def advanced_options(self, choice):
         """Handle advanced scanning options"""
@@ -316,29 +346,29 @@ class MasscanScanner:
         
         if choice == '24':
             cmd = f'{base_cmd} -p{ports} --rate {rate} --banners -oL {output_file}'
-            self.execute_scan(cmd, 'Banner Grabbing Scan')
+            self.execute_scan(cmd, 'Banner Grabbing Scan', output_file)
         
         elif choice == '25':
             retries = input("[\033[94m?\033[0m] Number of retries (default: 3): ").strip() or "3"
             cmd = f'{base_cmd} -p{ports} --rate {rate} --retries {retries} -oL {output_file}'
-            self.execute_scan(cmd, 'Scan with Retries')
+            self.execute_scan(cmd, 'Scan with Retries', output_file)
         
         elif choice == '26':
             timeout = input("[\033[94m?\033[0m] Timeout in seconds (default: 10): ").strip() or "10"
             cmd = f'{base_cmd} -p{ports} --rate {rate} --connection-timeout {timeout} -oL {output_file}'
-            self.execute_scan(cmd, 'Scan with Custom Timeout')
+            self.execute_scan(cmd, 'Scan with Custom Timeout', output_file)
         
         elif choice == '27':
             src_port = input("[\033[94m?\033[0m] Source port: ").strip()
             if src_port:
                 cmd = f'{base_cmd} -p{ports} --rate {rate} --source-port {src_port} -oL {output_file}'
-                self.execute_scan(cmd, 'Scan with Source Port')
+                self.execute_scan(cmd, 'Scan with Source Port', output_file)
         
         elif choice == '28':
             interface = input("[\033[94m?\033[0m] Network interface (e.g., eth0): ").strip()
             if interface:
                 cmd = f'{base_cmd} -p{ports} --rate {rate} -e {interface} -oL {output_file}'
-                self.execute_scan(cmd, f'Scan via {interface}')
+                self.execute_scan(cmd, f'Scan via {interface}', output_file)
         
         elif choice == '29':
             cmd = f'{base_cmd} -p{ports} --rate {rate} --offline -oL {output_file}'
@@ -361,7 +391,7 @@ class MasscanScanner:
             name, ext, flag = formats[choice]
             output_file = self.get_output_file("output", ext)
             cmd = f'sudo masscan {self.resolved_target} -p{ports} --rate {rate} {flag} {output_file}'
-            self.execute_scan(cmd, name)
+            self.execute_scan(cmd, name, output_file)
     
     def preset_scans(self, choice):
         """Handle preset comprehensive scans"""
@@ -399,7 +429,7 @@ class MasscanScanner:
                 return
             
             cmd = f"{preset['cmd']} {output_file}"
-            self.execute_scan(cmd, preset['name'])
+            self.execute_scan(cmd, preset['name'], output_file)
     
     def run(self):
         """Main scanner loop"""
@@ -437,6 +467,8 @@ class MasscanScanner:
                 self.output_formats(choice)
             elif choice in ['35', '36', '37', '38']:
                 self.preset_scans(choice)
+            elif choice == '39':
+                self.discovery_handoff()
             else:
                 print("\033[91m[!] Invalid option\033[0m")
                 time.sleep(1)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+ProBeSuite - Masscan Results Parser & Nmap Handoff
+Streams masscan list (-oL) / JSON (-oJ, -oD) output, groups open ports per host
+and fingerprints every host with a targeted `nmap -sV -p<found>` run on a
+worker pool - fast discovery, then precise service detection, one merged report
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from nmap_xml import iter_hosts
+
+from app.config import C_OK, C_WARN, C_INFO, C_TITLE, C_RESET, NMAP_TIMEOUT, NMAP_WORKERS
+from app.utils import Logger
+
+PORT_PREFIX = {'tcp': 'T', 'udp': 'U', 'sctp': 'S'}
+ROOT_ONLY = ('udp', 'sctp')         # nmap -sU / -sY need raw sockets
+ROOT_ONLY_NOTE = "not fingerprinted: nmap -sU/-sY needs root"
+
+
+# ==================== PARSER ====================
+
+def parse_list_line(line):
+    """
+    'open tcp 80 10.0.0.1 1700000000'
+    'banner tcp 80 10.0.0.1 1700000000 http Server: nginx'
+    """
+    parts = line.split(None, 6)
+    if len(parts) < 5 or not parts[2].isdigit():
+        return None
+    record = {'ip': parts[3], 'port': int(parts[2]), 'protocol': parts[1]}
+    if parts[0] == 'open':
+        return record
+    if parts[0] == 'banner' and len(parts) >= 6:
+        record['banner'] = (parts[5], parts[6] if len(parts) > 6 else '')
+        return record
+    return None
+
+
+def parse_json_line(line):
+    """
+    One -oJ / -oD object per line (trailing comma and the enclosing [ ] are skipped)
+    {"ip": "10.0.0.1", "ports": [{"port": 80, "proto": "tcp", "status": "open"}]}
+    {"ip": "10.0.0.1", "ports": [{"port": 80, "proto": "tcp", "service": {"name": ..., "banner": ...}}]}
+    """
+    try:
+        obj = json.loads(line.rstrip(','))
+    except ValueError:
+        return []
+    ip = obj.get('ip')
+    if not ip:
+        return []
+    records = []
+    for port in obj.get('ports') or []:
+        if not isinstance(port.get('port'), int):
+            continue
+        record = {'ip': ip, 'port': port['port'], 'protocol': port.get('proto', 'tcp')}
+        service = port.get('service')
+        if isinstance(service, dict):
+            record['banner'] = (service.get('name', ''), service.get('banner', ''))
+        elif port.get('status', 'open') != 'open':
+            continue
+        records.append(record)
+    return records
+
+
+def iter_masscan(path):
+    """Stream port records from a masscan output file - format detected per line"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in '#[]':
+                continue
+            if line[0] == '{':
+                yield from parse_json_line(line)
+            else:
+                record = parse_list_line(line)
+                if record:
+                    yield record
+
+
+def group_hosts(records):
+    """
+    Port records -> hosts (masscan output is not ordered by host)
+    Return: [{'address', 'ports': {(protocol, port): {'banners': {...}}}}] sorted by address
+    """
+    hosts = {}
+    for record in records:
+        host = hosts.setdefault(record['ip'], {'address': record['ip'], 'ports': {}})
+        entry = host['ports'].setdefault((record['protocol'], record['port']), {'banners': {}})
+        if 'banner' in record:
+            name, banner = record['banner']
+            if banner:
+                entry['banners'][name] = banner
+    return [hosts[ip] for ip in sorted(hosts, key=address_key)]
+
+
+def address_key(address):
+    parts = address.split('.')
+    if len(parts) == 4 and all(p.isdigit() for p in parts):
+        return (4, tuple(int(p) for p in parts))
+    return (6, address)
+
+
+# ==================== NMAP HANDOFF ====================
+
+def is_privileged():
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+
+def skipped_ports(host, privileged):
+    """Ports nmap cannot scan without root (masscan ran via sudo, nmap does not)"""
+    return set() if privileged else {key for key in host['ports'] if key[0] in ROOT_ONLY}
+
+
+def nmap_command(host, xml_path, nmap_args='-sV', privileged=None):
+    """
+    nmap -sV -Pn -n [-sS/-sT] [-sU] [-sY] -p T:..,U:.. -oX xml ip
+    Unprivileged: UDP/SCTP ports are left out; None when nothing is left
+    """
+    privileged = is_privileged() if privileged is None else privileged
+    skipped = skipped_ports(host, privileged)
+    by_protocol = {}
+    for protocol, port in host['ports']:
+        if (protocol, port) not in skipped:
+            by_protocol.setdefault(protocol, []).append(port)
+    if not by_protocol:
+        return None
+
+    command = ['nmap', *nmap_args.split(), '-Pn', '-n']
+    if 'tcp' in by_protocol and ('udp' in by_protocol or 'sctp' in by_protocol):
+        command.append('-sS' if privileged else '-sT')      # -sU alone would skip TCP ports
+    if 'udp' in by_protocol:
+        command.append('-sU')
+    if 'sctp' in by_protocol:
+        command.append('-sY')
+
+    spec = ','.join(f"{PORT_PREFIX[protocol]}:{','.join(map(str, sorted(ports)))}"
+                    for protocol, ports in sorted(by_protocol.items()) if protocol in PORT_PREFIX)
+    return command + ['-p', spec, '-oX', xml_path, host['address']]
+
+
+def merge_host(host, nmap_host=None, error=None, skipped=()):
+    """
+    masscan ports + nmap service data -> one structured host record
+    skipped: ports nmap was not run on (kept as masscan saw them, with a note)
+    """
+    services = {}
+    if nmap_host:
+        services = {(s['protocol'], s['port']): s for s in nmap_host['services']}
+
+    ports = []
+    for (protocol, port), entry in sorted(host['ports'].items(), key=lambda item: item[0][1]):
+        service = services.get((protocol, port))
+        not_scanned = (protocol, port) in skipped
+        ports.append({
+            'port': port,
+            'protocol': protocol,
+            # nmap did not see the port open again (closed / filtered by then)
+            'state': 'open' if service or not nmap_host or not_scanned else 'unconfirmed',
+            'service': service['service'] if service else next(iter(entry['banners']), ''),
+            'product': service['product'] if service else '',
+            'version': service['version'] if service else '',
+            'cpes': service['cpes'] if service else [],
+            'banners': entry['banners'],
+            'note': ROOT_ONLY_NOTE if not_scanned else '',
+        })
+    return {
+        'address': host['address'],
+        'hostnames': nmap_host['hostnames'] if nmap_host else [],
+        'ports': ports,
+        'nmap': 'ok' if nmap_host else (error or 'skipped'),
+        'note': f"{len(skipped)} UDP/SCTP port(s) {ROOT_ONLY_NOTE}" if skipped else '',
+    }
+
+
+def fingerprint_host(host, output_dir, nmap_args='-sV', timeout=NMAP_TIMEOUT):
+    """Run one targeted nmap for a host. Return: merged host record"""
+    xml_path = os.path.join(output_dir, f"nmap_{host['address'].replace(':', '_').replace('.', '_')}.xml")
+    privileged = is_privileged()
+    skipped = skipped_ports(host, privileged)
+    command = nmap_command(host, xml_path, nmap_args, privileged)
+    if command is None:
+        return merge_host(host, error='skipped (UDP/SCTP only, needs root)', skipped=skipped)
+    try:
+        process = subprocess.run(command, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return merge_host(host, error='timeout', skipped=skipped)
+    except OSError as e:
+        return merge_host(host, error=str(e), skipped=skipped)
+
+    if not os.path.isfile(xml_path):
+        return merge_host(host, error=(process.stderr or '').strip()[:200] or f"exit {process.returncode}",
+                          skipped=skipped)
+    try:
+        nmap_host = next((h for h in iter_hosts(xml_path) if h['address'] == host['address']), None)
+    except ET.ParseError as e:
+        return merge_host(host, error=f"invalid XML: {e}", skipped=skipped)
+    # nmap ran but reported nothing open: every scanned masscan port is unconfirmed
+    return merge_host(host, nmap_host or {'hostnames': [], 'services': []}, skipped=skipped)
+
+
+def handoff(hosts, output_dir, workers=NMAP_WORKERS, nmap_args='-sV', on_host=None):
+    """
+    One nmap per host, hosts sharded across `workers` processes
+    on_host(record) is called as each host finishes
+    Without nmap the masscan data (ports + banners) is returned as is
+    """
+    if not shutil.which('nmap'):
+        Logger.warning("nmap not found - results contain masscan data only")
+        return [merge_host(host, error='nmap not installed') for host in hosts]
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = [pool.submit(fingerprint_host, host, output_dir, nmap_args) for host in hosts]
+    try:
+        for future in as_completed(futures):
+            record = future.result()
+            results.append(record)
+            if on_host:
+                on_host(record)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return sorted(results, key=lambda record: address_key(record['address']))
+
+
+# ==================== REPORT ====================
+
+def print_host(record):
+    """Live line per fingerprinted host"""
+    color = C_OK if record['nmap'] == 'ok' else C_WARN
+    labels = [f"{p['port']}/{p['protocol']} {(p['product'] + ' ' + p['version']).strip() or p['service']}".strip()
+              for p in record['ports'] if p['state'] == 'open']
+    print(f"  {color}[{record['nmap']}]{C_RESET} {C_INFO}{record['address']:<16}{C_RESET} {', '.join(labels)}")
+
+
+def print_table(report):
+    print(f"\n{C_TITLE}{'='*80}")
+    print("MASSCAN → NMAP SERVICE DETECTION")
+    print(f"{'='*80}{C_RESET}")
+
+    for host in report['hosts']:
+        names = f" ({', '.join(host['hostnames'])})" if host['hostnames'] else ""
+        print(f"\n{C_INFO}[HOST] {host['address']}{names}{C_RESET}")
+        if host['note']:
+            print(f"  {C_WARN}[!] {host['note']}{C_RESET}")
+        print(f"  {'PORT':<12}{'STATE':<13}{'SERVICE':<14}VERSION")
+        for port in host['ports']:
+            color = C_OK if port['state'] == 'open' else C_WARN
+            version = f"{port['product']} {port['version']}".strip()
+            if not version and port['banners']:
+                version = next(iter(port['banners'].values()))[:60]
+            elif not version and port['note']:
+                version = f"({port['note']})"
+            print(f"  {color}{str(port['port']) + '/' + port['protocol']:<12}{port['state']:<13}"
+                  f"{port['service'][:13]:<14}{version}{C_RESET}")
+
+    print(f"\n{C_OK}[✓] {len(report['hosts'])} host(s), {report['open_ports']} open port(s), "
+          f"{report['nmap_runs']} nmap run(s) in {report['elapsed']}s{C_RESET}")
+
+
+def process_results(masscan_file, output_base=None, nmap=True, workers=NMAP_WORKERS, nmap_args='-sV'):
+    """
+    Parse a masscan output file, optionally hand every host to nmap -sV,
+    print the table and save <output_base>_services.json
+    """
+    if not os.path.isfile(masscan_file):
+        Logger.error(f"Masscan output not found: {masscan_file}")
+        return None
+
+    start = time.time()
+    hosts = group_hosts(iter_masscan(masscan_file))
+    open_ports = sum(len(host['ports']) for host in hosts)
+    Logger.info(f"Masscan: {open_ports} open port(s) on {len(hosts)} host(s)")
+    if not hosts:
+        return None
+
+    output_base = output_base or os.path.splitext(masscan_file)[0]
+    if nmap:
+        Logger.info(f"Running nmap {nmap_args} on {len(hosts)} host(s) with {workers} worker(s)...")
+        records = handoff(hosts, f"{output_base}_nmap", workers, nmap_args, on_host=print_host)
+    else:
+        records = [merge_host(host) for host in hosts]
+
+    report = {
+        'masscan_file': masscan_file,
+        'hosts': records,
+        'open_ports': open_ports,
+        'nmap_runs': sum(1 for record in records if record['nmap'] == 'ok'),
+        'elapsed': round(time.time() - start, 2),
+    }
+    print_table(report)
+
+    json_file = f"{output_base}_services.json"
+    with open(json_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"{C_INFO}[*] Service report: {json_file}{C_RESET}")
+    return report
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        process_results(path)
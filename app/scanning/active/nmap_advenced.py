@@ -7,10 +7,14 @@ Professional port scanning with comprehensive options
 import os
 import sys
 import time
+import shlex
 import subprocess
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from nmap_xml import has_service_detection, correlate_and_report
+
 class NmapScanner:
     def __init__(self):
         self.target = None
@@ -145,6 +149,12 @@ class NmapScanner:
         print(f"\n\033[93m{'='*65}\033[0m")
         print(f"\033[96m[*] EXECUTING: {scan_name}\033[0m")
         print(f"\033[93m{'='*65}\033[0m")
+        # Service scans also write XML so detected versions can be matched to CVEs
+        xml_file = None
+        if has_service_detection(command) and '-oX' not in command:
+            xml_file = f"{self.get_output_file('services')}.xml"
+            command = f"{command} -oX {shlex.quote(xml_file)}"
+        
         print(f"\n\033[96m[+] Target:\033[0m {self.target}")
         print(f"\033[96m[+] Command:\033[0m {command}")
         print(f"\n\033[93m[*] Scanning in progress...\033[0m\n")
@@ -156,6 +166,10 @@ class NmapScanner:
         print(f"\n\033[93m{'='*65}\033[0m")
         print(f"\033[92m[✓] Scan completed in {elapsed:.2f} seconds\033[0m")
         print(f"\033[93m{'='*65}\033[0m")
+        
+        if xml_file and os.path.isfile(xml_file):
+            print(f"\n\033[96m[*] Correlating services with CVEs...\033[0m")
+            correlate_and_report(xml_file)
     
     def basic_scans(self, choice):
         """Handle basic scanning options"""
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+ProBeSuite - Nmap XML Service Parser
+Streams nmap -oX results and correlates detected services with CVEs
+"""
+
+import os
+import sys
+import json
+import time
+import xml.etree.ElementTree as ET
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'app'))
+
+from app.config import C_OK, C_ERR, C_WARN, C_INFO, C_TITLE, C_RESET
+from app.utils import Logger
+
+SERVICE_FLAGS = ('-sV', '-A')
+
+
+def has_service_detection(command):
+    """Does the nmap command produce product/version data?"""
+    args = command.split() if isinstance(command, str) else command
+    return any(flag in args for flag in SERVICE_FLAGS)
+
+
+def parse_cpe(cpe, fallback_version=''):
+    """
+    nmap CPE 2.2 URI -> (vendor, product, version)
+    'cpe:/a:apache:http_server:2.4.49' -> ('apache', 'http_server', '2.4.49')
+    The service version only fills in application CPEs (never OS/hardware ones).
+    """
+    fields = cpe.split(':')
+    if len(fields) < 4 or not fields[2] or not fields[3]:
+        return None
+    if len(fields) > 4 and fields[4]:
+        version = fields[4]
+    else:
+        version = fallback_version if fields[1] == '/a' else ''
+    return fields[2].lower(), fields[3].lower(), version
+
+
+def iter_hosts(xml_path):
+    """
+    Stream <host> elements (iterparse) - memory stays flat for -p- / large ranges
+    Yield: {'address', 'hostnames', 'services': [{'port', 'protocol', 'service',
+            'product', 'version', 'cpes'}]} - open ports only
+    """
+    context = ET.iterparse(xml_path, events=('start', 'end'))
+    _, root = next(context)
+
+    for event, elem in context:
+        if event != 'end' or elem.tag != 'host':
+            continue
+
+        addresses = {a.get('addrtype'): a.get('addr') for a in elem.findall('address')}
+        host = {
+            'address': addresses.get('ipv4') or addresses.get('ipv6') or addresses.get('mac'),
+            'hostnames': [h.get('name') for h in elem.findall('hostnames/hostname')],
+            'services': [],
+        }
+
+        for port in elem.findall('ports/port'):
+            state = port.find('state')
+            if state is None or state.get('state') != 'open':
+                continue
+            service = port.find('service')
+            service = service if service is not None else ET.Element('service')
+            host['services'].append({
+                'port': int(port.get('portid')),
+                'protocol': port.get('protocol'),
+                'service': service.get('name', ''),
+                'product': service.get('product', ''),
+                'version': service.get('version', ''),
+                'cpes': [c.text for c in service.findall('cpe') if c.text],
+            })
+
+        yield host
+        elem.clear()
+        root.clear()
+
+
+def service_keys(service):
+    """(vendor, product, version) tuples usable for CVE lookup - versionless CPEs are skipped"""
+    keys = []
+    for cpe in service['cpes']:
+        key = parse_cpe(cpe, service['version'])
+        if key and key[2]:
+            keys.append(key)
+    return keys
+
+
+def lookup_services(xml_path, checker=None):
+    """
+    First streaming pass: collect every service key and correlate them in one batch
+    Return: {(vendor, product, version): [result, ...]}
+    """
+    keys = {key for host in iter_hosts(xml_path) for service in host['services']
+            for key in service_keys(service)}
+    if not keys:
+        return {}
+
+    if checker is None:
+        from vulnerability.cve_checker import CVEChecker
+        checker = CVEChecker()
+    if not checker.store:
+        Logger.warning("Offline NVD mirror not imported - services saved without CVEs")
+        return {key: [] for key in keys}
+    return checker.correlate(keys)
+
+
+def correlate(xml_path, matches):
+    """
+    Second streaming pass: yield hosts with 'cves' attached to every service
+    (highest CVSS v3 first) - only one host is held in memory at a time
+    """
+    score = lambda c: c['cvss_v3'] if c['cvss_v3'] != 'N/A' else -1
+    for host in iter_hosts(xml_path):
+        for service in host['services']:
+            cves = {}
+            for key in service_keys(service):
+                for result in matches.get(key, []):
+                    cves[result['cve_id']] = {
+                        'cve_id': result['cve_id'],
+                        'cvss_v3': result['cvss_v3']['score'],
+                        'severity': result['cvss_v3']['severity'],
+                    }
+            service['cves'] = sorted(cves.values(), key=score, reverse=True)
+        yield host
+
+
+def print_header():
+    """Correlation table title"""
+    print(f"\n{C_TITLE}{'='*80}")
+    print("SERVICE → CVE CORRELATION")
+    print(f"{'='*80}{C_RESET}")
+
+
+def print_host(host, limit=5):
+    """Vulnerability table of one host"""
+    if not host['services']:
+        return
+    names = f" ({', '.join(host['hostnames'])})" if host['hostnames'] else ""
+    print(f"\n{C_INFO}[HOST] {host['address']}{names}{C_RESET}")
+    print(f"  {'PORT':<10}{'SERVICE':<32}{'CVEs':<6}TOP")
+
+    for service in host['services']:
+        label = f"{service['product']} {service['version']}".strip() or service['service']
+        cves = service.get('cves', [])
+        top = ', '.join(f"{c['cve_id']} ({c['cvss_v3']})" for c in cves[:limit])
+        color = C_ERR if cves and cves[0]['severity'] == 'CRITICAL' else C_WARN if cves else C_OK
+        print(f"  {color}{str(service['port']) + '/' + service['protocol']:<10}"
+              f"{label[:30]:<32}{len(cves):<6}{top}{C_RESET}")
+
+
+def correlate_and_report(xml_path, output_base=None):
+    """
+    Correlate, print the table and save <output_base>_cves.json
+    Hosts are printed and written one at a time as the XML is streamed
+    Return: summary dict (without the hosts) / None
+    """
+    if not os.path.isfile(xml_path):
+        Logger.error(f"XML output not found: {xml_path}")
+        return None
+
+    start = time.time()
+    json_file = f"{output_base or os.path.splitext(xml_path)[0]}_cves.json"
+    summary = {'scan_file': xml_path, 'services': 0, 'correlated_products': 0, 'total_cves': 0}
+    try:
+        matches = lookup_services(xml_path)
+        summary['correlated_products'] = len(matches)
+
+        print_header()
+        with open(json_file, 'w') as f:
+            f.write('{\n  "hosts": [')
+            for i, host in enumerate(correlate(xml_path, matches)):
+                print_host(host)
+                summary['services'] += len(host['services'])
+                summary['total_cves'] += sum(len(s['cves']) for s in host['services'])
+                f.write((',' if i else '') + '\n    ' + json.dumps(host))
+            summary['elapsed'] = round(time.time() - start, 2)
+            f.write('\n  ],\n' + json.dumps(summary, indent=2)[2:])
+    except ET.ParseError as e:
+        Logger.error(f"Invalid nmap XML: {e}")
+        return None
+
+    print(f"\n{C_OK}[✓] {summary['services']} service(s), {summary['correlated_products']} product(s), "
+          f"{summary['total_cves']} CVE match(es){C_RESET}")
+    print(f"{C_INFO}[*] CVE report: {json_file} ({summary['elapsed']}s){C_RESET}")
+    return summary
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        correlate_and_report(path)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+ProBeSuite - Native TCP Connect Scanner
+asyncio connect() scan over CIDR / range targets and port specs, no nmap needed.
+The number of in-flight connects adapts to the network: it grows while
+probes are answered and shrinks when answers turn into timeouts; connect
+timeouts follow per-host RTT estimates (RFC 6298 style).
+"""
+
+import os
+import sys
+import time
+import errno
+import socket
+import struct
+import asyncio
+from itertools import islice
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import (C_OK, C_INFO, C_WARN, C_TITLE, C_RESET, COMMON_PORTS, WEB_PORTS,
+                        DATABASE_PORTS, TCP_SCAN_CONCURRENCY, TCP_SCAN_MAX_CONCURRENCY,
+                        TCP_SCAN_TIMEOUT)
+from host_discovery import parse_targets, count_targets, iter_targets, AsyncRateLimiter
+
+try:
+    import resource
+except ImportError:             # Windows
+    resource = None
+
+PORT_SETS = {
+    'common': COMMON_PORTS,
+    'web': WEB_PORTS,
+    'database': DATABASE_PORTS,
+    'db': DATABASE_PORTS,
+}
+
+HOST_GROUP = 256            # hosts scanned side by side (ports interleaved across them)
+MIN_CONCURRENCY = 16
+MIN_TIMEOUT = 0.2
+DROP_THRESHOLD = 0.25       # share of timeouts (while others answer) that shrinks the window
+# Local resource exhaustion - not a property of the target, retry after backing off
+LOCAL_ERRORS = {errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.EADDRNOTAVAIL, errno.EAGAIN}
+LINGER_RST = struct.pack('ii', 1, 0)    # close() sends RST: no TIME_WAIT pile-up
+
+
+def parse_ports(spec):
+    """
+    '22,80,8000-8100', '-' / 'all' (1-65535) and the named config sets
+    'common', 'web', 'database' - mixable: 'web,database,3389'
+    Open-ended ranges follow nmap: '-1024' = 1-1024, '60000-' = 60000-65535
+    Returns a sorted list; raises ValueError on invalid input
+    """
+    ports = set()
+    for part in str(spec).replace(' ', '').lower().split(','):
+        if not part:
+            continue
+        if part == 'all':
+            part = '-'
+        if part in PORT_SETS:
+            ports.update(parse_ports(PORT_SETS[part]))
+            continue
+        start, dash, end = part.partition('-')
+        start = start or ('1' if dash else '')
+        end = end or ('65535' if dash else start)
+        if not start.isdigit() or not end.isdigit():
+            raise ValueError(f"Invalid port: {part}")
+        first, last = int(start), int(end)
+        if not 1 <= first <= last <= 65535:
+            raise ValueError(f"Port out of range: {part}")
+        ports.update(range(first, last + 1))
+    if not ports:
+        raise ValueError("No ports given")
+    return sorted(ports)
+
+
+_services = {}
+
+
+def service_name(port):
+    if port not in _services:
+        try:
+            _services[port] = socket.getservbyport(port, 'tcp')
+        except OSError:
+            _services[port] = ''
+    return _services[port]
+
+
+class PortResult:
+    """One open port: address, port, connect RTT (ms) and the IANA service name"""
+
+    __slots__ = ('ip', 'port', 'state', 'rtt', 'service')
+
+    def __init__(self, ip, port, state, rtt=None):
+        self.ip = ip
+        self.port = port
+        self.state = state
+        self.rtt = rtt
+        self.service = service_name(port)
+
+    def __repr__(self):
+        return f"PortResult({self.ip!r}, {self.port}, {self.state!r}, rtt={self.rtt})"
+
+    def to_dict(self):
+        return {'ip': self.ip, 'port': self.port, 'state': self.state,
+                'rtt': self.rtt, 'service': self.service}
+
+
+class ScanReport:
+    """Open ports grouped by host + counters for every attempt"""
+
+    def __init__(self, targets=0, ports=0):
+        self.hosts = {}
+        self.targets = targets
+        self.ports = ports
+        self.attempts = 0
+        self.closed = 0
+        self.filtered = 0
+        self.peak_concurrency = 0
+        self.elapsed = 0.0
+
+    def add(self, result):
+        self.hosts.setdefault(result.ip, []).append(result)
+
+    @property
+    def open(self):
+        return sum(len(ports) for ports in self.hosts.values())
+
+    def sorted_hosts(self):
+        """[(ip, [PortResult, ...]), ...] by address / port"""
+        return [(ip, sorted(self.hosts[ip], key=lambda r: r.port))
+                for ip in sorted(self.hosts, key=lambda ip: socket.inet_aton(ip))]
+
+    def rate(self):
+        return self.attempts / self.elapsed * 60 if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'targets': self.targets, 'ports': self.ports, 'attempts': self.attempts,
+            'open': self.open, 'closed': self.closed, 'filtered': self.filtered,
+            'elapsed': round(self.elapsed, 2), 'attempts_per_minute': round(self.rate()),
+            'hosts': {ip: [r.to_dict() for r in ports] for ip, ports in self.sorted_hosts()},
+        }
+
+
+class RTTEstimator:
+    """Smoothed RTT / variance of answered connects for one host"""
+
+    __slots__ = ('srtt', 'rttvar')
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+
+    def update(self, rtt):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    def timeout(self, default):
+        if self.srtt is None:
+            return default
+        return min(default, max(MIN_TIMEOUT, self.srtt + 4 * self.rttvar))
+
+
+class AdaptiveWindow:
+    """
+    Congestion window for in-flight connects (AIMD)
+    answer: +1 below ssthresh (slow start), then +1/cwnd
+    too many timeouts while other probes are answered, or local
+    socket exhaustion: multiplicative decrease
+    A completely silent (filtered) range is not treated as congestion.
+    """
+
+    def __init__(self, initial, maximum, period):
+        self.maximum = maximum
+        self.cwnd = float(min(initial, maximum))
+        self.ssthresh = float(maximum)
+        self.period = period
+        self.replies = 0
+        self.drops = 0
+        self.window_start = time.monotonic()
+
+    def on_reply(self):
+        self.replies += 1
+        if self.cwnd < self.ssthresh:
+            self.cwnd = min(self.maximum, self.cwnd + 1)
+        else:
+            self.cwnd = min(self.maximum, self.cwnd + 1 / self.cwnd)
+        self._check()
+
+    def on_timeout(self):
+        self.drops += 1
+        self._check()
+
+    def on_local_error(self):
+        self.cwnd = self.ssthresh = max(MIN_CONCURRENCY, self.cwnd / 2)
+
+    def _check(self):
+        now = time.monotonic()
+        if now - self.window_start < self.period:
+            return
+        if self.replies and self.drops / (self.replies + self.drops) > DROP_THRESHOLD:
+            self.cwnd = self.ssthresh = max(MIN_CONCURRENCY, self.cwnd * 0.7)
+        self.replies = self.drops = 0
+        self.window_start = now
+
+
+def fd_limit():
+    """Max sockets we may hold at once (leave room for files / stdio)"""
+    if resource is None:
+        return TCP_SCAN_MAX_CONCURRENCY
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return TCP_SCAN_MAX_CONCURRENCY
+    return max(MIN_CONCURRENCY, soft - 64)
+
+
+class TCPScanner:
+    """
+    scanner = TCPScanner()
+    report = scanner.run("10.0.0.0/24", "common,web", on_open=print)
+    for ip, ports in report.sorted_hosts(): ...
+
+    adaptive=False: fixed `concurrency` and `timeout`
+    rate: max connect attempts per second (0 = only the window limits)
+    """
+
+    def __init__(self, concurrency=TCP_SCAN_CONCURRENCY, max_concurrency=TCP_SCAN_MAX_CONCURRENCY,
+                 timeout=TCP_SCAN_TIMEOUT, rate=0, adaptive=True):
+        self.max_concurrency = max(MIN_CONCURRENCY, min(max_concurrency, fd_limit()))
+        self.concurrency = max(1, min(concurrency, self.max_concurrency))
+        self.timeout = timeout
+        self.rate = rate
+        self.adaptive = adaptive
+
+    async def _connect(self, ip, port, estimator):
+        loop = asyncio.get_running_loop()
+        timeout = estimator.timeout(self.timeout) if self.adaptive else self.timeout
+        for _ in range(3):
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            except OSError as e:
+                if e.errno not in LOCAL_ERRORS:
+                    raise
+                self.window.on_local_error()
+                await asyncio.sleep(0.05)
+                continue
+            sock.setblocking(False)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+            start = loop.time()
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+                return 'open', loop.time() - start
+            except ConnectionRefusedError:
+                return 'closed', loop.time() - start
+            except asyncio.TimeoutError:
+                return 'filtered', None
+            except OSError as e:
+                if e.errno not in LOCAL_ERRORS:
+                    return 'filtered', None     # unreachable host / network
+                self.window.on_local_error()
+                await asyncio.sleep(0.05)
+            finally:
+                sock.close()
+        return 'filtered', None
+
+    async def _probe(self, ip, port, estimator):
+        state, rtt = await self._connect(ip, port, estimator)
+        report = self.report
+        report.attempts += 1
+        if rtt is not None:
+            estimator.update(rtt)
+            if self.adaptive:
+                self.window.on_reply()
+        elif self.adaptive:
+            self.window.on_timeout()
+        if state == 'open':
+            result = PortResult(ip, port, state, round(rtt * 1000, 2))
+            report.add(result)
+            if self.on_open:
+                self.on_open(result)
+        elif state == 'closed':
+            report.closed += 1
+        else:
+            report.filtered += 1
+
+    async def _scan(self, ranges, ports):
+        loop = asyncio.get_running_loop()
+        limiter = AsyncRateLimiter(self.rate)
+        self.window = AdaptiveWindow(self.concurrency,
+                                     self.max_concurrency if self.adaptive else self.concurrency,
+                                     self.timeout)
+        slot = asyncio.Event()
+        pending = set()
+
+        def finished(task):
+            pending.discard(task)
+            slot.set()
+
+        hosts = iter_targets(ranges)
+        try:
+            while True:
+                group = list(islice(hosts, HOST_GROUP))
+                if not group:
+                    break
+                estimators = {ip: RTTEstimator() for ip in group}
+                # Ports outer, hosts inner: load is spread across the group
+                for port in ports:
+                    for ip in group:
+                        while len(pending) >= int(self.window.cwnd):
+                            slot.clear()
+                            await slot.wait()
+                        await limiter.wait()
+                        task = loop.create_task(self._probe(ip, port, estimators[ip]))
+                        pending.add(task)
+                        task.add_done_callback(finished)
+                        if len(pending) > self.report.peak_concurrency:
+                            self.report.peak_concurrency = len(pending)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def run(self, targets, ports, on_open=None):
+        """
+        targets: spec string (CIDR, range, IP, hostname - see parse_targets) or ranges
+        ports: spec string (see parse_ports) or an iterable of ints
+        on_open(PortResult) is called for every open port as it is found
+        Ctrl+C stops the scan and keeps the results so far
+        """
+        ranges = parse_targets(targets) if isinstance(targets, str) else targets
+        ports = parse_ports(ports) if isinstance(ports, str) else sorted(set(ports))
+        self.on_open = on_open
+        self.report = ScanReport(count_targets(ranges), len(ports))
+        start = time.monotonic()
+        try:
+            asyncio.run(self._scan(ranges, ports))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.report.elapsed = time.monotonic() - start
+        return self.report
+
+
+def print_open_port(result):
+    """on_open callback for interactive scans"""
+    print(f"  {C_OK}[+]{C_RESET} {result.ip:<16} {C_OK}{result.port:>5}/tcp{C_RESET}  "
+          f"{result.service:<16} {C_INFO}{result.rtt} ms{C_RESET}")
+
+
+def print_summary(report):
+    print(f"\n{C_TITLE}{'=' * 64}{C_RESET}")
+    for ip, ports in report.sorted_hosts():
+        listing = ', '.join(f"{r.port}/{r.service}" if r.service else str(r.port) for r in ports)
+        print(f"  {C_OK}{ip:<16}{C_RESET} {listing}")
+    if not report.hosts:
+        print(f"  {C_WARN}No open ports found{C_RESET}")
+    print(f"{C_TITLE}{'=' * 64}{C_RESET}")
+    print(f"  {C_INFO}Hosts x ports :{C_RESET} {report.targets} x {report.ports}")
+    print(f"  {C_INFO}Attempts      :{C_RESET} {report.attempts} "
+          f"({report.open} open, {report.closed} closed, {report.filtered} filtered)")
+    print(f"  {C_INFO}Elapsed       :{C_RESET} {report.elapsed:.1f}s "
+          f"(~{report.rate():,.0f} attempts/min, peak {report.peak_concurrency} in flight)")
@@ -1,18 +1,49 @@
 #!/usr/bin/env python3
 # app/utils.py - ProbeSuite Utilities
 import os
+import sys
 import subprocess
+import threading
 import json
 import shutil
 import re
+import time
+import socket
+import asyncio
+import itertools
+import ipaddress
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from app.config import C_OK, C_ERR, C_WARN, C_INFO, C_RESET, REPORTS_DIR
+    from app.config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRIES,
+                            HTTP_BACKOFF, HTTP_RETRY_STATUSES, MAX_THREADS, MAX_HOST_THREADS)
+    from app.config import (DNS_NAMESERVERS, DNS_TIMEOUT, DNS_CONCURRENCY, DNS_CACHE_MAX_TTL,
+                            DNS_CACHE_NEGATIVE_TTL, DNS_CACHE_DEFAULT_TTL, DNS_CACHE_FAILURE_TTL,
+                            DNS_CACHE_MAX_ENTRIES)
 except ImportError:
     # Fallback agar import ishlamasa
     from config import C_OK, C_ERR, C_WARN, C_INFO, C_RESET, REPORTS_DIR
+    from config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRIES,
+                        HTTP_BACKOFF, HTTP_RETRY_STATUSES, MAX_THREADS, MAX_HOST_THREADS)
+    from config import (DNS_NAMESERVERS, DNS_TIMEOUT, DNS_CONCURRENCY, DNS_CACHE_MAX_TTL,
+                        DNS_CACHE_NEGATIVE_TTL, DNS_CACHE_DEFAULT_TTL, DNS_CACHE_FAILURE_TTL,
+                        DNS_CACHE_MAX_ENTRIES)
+
+try:
+    import dns.resolver
+    import dns.asyncresolver
+    import dns.exception
+    import dns.nameserver
+except ImportError:
+    dns = None
+
+# Modullar "utils" va "app.utils" deb import qiladi - ikkalasi bitta modul
+# bo'lishi kerak, aks holda shared HTTP pool ikki marta yaratiladi
+sys.modules.setdefault('utils', sys.modules[__name__])
+sys.modules.setdefault('app.utils', sys.modules[__name__])
 
 
 class Logger:
@@ -104,6 +135,508 @@ class CommandRunner:
             return -1
 
 
+class HTTPClient:
+    """
+    Shared pooled HTTP client factory
+
+    Barcha modullar bitta HTTPAdapter (connection pool) dan foydalanadi:
+    keep-alive ulanishlar va TLS sessiyalar modullar orasida qayta ishlatiladi.
+    Har bir modul o'z Session'ini oladi (headers/cookies alohida).
+    session.close() umumiy pool'ni yopmaydi - buni faqat HTTPClient.close() qiladi.
+    """
+
+    _adapter = None
+    _session_class = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_adapter():
+        """Process bo'yicha yagona HTTPAdapter (tuned pool + retry/backoff)"""
+        if HTTPClient._adapter is None:
+            with HTTPClient._lock:
+                if HTTPClient._adapter is None:
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    retry = Retry(
+                        total=HTTP_RETRIES,
+                        connect=HTTP_RETRIES,
+                        read=0,  # read timeout qayta yuborilmaydi (time-based testlar buziladi)
+                        status=HTTP_RETRIES,
+                        backoff_factor=HTTP_BACKOFF,
+                        status_forcelist=HTTP_RETRY_STATUSES,
+                        respect_retry_after_header=True,
+                        raise_on_status=False,
+                    )
+                    HTTPClient._adapter = HTTPAdapter(
+                        pool_connections=HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=HTTP_POOL_MAXSIZE,
+                        pool_block=True,  # per-host cap: ortiqcha ulanish ochmasdan kutadi
+                        max_retries=retry,
+                    )
+        return HTTPClient._adapter
+
+    @staticmethod
+    def session(headers=None):
+        """
+        Shared pool'ga ulangan yangi requests.Session
+        headers: session headerlari (masalan config.HEADERS)
+        """
+        import requests
+        import urllib3
+
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        if HTTPClient._session_class is None:
+            class SharedPoolSession(requests.Session):
+                """close() (va with-blok) faqat o'z adapterlarini yopadi, umumiy pool'ni emas"""
+
+                def close(self):
+                    for adapter in self.adapters.values():
+                        if adapter is not HTTPClient._adapter:
+                            adapter.close()
+
+            HTTPClient._session_class = SharedPoolSession
+
+        session = HTTPClient._session_class()
+        adapter = HTTPClient.get_adapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    @staticmethod
+    def close():
+        """Pool'dagi barcha ulanishlarni yopish"""
+        with HTTPClient._lock:
+            if HTTPClient._adapter is not None:
+                HTTPClient._adapter.close()
+                HTTPClient._adapter = None
+
+
+def parse_nameserver(spec):
+    """'8.8.8.8', '127.0.0.1:5353', '[::1]:53' -> (ip, port)"""
+    spec = spec.strip()
+    if spec.startswith('['):
+        ip, _, port = spec[1:].partition(']')
+        port = port.lstrip(':')
+    elif spec.count(':') == 1:
+        ip, port = spec.split(':')
+    else:
+        ip, port = spec, ''
+    return ip, int(port) if port.isdigit() else 53
+
+
+class DNSCache:
+    """
+    Process-wide DNS kesh (TTL hisobga olinadi)
+
+    Target oladigan modullar nomlarni shu yerdan oladi: bitta domen ro'yxati ustida
+    bir nechta modul ishlasa ham har bir nom bir marta so'raladi.
+    Resolver javob bermasa xato DNS_CACHE_FAILURE_TTL ga keshlanadi. Ketma-ket javobsiz
+    qolgan nameserver shu vaqtga chetlatiladi; hammasi chetlatilsa getaddrinfo ishlatiladi.
+    install() (ixtiyoriy) socket.getaddrinfo ni ham keshga yo'naltiradi.
+
+    DNSCache.gethostbyname("example.com")          # socket.gethostbyname o'rniga
+    DNSCache.resolve("example.com")                # ['93.184.216.34', ...]
+    DNSCache.query("example.com", "MX")            # rdata ro'yxati
+    DNSCache.resolve_many(domains)                 # async bulk -> {nom: [ip, ...]}
+    DNSCache.set_nameservers(["127.0.0.1:5353"])   # qat'iy nameserverlar
+    """
+
+    _cache = {}                 # (nom, rdtype) -> (tugash vaqti, records); records=None - xato
+    _lock = threading.Lock()
+    _pool = ThreadPoolExecutor(max_workers=4)       # sync A + AAAA parallel
+    _failures = {}              # nameserver -> ketma-ket javobsiz so'rovlar (circuit breaker)
+    _down_until = {}            # nameserver -> chetlatilgan vaqt oxiri
+    _nameservers = list(DNS_NAMESERVERS)
+    _servers = None             # Do53Nameserver ro'yxati (sozlangan yoki tizimniki)
+    _resolvers = {}             # (async, tirik nameserverlar) -> resolver
+    _hosts = None
+    _original_getaddrinfo = None
+
+    # ---------------- resolverlar ----------------
+
+    @staticmethod
+    def _load_servers():
+        """Sozlangan (yoki tizim) nameserverlari - har biri o'z porti bilan"""
+        if DNSCache._nameservers:
+            return [dns.nameserver.Do53Nameserver(*parse_nameserver(ns)) for ns in DNSCache._nameservers]
+        system = dns.resolver.Resolver()
+        return [dns.nameserver.Do53Nameserver(ns, system.port) if isinstance(ns, str) else ns
+                for ns in system.nameservers]
+
+    @staticmethod
+    def _get_resolver(asynchronous=False):
+        """
+        Tirik nameserverlar uchun dnspython resolveri
+        dnspython yo'q, sozlanmagan yoki hamma nameserver chetlatilgan bo'lsa None
+        """
+        if dns is None:
+            return None
+        if DNSCache._servers is None:
+            try:
+                DNSCache._servers = DNSCache._load_servers()
+            except dns.resolver.NoResolverConfiguration:
+                return None
+        now = time.monotonic()
+        live = [ns for ns in DNSCache._servers if DNSCache._down_until.get(str(ns), 0) <= now]
+        if not live:
+            return None
+        key = (asynchronous, tuple(str(ns) for ns in live))
+        resolver = DNSCache._resolvers.get(key)
+        if resolver is None:
+            module = dns.asyncresolver if asynchronous else dns.resolver
+            resolver = module.Resolver(configure=False)
+            resolver.nameservers = live
+            resolver.timeout = DNS_TIMEOUT
+            resolver.lifetime = DNS_TIMEOUT
+            DNSCache._resolvers[key] = resolver
+        return resolver
+
+    @staticmethod
+    def set_nameservers(nameservers):
+        """Qat'iy nameserverlar (['1.1.1.1', '127.0.0.1:5353']); bo'sh - tizim resolveri"""
+        with DNSCache._lock:
+            DNSCache._nameservers = list(nameservers or [])
+            DNSCache._servers = None
+            DNSCache._resolvers, DNSCache._failures, DNSCache._down_until = {}, {}, {}
+            DNSCache._cache.clear()
+
+    @staticmethod
+    def clear():
+        with DNSCache._lock:
+            DNSCache._cache.clear()
+
+    @staticmethod
+    def _hosts_file():
+        """/etc/hosts dagi nomlar - ular DNS'ga yuborilmaydi"""
+        if DNSCache._hosts is None:
+            path = os.path.join(os.environ.get('SystemRoot', 'C:\\Windows'), 'System32', 'drivers', 'etc', 'hosts') \
+                if os.name == 'nt' else '/etc/hosts'
+            names = set()
+            try:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    for line in f:
+                        names.update(name.lower() for name in line.split('#')[0].split()[1:])
+            except OSError:
+                pass
+            DNSCache._hosts = names
+        return DNSCache._hosts
+
+    # ---------------- kesh ----------------
+
+    @staticmethod
+    def _key(name, rdtype):
+        return name.lower().rstrip('.'), rdtype.upper()
+
+    _MISS = object()
+
+    @staticmethod
+    def _get(key):
+        """Keshdagi records (None - keshlangan xato) yoki _MISS"""
+        entry = DNSCache._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return DNSCache._MISS
+
+    @staticmethod
+    def _prune(now):
+        """Muddati o'tganlarni, keyin eng eskilarini o'chirib 90% gacha tushirish (lock ichida)"""
+        cache = DNSCache._cache
+        for key in [key for key, entry in cache.items() if entry[0] <= now]:
+            del cache[key]
+        excess = len(cache) - DNS_CACHE_MAX_ENTRIES * 9 // 10
+        for key in list(itertools.islice(cache, max(0, excess))):
+            del cache[key]
+
+    @staticmethod
+    def _store(key, records, ttl):
+        if ttl > 0:
+            now = time.monotonic()
+            with DNSCache._lock:
+                if len(DNSCache._cache) >= DNS_CACHE_MAX_ENTRIES:
+                    DNSCache._prune(now)
+                DNSCache._cache.pop(key, None)          # qayta yozilgan kalit oxiriga o'tadi
+                DNSCache._cache[key] = (now + min(ttl, DNS_CACHE_MAX_TTL), records)
+        return records
+
+    @staticmethod
+    def _success(answer):
+        """Javob bergan nameserverning xatolar hisobi nolga tushadi"""
+        DNSCache._failures.pop(str(dns.nameserver.Do53Nameserver(answer.nameserver, answer.port)), None)
+
+    @staticmethod
+    def _failure(key, error):
+        """
+        Xato keshlanadi va nameserverlar bo'yicha hisoblanadi
+        Faqat javob bermaganlar (timeout, tarmoq xatosi) sanaladi - SERVFAIL qaytargan server tirik.
+        Ketma-ket 3 so'rovda javobsiz qolgan server DNS_CACHE_FAILURE_TTL ga chetlatiladi.
+        """
+        # errors: [(nameserver, tcp, port, xato, javob), ...] - har bir urinish uchun
+        errors = getattr(error, 'kwargs', {}).get('errors') or []
+        answered = {server for server, _, _, _, response in errors if response is not None}
+        silent = {server for server, _, _, _, response in errors if response is None} - answered
+        now = time.monotonic()
+        with DNSCache._lock:
+            for server in answered:
+                DNSCache._failures.pop(server, None)
+            for server in silent:
+                DNSCache._failures[server] = DNSCache._failures.get(server, 0) + 1
+                if DNSCache._failures[server] >= 3:
+                    DNSCache._down_until[server] = now + DNS_CACHE_FAILURE_TTL
+        return DNSCache._store(key, None, DNS_CACHE_FAILURE_TTL)
+
+    @staticmethod
+    def _answer(key, resolve):
+        """resolve() natijasini keshlash. NXDOMAIN/NoAnswer - negativ kesh, xato - None"""
+        try:
+            answer = resolve()
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return DNSCache._store(key, [], DNS_CACHE_NEGATIVE_TTL)
+        except dns.exception.DNSException as e:
+            return DNSCache._failure(key, e)
+        DNSCache._success(answer)
+        return DNSCache._store(key, list(answer), answer.rrset.ttl)
+
+    @staticmethod
+    def query(name, rdtype='A'):
+        """
+        Keshlangan DNS so'rov -> rdata ro'yxati ([] - yozuv yo'q)
+        Resolver xatosi (timeout, SERVFAIL) yoki dnspython yo'q bo'lsa None
+        """
+        key = DNSCache._key(name, rdtype)
+        records = DNSCache._get(key)
+        if records is not DNSCache._MISS:
+            return records
+        resolver = DNSCache._get_resolver()
+        if resolver is None:
+            return None
+        return DNSCache._answer(key, lambda: resolver.resolve(key[0], key[1], search=False))
+
+    @staticmethod
+    async def aquery(name, rdtype='A'):
+        """query() ning async varianti (dns.asyncresolver)"""
+        key = DNSCache._key(name, rdtype)
+        records = DNSCache._get(key)
+        if records is not DNSCache._MISS:
+            return records
+        resolver = DNSCache._get_resolver(asynchronous=True)
+        if resolver is None:
+            return None
+        try:
+            answer = await resolver.resolve(key[0], key[1], search=False)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return DNSCache._store(key, [], DNS_CACHE_NEGATIVE_TTL)
+        except dns.exception.DNSException as e:
+            return DNSCache._failure(key, e)
+        DNSCache._success(answer)
+        return DNSCache._store(key, list(answer), answer.rrset.ttl)
+
+    # ---------------- manzillar ----------------
+
+    @staticmethod
+    def _direct(name):
+        """IP, nuqtasiz nom (search domain, mDNS) yoki hosts fayli - DNS orqali emas"""
+        try:
+            ipaddress.ip_address(name)
+            return True
+        except ValueError:
+            pass
+        return '.' not in name.rstrip('.') or name.lower() in DNSCache._hosts_file()
+
+    @staticmethod
+    def _fallback(name, family):
+        """getaddrinfo (TTL noma'lum - DNS_CACHE_DEFAULT_TTL)"""
+        key = DNSCache._key(name, f'GAI{int(family)}')
+        records = DNSCache._get(key)
+        if records is not DNSCache._MISS:
+            return records or []
+        getaddrinfo = DNSCache._original_getaddrinfo or socket.getaddrinfo
+        try:
+            infos = getaddrinfo(name, None, family, socket.SOCK_STREAM)
+        except socket.gaierror:
+            return DNSCache._store(key, [], DNS_CACHE_NEGATIVE_TTL)
+        except OSError:
+            return DNSCache._store(key, None, DNS_CACHE_FAILURE_TTL) or []
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return DNSCache._store(key, addresses, DNS_CACHE_DEFAULT_TTL)
+
+    @staticmethod
+    def _addresses(name, family=socket.AF_UNSPEC):
+        """A (+AAAA) manzillar, IPv4 avval. Resolver ishlamasa None"""
+        types = []
+        if family in (socket.AF_UNSPEC, socket.AF_INET):
+            types.append('A')
+        if family in (socket.AF_UNSPEC, socket.AF_INET6):
+            types.append('AAAA')
+        # AAAA boshqa threadda - ikkala so'rov bir vaqtda kutiladi
+        pending = [DNSCache._pool.submit(DNSCache.query, name, rdtype) for rdtype in types[1:]]
+        answers = [DNSCache.query(name, types[0])] + [future.result() for future in pending]
+        addresses, failed = [], False
+        for records in answers:
+            if records is None:
+                failed = True
+            else:
+                addresses.extend(record.to_text() for record in records
+                                 if record.rdtype in (1, 28))       # CNAME zanjiri tashlanadi
+        return None if failed and not addresses else addresses
+
+    @staticmethod
+    def resolve(name, family=socket.AF_UNSPEC):
+        """Nom -> IP manzillar ro'yxati ([] - topilmadi)"""
+        name = name.strip()
+        if DNSCache._direct(name):
+            return DNSCache._fallback(name, family)
+        addresses = DNSCache._addresses(name, family)
+        return DNSCache._fallback(name, family) if addresses is None else addresses
+
+    @staticmethod
+    def gethostbyname(name):
+        """socket.gethostbyname o'rniga: birinchi IPv4 yoki socket.gaierror"""
+        addresses = DNSCache.resolve(name, socket.AF_INET)
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"Name or service not known: {name}")
+        return addresses[0]
+
+    @staticmethod
+    async def aresolve(name, family=socket.AF_UNSPEC):
+        """resolve() ning async varianti ([] - topilmadi)"""
+        name = name.strip()
+        loop = asyncio.get_running_loop()
+        if DNSCache._direct(name):
+            return await loop.run_in_executor(None, DNSCache._fallback, name, family)
+        types = ['A', 'AAAA'] if family == socket.AF_UNSPEC else ['A' if family == socket.AF_INET else 'AAAA']
+        answers = await asyncio.gather(*(DNSCache.aquery(name, rdtype) for rdtype in types))
+        if all(records is None for records in answers):
+            return await loop.run_in_executor(None, DNSCache._fallback, name, family)
+        return [record.to_text() for records in answers for record in records or []
+                if record.rdtype in (1, 28)]
+
+    @staticmethod
+    async def aresolve_many(names, rdtype='A', concurrency=DNS_CONCURRENCY):
+        """Ko'p nomni bir vaqtda keshga olish -> {nom: [ip/rdata matni, ...]}"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results = {}
+
+        async def one(name):
+            async with semaphore:
+                if rdtype in ('A', 'AAAA') and DNSCache._direct(name):
+                    family = socket.AF_INET if rdtype == 'A' else socket.AF_INET6
+                    loop = asyncio.get_running_loop()
+                    results[name] = await loop.run_in_executor(None, DNSCache._fallback, name, family)
+                    return
+                records = await DNSCache.aquery(name, rdtype)
+                if records is None and rdtype in ('A', 'AAAA'):
+                    # resolver ishlamadi - getaddrinfo orqali
+                    family = socket.AF_INET if rdtype == 'A' else socket.AF_INET6
+                    loop = asyncio.get_running_loop()
+                    results[name] = await loop.run_in_executor(None, DNSCache._fallback, name, family)
+                    return
+                results[name] = [record.to_text() for record in records or []
+                                 if rdtype not in ('A', 'AAAA') or record.rdtype in (1, 28)]
+
+        names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        await asyncio.gather(*(one(name) for name in names))
+        return results
+
+    @staticmethod
+    def resolve_many(names, rdtype='A', concurrency=DNS_CONCURRENCY):
+        """aresolve_many ning sinxron varianti (ishlab turgan event loop ichida emas)"""
+        return asyncio.run(DNSCache.aresolve_many(names, rdtype, concurrency))
+
+    # ---------------- socket.getaddrinfo ----------------
+
+    @staticmethod
+    def install():
+        """
+        socket.getaddrinfo ni keshlangan variant bilan almashtirish (ixtiyoriy, bir marta)
+        Butun jarayonga ta'sir qiladi - faqat bulk ishlar uchun aniq chaqiriladi
+        """
+        if DNSCache._original_getaddrinfo is not None:
+            return
+        original = DNSCache._original_getaddrinfo = socket.getaddrinfo
+
+        def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+            name = host.decode('idna') if isinstance(host, bytes) else host
+            if not name or flags & socket.AI_NUMERICHOST or DNSCache._direct(name):
+                return original(host, port, family, type, proto, flags)
+            addresses = DNSCache._addresses(name, family)
+            if addresses is None:
+                return original(host, port, family, type, proto, flags)
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            results = []
+            for address in addresses:
+                results.extend(original(address, port, family, type, proto, flags | socket.AI_NUMERICHOST))
+            return results
+
+        socket.getaddrinfo = getaddrinfo
+
+
+class ProbeEngine:
+    """
+    Bounded work-queue for HTTP probes
+
+    jobs: [(group, host, item), ...] - group odatda parametr nomi
+    probe(item) -> natija (xato bo'lsa None)
+    confirm(natija) -> True bo'lsa group tasdiqlangan, qolgan probelari bekor qilinadi
+
+    Bitta hostga MAX_HOST_THREADS dan ortiq parallel so'rov yuborilmaydi.
+    Natija deterministik: har bir group uchun eng kichik indeksdagi hit qaytadi.
+    """
+
+    def __init__(self, workers=MAX_THREADS, per_host=MAX_HOST_THREADS):
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        """Host uchun semaphore (per-host cap)"""
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def run(self, jobs, probe, confirm=bool):
+        """
+        Joblarni parallel ishlatish
+        Return: [(group, item, result), ...] - har group uchun bitta hit, job tartibida
+        """
+        jobs = list(jobs)
+        hits = {}
+
+        def superseded(idx, group):
+            with self._lock:
+                return group in hits and hits[group] < idx
+
+        def task(idx, group, host, item):
+            if superseded(idx, group):
+                return None
+            with self._slot(host):
+                if superseded(idx, group):
+                    return None
+                try:
+                    result = probe(item)
+                except Exception:
+                    return None
+            if result is None or not confirm(result):
+                return None
+            with self._lock:
+                if group not in hits or idx < hits[group]:
+                    hits[group] = idx
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs) or 1)) as pool:
+            futures = [pool.submit(task, idx, *job) for idx, job in enumerate(jobs)]
+            results = [f.result() for f in futures]
+
+        return [(jobs[idx][0], jobs[idx][2], results[idx])
+                for idx in sorted(hits.values())]
+
+
 class URLValidator:
     """URL validation"""
     
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# app/vulnerability/cpe_index.py - CPE version-range index over the offline NVD mirror
+
+import re
+import bisect
+import threading
+
+ANY_VERSION = ('*', '-', '')
+VERSION_TOKEN = re.compile(r'\d+|[a-z]+')
+
+
+def version_key(version):
+    """
+    Comparable key for a version string: '2.4.49' < '2.4.50' < '2.10'
+    Numeric parts compare as numbers, alphabetic parts as text.
+    """
+    return tuple((1, int(part)) if part.isdigit() else (0, part)
+                 for part in VERSION_TOKEN.findall(str(version).lower()))
+
+
+class ProductIndex:
+    """
+    All vulnerable cpeMatch entries of one vendor:product
+
+    exact  - {version_key: {cve_id}} for entries naming one version
+    ranges - (start_key, start_inclusive, end_key, end_inclusive, cve_id),
+             sorted by start so a lookup only walks ranges that start at or
+             below the queried version
+    """
+
+    def __init__(self, rows):
+        self.exact = {}
+        self.ranges = []
+        self.all = set()
+
+        for cve_id, version, start_inc, start_exc, end_inc, end_exc in rows:
+            self.all.add(cve_id)
+            if version not in ANY_VERSION and not (start_inc or start_exc or end_inc or end_exc):
+                self.exact.setdefault(version_key(version), set()).add(cve_id)
+                continue
+            start = start_inc or start_exc
+            end = end_inc or end_exc
+            self.ranges.append((
+                version_key(start) if start else (),
+                not start_exc,
+                version_key(end) if end else None,
+                bool(end_inc),
+                cve_id,
+            ))
+
+        self.ranges.sort(key=lambda r: r[0])
+        self.starts = [r[0] for r in self.ranges]
+
+    def lookup(self, version):
+        """CVE ids whose exact version or range covers `version` (all of them if no version)"""
+        if not version or version in ANY_VERSION:
+            return set(self.all)
+
+        key = version_key(version)
+        found = set(self.exact.get(key, ()))
+
+        for start, start_inclusive, end, end_inclusive, cve_id in self.ranges[:bisect.bisect_right(self.starts, key)]:
+            if start == key and not start_inclusive:
+                continue
+            if end is None or key < end or (key == end and end_inclusive):
+                found.add(cve_id)
+        return found
+
+
+class CPEIndex:
+    """
+    vendor:product -> interval lists, built from NVDStore.cpe_matches
+
+    Each product is loaded with one indexed query the first time it is asked
+    for and kept in memory, so correlating a whole nmap run costs one query
+    per distinct product rather than one per service.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._products = {}
+        self._lock = threading.Lock()
+
+    def product(self, vendor, product):
+        key = (vendor.lower(), product.lower())
+        with self._lock:
+            if key not in self._products:
+                rows = self.store.conn.execute(
+                    "SELECT cve_id, version, start_including, start_excluding, end_including, end_excluding "
+                    "FROM cpe_matches WHERE vendor = ? AND product = ? AND vulnerable = 1", key).fetchall()
+                self._products[key] = ProductIndex([tuple(row) for row in rows])
+            return self._products[key]
+
+    def lookup(self, vendor, product, version=None):
+        """Which CVEs affect vendor:product at this version? -> sorted CVE ids"""
+        return sorted(self.product(vendor, product).lookup(version))
+
+    def lookup_many(self, services):
+        """
+        Batch lookup
+        services: iterable of (vendor, product, version) tuples
+        Return: {(vendor, product, version): [cve_id, ...]}
+        """
+        results = {}
+        for vendor, product, version in services:
+            key = (vendor, product, version)
+            if key not in results:
+                results[key] = self.lookup(vendor, product, version)
+        return results
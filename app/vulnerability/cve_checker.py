@@ -1,23 +1,30 @@
 #!/usr/bin/env python3
 # app/vulnerability/cve_checker.py - CVE Database Lookup
 
-import requests
 import sys
 import os
 import json
+import glob
+import time
 from datetime import datetime
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, BASE_DIR)
 
 from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REQUEST_TIMEOUT
-from utils import Logger, pause, clear_screen, InputValidator, ReportWriter
+from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, HTTPClient
+from vulnerability.nvd_store import NVDStore
+from vulnerability.cpe_index import CPEIndex
 
 class CVEChecker:
     def __init__(self):
         self.nvd_api = "https://services.nvd.nist.gov/rest/json/cves/2.0"
         self.cvedetails_api = "https://www.cvedetails.com/json-feed.php"
         self.results = []
+        self.session = HTTPClient.session()
+        # Offline mirror is used whenever it has been imported
+        self.store = NVDStore() if NVDStore.available() else None
+        self.index = CPEIndex(self.store) if self.store else None
     
     def run(self):
         """Main CVE checker"""
@@ -31,10 +38,18 @@ class CVEChecker:
         print(f"  Keyword: apache, windows, ssh")
         print(f"  Product: apache/http_server, microsoft/windows\n")
         
+        if self.store:
+            stats = self.store.stats()
+            print(f"{C_OK}Offline mirror: {stats['cves']} CVEs (modified up to {stats['last_modified']}){C_RESET}\n")
+        else:
+            print(f"{C_WARN}Offline mirror: not imported (using live NVD API){C_RESET}\n")
+        
         print(f"{C_INFO}Search Options:{C_RESET}")
         print(f"  [1] Search by CVE ID")
         print(f"  [2] Search by keyword")
         print(f"  [3] Search by product/version")
+        print("  [4] Import NVD feed files (offline mirror)")
+        print("  [5] Update offline mirror (modified since last import)")
         print(f"  [0] Back\n")
         
         choice = InputValidator.get_choice()
@@ -47,6 +62,10 @@ class CVEChecker:
             self.search_by_keyword()
         elif choice == '3':
             self.search_by_product()
+        elif choice == '4':
+            self.import_feeds()
+        elif choice == '5':
+            self.update_mirror()
         else:
             Logger.error("Invalid choice!")
             pause()
@@ -71,10 +90,18 @@ class CVEChecker:
         
         Logger.info(f"Searching for {cve_id}...")
         
+        if self.store:
+            result = self.store.get(cve_id)
+            if result:
+                self.results.append(result)
+                Logger.success(f"Found CVE: {cve_id} (offline mirror)")
+                return
+            Logger.info("Not in offline mirror, asking NVD API...")
+        
         try:
             # Try NVD API
             url = f"{self.nvd_api}?cveId={cve_id}"
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
@@ -114,12 +141,24 @@ class CVEChecker:
             return
         
         Logger.info(f"Searching for vulnerabilities related to '{keyword}'...")
+        
+        if self.store:
+            for result in self.store.search(keyword):
+                result['description'] = result['description'][:200] + '...'
+                self.results.append(result)
+            
+            if self.results:
+                Logger.success(f"Retrieved {len(self.results)} CVEs (offline mirror)")
+            else:
+                Logger.warning(f"No vulnerabilities found for '{keyword}'")
+            return
+        
         Logger.warning("This may take a few moments...")
         
         try:
             # Use NVD API with keyword
             url = f"{self.nvd_api}?keywordSearch={keyword}&resultsPerPage=10"
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -165,6 +204,19 @@ class CVEChecker:
         
         Logger.info(f"Searching for {vendor}/{product} vulnerabilities...")
         
+        if self.store:
+            # Version ranges (versionStart*/versionEnd*) are matched too
+            found = self.store.get_many(self.index.lookup(vendor, product, version))
+            for result in sorted(found.values(), key=lambda r: r['published'], reverse=True):
+                result['description'] = result['description'][:200] + '...'
+                self.results.append(result)
+            
+            if self.results:
+                Logger.success(f"Retrieved {len(self.results)} CVEs (offline mirror)")
+            else:
+                Logger.warning(f"No vulnerabilities found for {vendor}/{product}")
+            return
+        
         try:
             # Build CPE string
             cpe = f"cpe:2.3:a:{vendor}:{product}"
@@ -172,7 +224,7 @@ class CVEChecker:
                 cpe += f":{version}"
             
             url = f"{self.nvd_api}?cpeName={cpe}&resultsPerPage=10"
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -203,6 +255,70 @@ class CVEChecker:
         except Exception as e:
             Logger.error(f"Search failed: {e}")
     
+    def correlate(self, services):
+        """
+        Bulk service -> CVE correlation against the offline mirror
+        services: iterable of (vendor, product, version) tuples (e.g. every service of an nmap run)
+        Return: {(vendor, product, version): [result, ...]} - highest CVSS v3 first
+        """
+        if not self.store:
+            raise RuntimeError("Offline mirror is empty - import the NVD feed files first")
+        
+        matches = self.index.lookup_many(services)
+        details = self.store.get_many(cve_id for ids in matches.values() for cve_id in ids)
+        score = lambda r: r['cvss_v3']['score'] if r['cvss_v3']['score'] != 'N/A' else -1
+        
+        return {service: sorted((details[cve_id] for cve_id in ids if cve_id in details), key=score, reverse=True)
+                for service, ids in matches.items()}
+    
+    def import_feeds(self):
+        """Load NVD JSON feed files into the offline mirror"""
+        clear_screen()
+        print(f"\n{C_TITLE}═══ IMPORT NVD FEEDS ═══{C_RESET}\n")
+        print(f"{C_INFO}Feeds: https://nvd.nist.gov/vuln/data-feeds (nvdcve-*.json / .json.gz){C_RESET}\n")
+        
+        path = input(f"{C_INFO}Feed file or directory: {C_RESET}").strip()
+        if os.path.isdir(path):
+            feeds = sorted(glob.glob(os.path.join(path, '*.json')) + glob.glob(os.path.join(path, '*.json.gz')))
+        elif os.path.isfile(path):
+            feeds = [path]
+        else:
+            Logger.error("File not found!")
+            return
+        
+        if not feeds:
+            Logger.error("No feed files found!")
+            return
+        
+        store = self.store or NVDStore()
+        for feed in feeds:
+            start = time.time()
+            try:
+                count = store.import_feed(feed)
+                Logger.success(f"{os.path.basename(feed)}: {count} CVEs ({time.time() - start:.1f}s)")
+            except Exception as e:
+                Logger.error(f"{os.path.basename(feed)}: import failed: {e}")
+        
+        self.store = store
+        Logger.info(f"Mirror: {store.stats()}")
+    
+    def update_mirror(self):
+        """Fetch CVEs modified since the newest record in the mirror"""
+        if not self.store:
+            Logger.error("Offline mirror is empty - import the NVD feed files first")
+            return
+        
+        Logger.info(f"Fetching changes since {self.store.last_modified()}...")
+        
+        def progress(done, total):
+            Logger.info(f"{min(done, total)}/{total}")
+        
+        try:
+            count = self.store.update(self.session, on_page=progress)
+            Logger.success(f"Mirror updated: {count} CVEs added/changed")
+        except Exception as e:
+            Logger.error(f"Update failed: {e}")
+    
     def extract_cvss_v3(self, vuln):
         """Extract CVSS v3 score"""
         try:
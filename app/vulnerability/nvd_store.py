@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# app/vulnerability/nvd_store.py - Offline NVD mirror (SQLite + FTS5)
+
+import sys
+import os
+import gzip
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BASE_DIR)
+
+from config import NVD_DB, NVD_API_KEY, REQUEST_TIMEOUT
+
+NVD_API = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+API_PAGE_SIZE = 2000
+API_MAX_DAYS = 120          # NVD limit for a lastModified window
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cves (
+    id TEXT PRIMARY KEY,
+    published TEXT,
+    last_modified TEXT,
+    description TEXT,
+    cvss_v3_score REAL,
+    cvss_v3_severity TEXT,
+    cvss_v3_vector TEXT,
+    cvss_v2_score REAL,
+    cvss_v2_severity TEXT,
+    refs TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cve_text USING fts5(cve_id UNINDEXED, description);
+CREATE TABLE IF NOT EXISTS cpe_matches (
+    cve_id TEXT NOT NULL,
+    part TEXT,
+    vendor TEXT NOT NULL,
+    product TEXT NOT NULL,
+    version TEXT,
+    criteria TEXT,
+    vulnerable INTEGER,
+    start_including TEXT,
+    start_excluding TEXT,
+    end_including TEXT,
+    end_excluding TEXT
+);
+CREATE INDEX IF NOT EXISTS cpe_product ON cpe_matches (vendor, product);
+CREATE INDEX IF NOT EXISTS cpe_cve ON cpe_matches (cve_id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _timestamp(value):
+    """'2021-12-10T10:15Z' / '2021-12-10T10:15:09.143' -> '2021-12-10T10:15:09'"""
+    value = (value or '').rstrip('Z')[:19]
+    return value + ':00' if len(value) == 16 else value
+
+
+def _from_legacy(item):
+    """NVD 1.1 feed item (CVE_Items) -> API 2.0 'cve' shape"""
+    cve = item.get('cve', {})
+    impact = item.get('impact', {})
+    metrics = {}
+
+    v3 = impact.get('baseMetricV3')
+    if v3:
+        metrics['cvssMetricV31'] = [{'cvssData': v3.get('cvssV3', {})}]
+    v2 = impact.get('baseMetricV2')
+    if v2:
+        metrics['cvssMetricV2'] = [{'cvssData': v2.get('cvssV2', {}), 'baseSeverity': v2.get('severity')}]
+
+    def convert(nodes):
+        out = []
+        for node in nodes:
+            out.append({'cpeMatch': [dict(m, criteria=m.get('cpe23Uri', '')) for m in node.get('cpe_match', [])]})
+            out.extend(convert(node.get('children', [])))
+        return out
+
+    return {
+        'id': cve.get('CVE_data_meta', {}).get('ID'),
+        'published': item.get('publishedDate'),
+        'lastModified': item.get('lastModifiedDate'),
+        'descriptions': [{'lang': d.get('lang'), 'value': d.get('value')}
+                         for d in cve.get('description', {}).get('description_data', [])],
+        'metrics': metrics,
+        'references': [{'url': r.get('url')} for r in cve.get('references', {}).get('reference_data', [])],
+        'configurations': [{'nodes': convert(item.get('configurations', {}).get('nodes', []))}],
+    }
+
+
+def iter_feed(path):
+    """Yield API 2.0 'cve' dicts from a 1.1 or 2.0 feed file (.json / .json.gz)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if 'vulnerabilities' in data:
+        for entry in data['vulnerabilities']:
+            yield entry['cve']
+    else:
+        for item in data.get('CVE_Items', []):
+            yield _from_legacy(item)
+
+
+def parse_cpe(criteria):
+    """cpe:2.3:a:vendor:product:version:... -> (part, vendor, product, version)"""
+    fields = criteria.split(':')
+    if len(fields) < 6:
+        return None
+    return fields[2], fields[3], fields[4], fields[5]
+
+
+class NVDStore:
+    """
+    Local NVD mirror
+
+    cves        - one row per CVE (scores, description, references)
+    cve_text    - FTS5 index over descriptions (keyword search)
+    cpe_matches - every cpeMatch entry keyed on (vendor, product), version
+                  range bounds kept as-is for range matching
+    meta        - newest lastModified seen (start of the next update)
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path=NVD_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def available(path=NVD_DB):
+        """Is there an imported mirror on disk?"""
+        if not os.path.isfile(path):
+            return False
+        try:
+            with sqlite3.connect(path) as conn:
+                return conn.execute("SELECT 1 FROM cves LIMIT 1").fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------- import ----------------
+
+    @staticmethod
+    def _row(cve):
+        metrics = cve.get('metrics', {})
+        v3 = (metrics.get('cvssMetricV31') or metrics.get('cvssMetricV30') or [{}])[0].get('cvssData', {})
+        v2_metric = (metrics.get('cvssMetricV2') or [{}])[0]
+        v2 = v2_metric.get('cvssData', {})
+        descriptions = cve.get('descriptions', [])
+        description = next((d['value'] for d in descriptions if d.get('lang') == 'en'),
+                           descriptions[0]['value'] if descriptions else '')
+        return (
+            cve['id'], _timestamp(cve.get('published')), _timestamp(cve.get('lastModified')), description,
+            v3.get('baseScore'), v3.get('baseSeverity'), v3.get('vectorString'),
+            v2.get('baseScore'), v2_metric.get('baseSeverity'),
+            json.dumps([ref['url'] for ref in cve.get('references', []) if ref.get('url')]),
+        )
+
+    @staticmethod
+    def _cpe_rows(cve):
+        rows = []
+        for config in cve.get('configurations', []):
+            for node in config.get('nodes', []):
+                for match in node.get('cpeMatch', []):
+                    parsed = parse_cpe(match.get('criteria', ''))
+                    if not parsed:
+                        continue
+                    rows.append((cve['id'], *parsed, match['criteria'], int(bool(match.get('vulnerable', True))),
+                                 match.get('versionStartIncluding'), match.get('versionStartExcluding'),
+                                 match.get('versionEndIncluding'), match.get('versionEndExcluding')))
+        return rows
+
+    def import_cves(self, cves):
+        """
+        Upsert CVEs (a newer lastModified replaces the stored record)
+        Return: number of CVEs written
+        """
+        written = 0
+        newest = self.last_modified() or ''
+
+        with self._lock, self.conn:
+            for cve in cves:
+                if not cve.get('id'):
+                    continue
+                row = self._row(cve)
+                stored = self.conn.execute("SELECT rowid, last_modified FROM cves WHERE id = ?",
+                                           (row[0],)).fetchone()
+                if stored and stored[1] and stored[1] > row[2]:
+                    continue
+
+                # cve_text shares the rowid of cves, so replacing stays an indexed lookup
+                if stored:
+                    rowid = stored[0]
+                    self.conn.execute("DELETE FROM cve_text WHERE rowid = ?", (rowid,))
+                    self.conn.execute("DELETE FROM cpe_matches WHERE cve_id = ?", (row[0],))
+                    self.conn.execute("UPDATE cves SET published = ?, last_modified = ?, description = ?, "
+                                      "cvss_v3_score = ?, cvss_v3_severity = ?, cvss_v3_vector = ?, "
+                                      "cvss_v2_score = ?, cvss_v2_severity = ?, refs = ? WHERE rowid = ?",
+                                      row[1:] + (rowid,))
+                else:
+                    rowid = self.conn.execute("INSERT INTO cves VALUES (?,?,?,?,?,?,?,?,?,?)", row).lastrowid
+                self.conn.execute("INSERT INTO cve_text (rowid, cve_id, description) VALUES (?, ?, ?)",
+                                  (rowid, row[0], row[3]))
+                self.conn.executemany("INSERT INTO cpe_matches VALUES (?,?,?,?,?,?,?,?,?,?,?)", self._cpe_rows(cve))
+
+                newest = max(newest, row[2])
+                written += 1
+
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_modified', ?)", (newest,))
+        return written
+
+    def import_feed(self, path):
+        """Import one NVD JSON feed file (1.1 or 2.0, optionally gzipped)"""
+        return self.import_cves(iter_feed(path))
+
+    def last_modified(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_modified'").fetchone()
+        return row[0] if row else None
+
+    def update(self, session, since=None, on_page=None):
+        """
+        Incremental update from the NVD API: everything modified since the
+        newest record in the mirror (or `since`), in 120-day windows
+        Return: number of CVEs written
+        """
+        since = since or self.last_modified()
+        if not since:
+            raise ValueError("Mirror is empty - import the NVD feed files first")
+        start = datetime.fromisoformat(since)
+        now = datetime.utcnow()
+        headers = {'apiKey': NVD_API_KEY} if NVD_API_KEY else {}
+        delay = 0.6 if NVD_API_KEY else 6          # NVD public rate limit
+        written = 0
+
+        while start < now:
+            end = min(start + timedelta(days=API_MAX_DAYS), now)
+            index = 0
+            while True:
+                params = {
+                    'lastModStartDate': start.strftime('%Y-%m-%dT%H:%M:%S.000'),
+                    'lastModEndDate': end.strftime('%Y-%m-%dT%H:%M:%S.000'),
+                    'resultsPerPage': API_PAGE_SIZE,
+                    'startIndex': index,
+                }
+                response = session.get(NVD_API, params=params, headers=headers, timeout=REQUEST_TIMEOUT * 6)
+                response.raise_for_status()
+                data = response.json()
+
+                written += self.import_cves(entry['cve'] for entry in data.get('vulnerabilities', []))
+                index += data.get('resultsPerPage', 0)
+                if on_page:
+                    on_page(index, data.get('totalResults', 0))
+                time.sleep(delay)
+                if not data.get('resultsPerPage') or index >= data.get('totalResults', 0):
+                    break
+            start = end
+
+        return written
+
+    # ---------------- lookups ----------------
+
+    @staticmethod
+    def _result(row):
+        return {
+            'cve_id': row['id'],
+            'description': row['description'],
+            'published': row['published'],
+            'lastModified': row['last_modified'],
+            'cvss_v3': {'score': row['cvss_v3_score'] if row['cvss_v3_score'] is not None else 'N/A',
+                        'severity': row['cvss_v3_severity'] or 'N/A',
+                        'vector': row['cvss_v3_vector'] or 'N/A'},
+            'cvss_v2': {'score': row['cvss_v2_score'] if row['cvss_v2_score'] is not None else 'N/A',
+                        'severity': row['cvss_v2_severity'] or 'N/A'},
+            'references': json.loads(row['refs'] or '[]'),
+        }
+
+    def get(self, cve_id):
+        row = self.conn.execute("SELECT * FROM cves WHERE id = ?", (cve_id,)).fetchone()
+        return self._result(row) if row else None
+
+    def get_many(self, cve_ids, chunk=500):
+        """{cve_id: result} for many ids (chunked IN queries)"""
+        cve_ids = list(dict.fromkeys(cve_ids))
+        results = {}
+        for i in range(0, len(cve_ids), chunk):
+            part = cve_ids[i:i + chunk]
+            query = f"SELECT * FROM cves WHERE id IN ({','.join('?' * len(part))})"
+            for row in self.conn.execute(query, part):
+                results[row['id']] = self._result(row)
+        return results
+
+    def search(self, keyword, limit=100):
+        """Full-text search over descriptions, best matches first"""
+        terms = ' '.join('"' + term.replace('"', '""') + '"' for term in keyword.split())
+        rows = self.conn.execute(
+            "SELECT cves.* FROM cve_text JOIN cves ON cves.rowid = cve_text.rowid "
+            "WHERE cve_text MATCH ? ORDER BY bm25(cve_text) LIMIT ?", (terms, limit)).fetchall()
+        return [self._result(row) for row in rows]
+
+    def stats(self):
+        return {
+            'cves': self.conn.execute("SELECT COUNT(*) FROM cves").fetchone()[0],
+            'cpe_matches': self.conn.execute("SELECT COUNT(*) FROM cpe_matches").fetchone()[0],
+            'last_modified': self.last_modified(),
+        }
+
+
+if __name__ == "__main__":
+    # python3 app/vulnerability/nvd_store.py nvdcve-2.0-2024.json.gz ...
+    store = NVDStore()
+    for feed in sys.argv[1:]:
+        start = time.time()
+        count = store.import_feed(feed)
+        print(f"[+] {feed}: {count} CVEs ({time.time() - start:.1f}s)")
+    print(f"[*] {store.stats()}")
+    store.close()
